@@ -24,6 +24,7 @@ from requests.exceptions import HTTPError, RequestException, Timeout
 from sentry_sdk.integrations.logging import LoggingIntegration
 from strr_api.models import db
 from strr_api.models.application import Application
+from strr_api.models.number_allocator import check_number_allocator_key
 from strr_api.services import ApprovalService, AuthService
 
 from auto_approval.config import CONFIGURATION, _Config
@@ -44,6 +45,7 @@ def create_app(run: str | _Config = "production", **kwargs):
         config = CONFIGURATION[run]
 
     app.config.from_object(config)
+    check_number_allocator_key(app)
     db.init_app(app)
     register_shellcontext(app)
     return app
@@ -91,6 +91,17 @@ class _Config:  # pylint: disable=too-few-public-methods
     AUTO_APPROVAL_APPLICATION_PROCESSING_DELAY = int(
         os.getenv("AUTO_APPROVAL_APPLICATION_PROCESSING_DELAY") or "60"
     )
+    # Queue and render the certificates of auto approved host registrations after each run
+    AUTO_APPROVAL_ISSUE_CERTIFICATES = (
+        os.getenv("AUTO_APPROVAL_ISSUE_CERTIFICATES", "False").lower() == "true"
+    )
+    CERTIFICATE_RENDER_WORKERS = int(
+        os.getenv("CERTIFICATE_RENDER_WORKERS") or str(os.cpu_count() or 1)
+    )
+    CERTIFICATE_RENDER_TIMEOUT = float(os.getenv("CERTIFICATE_RENDER_TIMEOUT", "120"))
+    CERTIFICATE_RENDER_BATCH_SIZE = int(
+        os.getenv("CERTIFICATE_RENDER_BATCH_SIZE", "50")
+    )
 
     # GEOCODER
     GEOCODER_SVC_URL = os.getenv("GEOCODER_API_URL", "")
@@ -114,6 +125,9 @@ class _Config:  # pylint: disable=too-few-public-methods
     # projects/<project_id-env>/topics/<topic_name>
     GCP_EMAIL_TOPIC = os.getenv("GCP_EMAIL_TOPIC")
 
+    # Must match the API, see strr_api.models.number_allocator
+    NUMBER_ALLOCATOR_KEY = os.getenv("NUMBER_ALLOCATOR_KEY", "")
+
     TESTING = False
     DEBUG = False
 
@@ -14,17 +14,19 @@
 """Auto Approval Job."""
 import logging
 import os
+from dataclasses import asdict
 from datetime import datetime, timedelta, timezone
-from http import HTTPStatus
 
-import requests
 from flask import Flask
-from requests.exceptions import ConnectionError as RequestsConnectionError
-from requests.exceptions import HTTPError, RequestException, Timeout
 from sentry_sdk.integrations.logging import LoggingIntegration
 from strr_api.models import db
 from strr_api.models.application import Application
-from strr_api.services import ApprovalService, AuthService
+from strr_api.models.rental import Registration
+from strr_api.services import ApprovalService, AuthService, CertificateService
+from strr_api.services.certificate_renderer import get_renderer
+from strr_api.services.geocode_cache import geocode_cache
+from strr_api.services.http_client import http_client
+from strr_api.services.str_requirements_service import str_requirements_cache
 
 from auto_approval.config import CONFIGURATION, _Config
 from auto_approval.utils.logging import setup_logging
@@ -51,41 +53,38 @@ def get_submitted_applications(app):
 def process_applications(app, applications):
     """Process auto-approval for submitted applications."""
     AuthService.get_service_client_token()
+    approved_registration_ids = []
     for application in applications:
         app.logger.info(f"Auto processing application {str(application.id)}")
-        ApprovalService.process_auto_approval(application=application)
-        # _generate_certificate(app, token, application_status, registration_id)
+        application_status, registration_id = ApprovalService.process_auto_approval(
+            application=application
+        )
+        if application_status == Application.Status.AUTO_APPROVED and registration_id:
+            approved_registration_ids.append(registration_id)
+    if app.config.get("AUTO_APPROVAL_ISSUE_CERTIFICATES"):
+        _issue_certificates(app, approved_registration_ids)
+    app.logger.info(f"Outbound HTTP metrics: {http_client.metrics()}")
+    app.logger.info(f"Geocode cache stats: {geocode_cache.stats.to_dict()}")
+    app.logger.info(
+        f"STR requirements cache stats: {str_requirements_cache.stats.to_dict()}"
+    )
 
 
-def _generate_certificate(app, token, application_status, registration_id):
-    if (
-        application_status
-        and application_status == Application.Status.AUTO_APPROVED
-        and registration_id
-    ):
-        url = (
-            f"{app.config.get('STRR_API_URL')}"
-            f"/registrations/{registration_id}"
-            f"/certificate"
-        )
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-        }
-        try:
-            response = requests.post(url, headers=headers, timeout=10)
-            response.raise_for_status()  # Raises HTTPError for 4xx/5xx responses
-            if response.status_code != HTTPStatus.CREATED:
-                app.logger.error(
-                    f"Unexpected response error: Status Code: {response.status_code}, "
-                    f"URL: {url}"
-                )
-        except (Timeout, RequestsConnectionError, HTTPError) as e:
-            app.logger.error(f"Request failed due to network error: {e}")
-        except RequestException as e:  # Catch all other requests exceptions
-            app.logger.error(f"Request error: {e}")
-        except Exception as e:  # pylint: disable=broad-except
-            app.logger.error(f"Unexpected error occurred: {e}", exc_info=True)
+def _issue_certificates(app, registration_ids):
+    """Queue the certificates of the approved host registrations and render every pending certificate."""
+    try:
+        registrations = Registration.query.filter(
+            Registration.id.in_(registration_ids),
+            Registration.registration_type == Registration.RegistrationType.HOST,
+        ).all()
+        for registration in registrations:
+            CertificateService.request_certificate(registration)
+        summary = CertificateService.render_pending()
+        app.logger.info(f"Certificates rendered: {asdict(summary)}")
+    except Exception as err:  # pylint: disable=broad-except
+        app.logger.error(f"Certificate rendering failed: {err}", exc_info=True)
+    finally:
+        get_renderer().shutdown()
 
 
 def run():
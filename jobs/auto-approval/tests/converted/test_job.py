@@ -117,3 +117,28 @@ def test_process_applications(mock_approval_service, mock_auth_service, mock_app
     assert mock_approval_service.process_auto_approval.call_count == 2
     mock_app.logger.info.assert_any_call("Auto processing application 1")
     mock_app.logger.info.assert_any_call("Auto processing application 2")
+
+
+@patch("auto_approval.job._issue_certificates")
+@patch("auto_approval.job.AuthService")
+@patch("auto_approval.job.ApprovalService")
+def test_process_applications_issues_certificates(
+    mock_approval_service, mock_auth_service, mock_issue, mock_app
+):
+    """Certificates are queued for the auto approved registrations only when enabled."""
+    apps = [MagicMock(id=1), MagicMock(id=2)]
+    mock_approval_service.process_auto_approval.side_effect = [
+        ("AUTO_APPROVED", 11),
+        ("FULL_REVIEW", None),
+    ]
+
+    process_applications(mock_app, apps)
+    mock_issue.assert_not_called()
+
+    mock_app.config = {"AUTO_APPROVAL_ISSUE_CERTIFICATES": True}
+    mock_approval_service.process_auto_approval.side_effect = [
+        ("AUTO_APPROVED", 11),
+        ("FULL_REVIEW", None),
+    ]
+    process_applications(mock_app, apps)
+    mock_issue.assert_called_once_with(mock_app, [11])
@@ -89,6 +89,20 @@ class _Config:  # pylint: disable=too-few-public-methods
     STR_DATA_API_URL = os.getenv("STR_DATA_API_URL")
     BULK_VALIDATION_REQUESTS_BUCKET = os.getenv("BULK_VALIDATION_REQUESTS_BUCKET")
     BULK_VALIDATION_RESPONSE_BUCKET = os.getenv("BULK_VALIDATION_RESPONSE_BUCKET")
+    # Stream the request and response instead of loading them whole
+    BULK_VALIDATION_STREAMING = os.getenv("BULK_VALIDATION_STREAMING", "True").lower() == "true"
+    # json: {"control": ..., "data": [...]}; ndjson: a control line followed by one result per line
+    BULK_VALIDATION_RESPONSE_FORMAT = os.getenv("BULK_VALIDATION_RESPONSE_FORMAT", "json")
+    BULK_VALIDATION_CHUNK_SIZE = int(os.getenv("BULK_VALIDATION_CHUNK_SIZE", "5000"))
+    BULK_VALIDATION_READ_CHUNK_BYTES = int(
+        os.getenv("BULK_VALIDATION_READ_CHUNK_BYTES", str(4 * 1024 * 1024))
+    )
+    # Resumable upload chunk size, a multiple of 256 KiB
+    BULK_VALIDATION_UPLOAD_CHUNK_BYTES = int(
+        os.getenv("BULK_VALIDATION_UPLOAD_CHUNK_BYTES", str(8 * 1024 * 1024))
+    )
+    # Use a local directory instead of the buckets (local runs and tests)
+    BULK_VALIDATION_LOCAL_STORAGE_DIR = os.getenv("BULK_VALIDATION_LOCAL_STORAGE_DIR")
 
     JWT_OIDC_WELL_KNOWN_CONFIG = os.getenv("JWT_OIDC_WELL_KNOWN_CONFIG")
     JWT_OIDC_ALGORITHMS = os.getenv("JWT_OIDC_ALGORITHMS")
@@ -18,12 +18,15 @@
 import concurrent.futures
 import copy
 from datetime import datetime
+from datetime import timedelta
 from datetime import timezone
 from functools import partial
+from itertools import islice
 import json
 import os
 import sys
 import traceback
+import uuid
 
 from flask import current_app
 from flask import Flask
@@ -33,15 +36,22 @@ from strr_api.models import BulkValidation
 from strr_api.models import db
 from strr_api.schemas.utils import validate
 from strr_api.services import gcp_queue_publisher
-from strr_api.services.approval_service import ApprovalService
 from strr_api.services.gcp_storage_service import GCPStorageService
-from strr_api.services.registration_service import RegistrationService
+from strr_api.services.geocode_cache import geocode_cache
+from strr_api.services.http_client import http_client
+from strr_api.services.permit_snapshot_service import permit_cache
+from strr_api.services.permit_snapshot_service import PermitSnapshotService
+from strr_api.services.str_requirements_service import str_requirements_cache
+from strr_api.services.str_requirements_service import StrRequirementsService
 from strr_api.services.validation_service import ValidationService
 from structured_logging import StructuredLogging
 
 from batch_permit_validator.config import _Config
 from batch_permit_validator.config import CONFIGURATION
-from batch_permit_validator.validation_cache import ValidationCache
+from batch_permit_validator.local_storage import LocalBucket
+from batch_permit_validator.streaming import CONTENT_TYPES
+from batch_permit_validator.streaming import JsonArrayStreamer
+from batch_permit_validator.streaming import ResponseWriter
 
 logger = StructuredLogging.get_logger()
 
@@ -78,7 +88,18 @@ def register_shellcontext(app):
     app.shell_context_processor(shell_context)
 
 
+def _get_bucket(bucket_id):
+    """Return the cloud storage bucket, or its local directory stand-in when one is configured."""
+    if local_dir := current_app.config.get("BULK_VALIDATION_LOCAL_STORAGE_DIR"):
+        return LocalBucket(local_dir, bucket_id)
+    return GCPStorageService.get_bucket(bucket_id)
+
+
 def _process_file(file_name):
+    if current_app.config.get("BULK_VALIDATION_STREAMING"):
+        process_file_streaming(file_name)
+        return
+
     validation_request_bucket = GCPStorageService.get_bucket(
         current_app.config.get("BULK_VALIDATION_REQUESTS_BUCKET")
     )
@@ -111,8 +132,12 @@ def run():
         )
 
 
-def process_record(record: dict, validation_cache: ValidationCache, app):
-    """Processes the individual record."""
+def process_record(record: dict, app, permits: dict | None = None):
+    """Processes the individual record.
+
+    permits is the prefetched map of registration number to permit snapshot for the chunk;
+    when it is not given the snapshot is looked up individually.
+    """
     response = copy.deepcopy(record)
     try:
         with app.app_context():
@@ -123,10 +148,13 @@ def process_record(record: dict, validation_cache: ValidationCache, app):
                 return response
 
             if identifier := record.get("identifier"):
-                registration = RegistrationService.find_by_registration_number(identifier)
+                if permits is None:
+                    permit = PermitSnapshotService.get_snapshot(identifier)
+                else:
+                    permit = permits.get(identifier)
 
-                if registration:
-                    response, _ = ValidationService.check_permit_details(record, registration)
+                if permit:
+                    response, _ = ValidationService.check_permit_snapshot(record, permit)
                 else:
                     response["errors"] = [
                         {
@@ -135,7 +163,7 @@ def process_record(record: dict, validation_cache: ValidationCache, app):
                         }
                     ]
             else:
-                str_requirements = get_strr_requirements(record.get("address"), validation_cache)
+                str_requirements = get_strr_requirements(record.get("address"))
                 response.update(str_requirements)
                 logger.info("STR requirements updated for record: %s", response)
 
@@ -161,40 +189,38 @@ def _validate_record(record: dict):
     return valid, errors
 
 
-def get_strr_requirements(unit_address: dict, validation_cache):
-    """Call Data Portal API to get the STR requirements."""
-    address_line_1 = ""
-    if unit_number := unit_address.get("unitNumber"):
-        address_line_1 = f"{unit_number}-"
-    address_line_1 = (
-        f"{address_line_1}{unit_address.get('streetNumber')} {unit_address.get('streetName')}"
+def get_strr_requirements(unit_address: dict):
+    """Get the STR requirements, through the shared requirements cache."""
+    address = StrRequirementsService.format_address(
+        unit_address.get("streetNumber"),
+        unit_address.get("streetName"),
+        unit_address.get("city"),
+        unit_address.get("province"),
+        unit_number=unit_address.get("unitNumber"),
     )
-    address = f"{address_line_1}, {unit_address.get('city')}, {unit_address.get('province')}"
-    cached_data = validation_cache.cache.get(address)
-
-    if cached_data:
-        # If the key exists, return the cached data.
-        logger.info(f"Key exists :::: {address}")
-        str_data = json.loads(cached_data)
-    else:
-        logger.info(f"Key does not exist :::: {address}")
-        str_data = ApprovalService.getSTRDataForAddress(address=address)
-        if not str_data:
-            return {
-                "code": ErrorMessage.STRR_REQUIREMENTS_FETCH_ERROR.name,
-                "message": ErrorMessage.STRR_REQUIREMENTS_FETCH_ERROR.value,
-            }
-        validation_cache.cache.set(address, json.dumps(str_data))
+    str_data = StrRequirementsService.get_requirements(address)
+    if not str_data:
+        return {
+            "code": ErrorMessage.STRR_REQUIREMENTS_FETCH_ERROR.name,
+            "message": ErrorMessage.STRR_REQUIREMENTS_FETCH_ERROR.value,
+        }
     return {"isStraaExempt": str_data.get("isStraaExempt")}
 
 
-def process_chunk(chunk, validation_cache, max_workers=5):
-    """Process a chunk of records in parallel."""
+def process_chunk(chunk, max_workers=5):
+    """Process a chunk of records in parallel.
+
+    The permit snapshots for every identifier in the chunk are read from the shared permit cache
+    up front, the missing ones loaded in a few batched queries; the workers only read from that map.
+    """
+    permits = PermitSnapshotService.get_snapshots(
+        record.get("identifier") for record in chunk if isinstance(record, dict)
+    )
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
         process_record_args = partial(
             process_record,
-            validation_cache=validation_cache,
             app=current_app._get_current_object(),
+            permits=permits,
         )
         return list(executor.map(process_record_args, chunk))
 
@@ -202,7 +228,6 @@ def process_chunk(chunk, validation_cache, max_workers=5):
 def process_records_in_parallel(request_json, request_file_key, chunk_size=CHUNK_SIZE):
     """Read JSON in chunks, validate in parallel, and write results incrementally."""
     try:
-        validation_cache = ValidationCache()
         permits = request_json.get("data")
         total_records = len(permits)
         results = []
@@ -213,7 +238,7 @@ def process_records_in_parallel(request_json, request_file_key, chunk_size=CHUNK
             chunk = permits[idx : idx + chunk_size]
             logger.info(f"Processing chunk {idx // chunk_size + 1} ({len(chunk)} records)...")
 
-            result = process_chunk(chunk, validation_cache)
+            result = process_chunk(chunk)
             results.extend(result)
 
             logger.info(f"Chunk {idx // chunk_size + 1} processed!")
@@ -222,28 +247,95 @@ def process_records_in_parallel(request_json, request_file_key, chunk_size=CHUNK
         presigned_url = _save_response(
             response_json=response_json, request_file_key=request_file_key
         )
+        _publish_response(request_json.get("control"), presigned_url)
+
+    except Exception as e:
+        _update_bulk_validation_record(request_file_key, BulkValidation.Status.ERROR)
+        logger.error(traceback.format_exc())
+        logger.error(f"Error reading JSON file: {e}")
 
-        callback_queue_message = {
-            "callBackUrl": request_json.get("control").get("callBackUrl"),
-            "preSignedUrl": presigned_url,
-        }
-        logger.info(f"Response: {callback_queue_message}")
-
-        gcp_queue_publisher.publish_to_queue(
-            gcp_queue_publisher.QueueMessage(
-                source="batch-permit-validator",
-                message_type="strr.batchPermitValidationResult",
-                payload=callback_queue_message,
-                topic=current_app.config.get("BULK_VALIDATION_RESPONSE_TOPIC"),
-            )
-        )
 
-        logger.info("Published response to the queue successfully!")
+def process_file_streaming(request_file_key, chunk_size=None):
+    """Validate a request file without holding it, or the response, in memory.
+
+    Records are parsed one at a time from the request blob, validated a chunk at a time, and each
+    result is written straight to a resumable upload of the response blob, so memory use depends on
+    the chunk size only.
+    """
+    chunk_size = chunk_size or current_app.config.get("BULK_VALIDATION_CHUNK_SIZE") or CHUNK_SIZE
+    response_format = current_app.config.get("BULK_VALIDATION_RESPONSE_FORMAT") or "json"
+    read_size = current_app.config.get("BULK_VALIDATION_READ_CHUNK_BYTES")
+    upload_size = current_app.config.get("BULK_VALIDATION_UPLOAD_CHUNK_BYTES")
+    response_bucket_id = current_app.config.get("BULK_VALIDATION_RESPONSE_BUCKET")
+    response_blob = None
+    try:
+        request_blob = _get_bucket(current_app.config.get("BULK_VALIDATION_REQUESTS_BUCKET")).blob(
+            request_file_key
+        )
+        response_bucket = _get_bucket(response_bucket_id)
+        response_blob = response_bucket.blob(str(uuid.uuid4()))
+
+        with (
+            request_blob.open("rt", chunk_size=read_size) as source,
+            response_blob.open(
+                "wt", chunk_size=upload_size, content_type=CONTENT_TYPES[response_format]
+            ) as sink,
+        ):
+            request = JsonArrayStreamer(source)
+            writer = ResponseWriter(sink, response_format)
+            records = iter(request)
+            chunk_number = 0
+            while chunk := list(islice(records, chunk_size)):
+                chunk_number += 1
+                writer.start(request.fields.get("control"))
+                for result in process_chunk(chunk):
+                    writer.write(result)
+                logger.info(f"Chunk {chunk_number} processed ({writer.count} records so far)")
+            control = request.fields.get("control")
+            writer.finish(control)
+
+        logger.info(f"Streamed {writer.count} results to {response_blob.name}")
+        presigned_url = response_blob.generate_signed_url(
+            version="v4", expiration=timedelta(minutes=EXPIRATION_PERIOD), method="GET"
+        )
+        _update_bulk_validation_record(
+            request_file_key, BulkValidation.Status.COMPLETED, response_blob.name
+        )
+        _publish_response(control, presigned_url)
 
     except Exception as e:
         _update_bulk_validation_record(request_file_key, BulkValidation.Status.ERROR)
         logger.error(traceback.format_exc())
-        logger.error(f"Error reading JSON file: {e}")
+        logger.error(f"Error streaming JSON file: {e}")
+        if response_blob is not None:
+            try:
+                response_blob.delete()
+            except Exception:  # the partial upload may never have been finalized
+                pass
+
+
+def _publish_response(control, presigned_url):
+    """Publish the response location to the callback queue and log the run statistics."""
+    callback_queue_message = {
+        "callBackUrl": control.get("callBackUrl"),
+        "preSignedUrl": presigned_url,
+    }
+    logger.info(f"Response: {callback_queue_message}")
+
+    gcp_queue_publisher.publish_to_queue(
+        gcp_queue_publisher.QueueMessage(
+            source="batch-permit-validator",
+            message_type="strr.batchPermitValidationResult",
+            payload=callback_queue_message,
+            topic=current_app.config.get("BULK_VALIDATION_RESPONSE_TOPIC"),
+        )
+    )
+
+    logger.info("Published response to the queue successfully!")
+    logger.info(f"Outbound HTTP metrics: {http_client.metrics()}")
+    logger.info(f"Geocode cache stats: {geocode_cache.stats.to_dict()}")
+    logger.info(f"STR requirements cache stats: {str_requirements_cache.stats.to_dict()}")
+    logger.info(f"Permit cache stats: {permit_cache.stats.to_dict()}")
 
 
 def _save_response(response_json: dict, request_file_key: str) -> str:
@@ -0,0 +1,80 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local filesystem stand-in for a cloud storage bucket.
+
+Implements the subset of the google.cloud.storage Bucket/Blob interface used by the job, so a batch
+can be run against a directory (tests, local development) by setting
+BULK_VALIDATION_LOCAL_STORAGE_DIR.
+"""
+
+import os
+from pathlib import Path
+
+
+class LocalBlob:
+    """A file in a LocalBucket."""
+
+    def __init__(self, bucket: "LocalBucket", name: str):
+        """Create a blob handle; the file does not need to exist."""
+        self.bucket = bucket
+        self.name = name
+        self.path = bucket.path / name
+
+    def open(self, mode: str = "r", **kwargs):  # pylint: disable=unused-argument
+        """Open the file; storage keyword arguments such as chunk_size are ignored."""
+        if "w" in mode:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        encoding = None if "b" in mode else "utf-8"
+        return open(
+            self.path, mode.replace("t", ""), encoding=encoding
+        )  # pylint: disable=consider-using-with
+
+    def exists(self) -> bool:
+        """Return whether the file exists."""
+        return self.path.exists()
+
+    def download_as_text(self) -> str:
+        """Return the file contents."""
+        return self.path.read_text(encoding="utf-8")
+
+    def upload_from_string(self, data, content_type=None):  # pylint: disable=unused-argument
+        """Replace the file contents."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(data, bytes):
+            self.path.write_bytes(data)
+        else:
+            self.path.write_text(data, encoding="utf-8")
+
+    def delete(self):
+        """Remove the file."""
+        self.path.unlink(missing_ok=True)
+
+    def generate_signed_url(self, **kwargs) -> str:  # pylint: disable=unused-argument
+        """Return a file:// URL in place of a signed URL."""
+        return self.path.resolve().as_uri()
+
+
+class LocalBucket:
+    """A directory standing in for a bucket."""
+
+    def __init__(self, root: str, bucket_id: str):
+        """Create the bucket directory under root."""
+        self.name = bucket_id
+        self.path = Path(root) / bucket_id
+        os.makedirs(self.path, exist_ok=True)
+
+    def blob(self, name: str) -> LocalBlob:
+        """Return a handle for the named file."""
+        return LocalBlob(self, name)
@@ -0,0 +1,180 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Incremental reading of the batch request and incremental writing of the response.
+
+The request is a single JSON object holding a large "data" array. JsonArrayStreamer parses the
+enclosing object incrementally and yields the array elements one at a time, so only the current
+element (plus a small read buffer) is held in memory. ResponseWriter writes results to a file-like
+object as they are produced, either as the same {"control": ..., "data": [...]} document or
+as NDJSON.
+"""
+
+import json
+from typing import Iterator, Optional
+
+READ_SIZE = 64 * 1024
+
+JSON_FORMAT = "json"
+NDJSON_FORMAT = "ndjson"
+CONTENT_TYPES = {JSON_FORMAT: "application/json", NDJSON_FORMAT: "application/x-ndjson"}
+
+_WHITESPACE = " \t\n\r"
+
+
+class JsonArrayStreamer:
+    """Yields the elements of one array member of a top-level JSON object, reading incrementally.
+
+    The other top-level members are decoded whole into `fields`; members that come before the array
+    are available once the first element has been yielded, members after it once iteration ends.
+    """
+
+    def __init__(self, source, array_key: str = "data", read_size: int = READ_SIZE):
+        """Wrap a text file-like object."""
+        self.fields = {}
+        self._source = source
+        self._array_key = array_key
+        self._read_size = read_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self) -> Iterator:
+        """Parse the document, yielding the array elements."""
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._decode()
+            self._expect(":")
+            if key == self._array_key:
+                yield from self._iter_array()
+            else:
+                self.fields[key] = self._decode()
+            separator = self._next_char()
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or '}}' at offset {self._pos}, got {separator!r}")
+
+    def _iter_array(self) -> Iterator:
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._decode()
+            separator = self._next_char()
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or ']' at offset {self._pos}, got {separator!r}")
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        if self._pos > self._read_size:
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+        chunk = self._source.read(self._read_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer += chunk
+        return True
+
+    def _peek(self) -> Optional[str]:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return None
+
+    def _next_char(self) -> Optional[str]:
+        char = self._peek()
+        if char is not None:
+            self._pos += 1
+        return char
+
+    def _expect(self, expected: str):
+        char = self._next_char()
+        if char != expected:
+            raise ValueError(f"Expected {expected!r} at offset {self._pos}, got {char!r}")
+
+    def _decode(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A bare number that ends exactly at the buffer end may continue in the next read.
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+class ResponseWriter:
+    """Writes the batch response to a text file-like object one result at a time."""
+
+    def __init__(self, sink, response_format: str = JSON_FORMAT):
+        """Wrap a text file-like object."""
+        if response_format not in CONTENT_TYPES:
+            raise ValueError(f"Unsupported response format {response_format}")
+        self.count = 0
+        self._sink = sink
+        self._format = response_format
+        self._started = False
+        self._control_written = False
+
+    def start(self, control: Optional[dict]):
+        """Write the document header; control is written here when known, else at finish()."""
+        if self._started:
+            return
+        self._started = True
+        if self._format == NDJSON_FORMAT:
+            if control is not None:
+                self._sink.write(json.dumps({"control": control}) + "\n")
+                self._control_written = True
+        elif control is not None:
+            self._sink.write('{"control": ' + json.dumps(control) + ', "data": [')
+            self._control_written = True
+        else:
+            self._sink.write('{"data": [')
+
+    def write(self, result: dict):
+        """Append one result."""
+        if self._format == NDJSON_FORMAT:
+            self._sink.write(json.dumps(result) + "\n")
+        else:
+            self._sink.write((", " if self.count else "") + json.dumps(result))
+        self.count += 1
+
+    def finish(self, control: Optional[dict]):
+        """Close the document."""
+        self.start(control)
+        if self._format == NDJSON_FORMAT:
+            if not self._control_written:
+                self._sink.write(json.dumps({"control": control}) + "\n")
+        elif self._control_written:
+            self._sink.write("]}")
+        else:
+            self._sink.write('], "control": ' + json.dumps(control) + "}")
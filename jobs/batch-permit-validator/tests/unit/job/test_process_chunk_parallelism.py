@@ -1,11 +1,10 @@
 from functools import partial
-from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import pytest
 
 
-def test_process_chunk_parallelism(app, redis_client):
+def test_process_chunk_parallelism(app):
     """
     Verifies that process_chunk:
     1. Correctly maps process_record across the chunk.
@@ -14,7 +13,6 @@ def test_process_chunk_parallelism(app, redis_client):
     """
     # Setup mocks
     chunk = [{"id": 1}, {"id": 2}, {"id": 3}]
-    mock_cache = MagicMock(cache=redis_client)
 
     def mock_return_value(record, **kwargs):
         return {"processed": record["id"]}
@@ -26,18 +24,17 @@ def test_process_chunk_parallelism(app, redis_client):
 
             from batch_permit_validator.job import process_chunk
 
-            results = process_chunk(chunk, mock_cache, max_workers=2)
+            results = process_chunk(chunk, max_workers=2)
 
             # Assertions
             # Ensure process_record was called once for every item in the chunk
             assert len(results) == 3
             assert results == [{"processed": 1}, {"processed": 2}, {"processed": 3}]
 
-            # Verify the calls include our mock_cache and the real app object
+            # Verify the calls include the real app object
             assert mock_proc.call_count == 3
 
             # Check the first call's arguments
             args, kwargs = mock_proc.call_args_list[0]
             assert args[0] == {"id": 1}  # The record
-            assert kwargs["validation_cache"] == mock_cache
             assert kwargs["app"] == app  # The unwrapped Flask app
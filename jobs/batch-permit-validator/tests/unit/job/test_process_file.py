@@ -12,7 +12,8 @@ import pytest
         ({"records": []}),
     ],
 )
-def test_process_file_success(app, log_capture, mock_json_content):
+@pytest.mark.conf(BULK_VALIDATION_STREAMING=False)
+def test_process_file_success(app, inject_config, log_capture, mock_json_content):
     """Tests _process_file by mocking the GCP Storage bucket and blob."""
 
     file_name = "test_request.json"
@@ -0,0 +1,87 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from strr_api.models import BulkValidation
+from strr_api.services import gcp_queue_publisher as real_pub
+
+from batch_permit_validator.local_storage import LocalBucket
+
+
+def _use_local_storage(app, monkeypatch, tmp_path):
+    monkeypatch.setitem(app.config, "BULK_VALIDATION_LOCAL_STORAGE_DIR", str(tmp_path))
+    monkeypatch.setitem(app.config, "BULK_VALIDATION_REQUESTS_BUCKET", "requests")
+    monkeypatch.setitem(app.config, "BULK_VALIDATION_RESPONSE_BUCKET", "responses")
+
+
+@pytest.mark.parametrize("response_format", ["json", "ndjson"])
+def test_process_file_streaming(app, session, monkeypatch, tmp_path, response_format):
+    """
+    Verifies the streaming pipeline against the local bucket stand-in:
+    1. Records are read from the request blob and validated in chunks.
+    2. The response document is written to the response bucket in the requested format.
+    3. The BulkValidation record is completed and the callback is published.
+    """
+    request_key = f"req_stream_{response_format}"
+    control = {"callBackUrl": "https://callback.com/api/v1"}
+    records = [{"id": i} for i in range(7)]
+
+    _use_local_storage(app, monkeypatch, tmp_path)
+    monkeypatch.setitem(app.config, "BULK_VALIDATION_RESPONSE_FORMAT", response_format)
+    request_bucket = LocalBucket(str(tmp_path), app.config.get("BULK_VALIDATION_REQUESTS_BUCKET"))
+    request_bucket.blob(request_key).upload_from_string(
+        json.dumps({"control": control, "data": records})
+    )
+    BulkValidation(request_file_id=request_key, status=BulkValidation.Status.PROCESSING).save()
+    session.commit()
+
+    job_path = "batch_permit_validator.job"
+    with (
+        patch(f"{job_path}.process_chunk") as mock_chunk,
+        patch(f"{job_path}.gcp_queue_publisher") as mock_pub,
+    ):
+        mock_pub.QueueMessage = real_pub.QueueMessage
+        mock_chunk.side_effect = lambda chunk: [{**r, "isStraaExempt": False} for r in chunk]
+
+        from batch_permit_validator.job import process_file_streaming
+
+        process_file_streaming(request_key, chunk_size=3)
+        session.commit()
+
+    assert mock_chunk.call_count == 3
+
+    updated = BulkValidation.get_record_by_request_file_id(request_key)
+    assert updated.status == BulkValidation.Status.COMPLETED
+
+    response_bucket = LocalBucket(str(tmp_path), app.config.get("BULK_VALIDATION_RESPONSE_BUCKET"))
+    contents = response_bucket.blob(updated.response_file_id).download_as_text()
+    expected = [{**r, "isStraaExempt": False} for r in records]
+    if response_format == "json":
+        assert json.loads(contents) == {"control": control, "data": expected}
+    else:
+        lines = [json.loads(line) for line in contents.splitlines()]
+        assert lines == [{"control": control}, *expected]
+
+    sent_message = mock_pub.publish_to_queue.call_args[0][0]
+    assert sent_message.payload["callBackUrl"] == control["callBackUrl"]
+    assert sent_message.payload["preSignedUrl"].startswith("file://")
+
+
+def test_process_file_streaming_error(app, session, monkeypatch, tmp_path):
+    """A malformed request marks the record as ERROR and leaves no partial response behind."""
+    request_key = "req_stream_bad"
+    _use_local_storage(app, monkeypatch, tmp_path)
+    request_bucket = LocalBucket(str(tmp_path), app.config.get("BULK_VALIDATION_REQUESTS_BUCKET"))
+    request_bucket.blob(request_key).upload_from_string('{"data": [{"id": 1} {"id": 2}]}')
+    BulkValidation(request_file_id=request_key, status=BulkValidation.Status.PROCESSING).save()
+    session.commit()
+
+    with patch("batch_permit_validator.job.process_chunk", side_effect=lambda chunk: chunk):
+        from batch_permit_validator.job import process_file_streaming
+
+        process_file_streaming(request_key)
+        session.commit()
+
+    updated = BulkValidation.get_record_by_request_file_id(request_key)
+    assert updated.status == BulkValidation.Status.ERROR
+    assert not any((tmp_path / "responses").iterdir())
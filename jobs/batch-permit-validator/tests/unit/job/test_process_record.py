@@ -1,4 +1,3 @@
-from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import pytest
@@ -32,21 +31,20 @@ import pytest
     ],
 )
 def test_process_record_branches(
-    app, redis_client, record, validate_return, registration_return, str_return, expected_keys
+    app, record, validate_return, registration_return, str_return, expected_keys
 ):
     """Verifies all logical branches of individual record processing."""
 
     # Setup
-    mock_cache = MagicMock(cache=redis_client)
     job_path = "batch_permit_validator.job"
 
     with (
         patch(f"{job_path}._validate_record", return_value=validate_return),
         patch(
-            f"{job_path}.RegistrationService.find_by_registration_number",
+            f"{job_path}.PermitSnapshotService.get_snapshot",
             return_value=registration_return,
         ),
-        patch(f"{job_path}.ValidationService.check_permit_details") as mock_val_svc,
+        patch(f"{job_path}.ValidationService.check_permit_snapshot") as mock_val_svc,
         patch(f"{job_path}.get_strr_requirements", return_value=str_return),
     ):
 
@@ -57,7 +55,7 @@ def test_process_record_branches(
         from batch_permit_validator.job import process_record
 
         # Test
-        result = process_record(record, mock_cache, app)
+        result = process_record(record, app)
 
         # Check
         for key in expected_keys:
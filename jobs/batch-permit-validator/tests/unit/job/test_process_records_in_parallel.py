@@ -29,12 +29,11 @@ def test_process_records_in_parallel_full_flow(app, log_capture):
             patch(f"{job_path}.process_chunk") as mock_chunk,
             patch(f"{job_path}._save_response") as mock_save,
             patch(f"{job_path}.gcp_queue_publisher") as mock_pub,
-            patch(f"{job_path}.ValidationCache") as mock_cache_class,
         ):
 
             mock_pub.QueueMessage = real_pub.QueueMessage
 
-            mock_chunk.side_effect = lambda chunk, cache: [{"processed": r["id"]} for r in chunk]
+            mock_chunk.side_effect = lambda chunk: [{"processed": r["id"]} for r in chunk]
             mock_save.return_value = mock_presigned_url
 
             from batch_permit_validator.job import process_records_in_parallel
@@ -0,0 +1,127 @@
+import io
+import json
+import tracemalloc
+
+import pytest
+
+from batch_permit_validator.streaming import JsonArrayStreamer
+from batch_permit_validator.streaming import ResponseWriter
+
+RECORDS = [
+    {
+        "id": 1,
+        "identifier": "H123",
+        "address": {"streetName": "Main [St], {North}", "city": "Victoria"},
+    },
+    {"id": 2, "note": 'quote " and \\\\ backslash, unicode é'},
+    {"id": 3, "values": [1, 2.5, -3e2, True, None]},
+]
+CONTROL = {"callBackUrl": "https://example.com/callback"}
+
+
+@pytest.mark.parametrize("read_size", [1, 7, 64, 65536])
+@pytest.mark.parametrize(
+    "document",
+    [
+        {"control": CONTROL, "data": RECORDS},
+        {"data": RECORDS, "control": CONTROL},
+        {"control": CONTROL, "data": [], "extra": 12345},
+    ],
+)
+def test_streamer_yields_records_and_fields(document, read_size):
+    streamer = JsonArrayStreamer(io.StringIO(json.dumps(document, indent=2)), read_size=read_size)
+
+    assert list(streamer) == document["data"]
+    assert streamer.fields == {key: value for key, value in document.items() if key != "data"}
+
+
+def test_streamer_rejects_malformed_document():
+    with pytest.raises(ValueError):
+        list(JsonArrayStreamer(io.StringIO('{"data": [{"id": 1} {"id": 2}]}')))
+
+
+@pytest.mark.parametrize("control_known_at_start", [True, False])
+def test_writer_json_round_trip(control_known_at_start):
+    sink = io.StringIO()
+    writer = ResponseWriter(sink)
+    writer.start(CONTROL if control_known_at_start else None)
+    for record in RECORDS:
+        writer.write(record)
+    writer.finish(CONTROL)
+
+    assert json.loads(sink.getvalue()) == {"control": CONTROL, "data": RECORDS}
+    assert writer.count == len(RECORDS)
+
+
+def test_writer_empty_json_document():
+    sink = io.StringIO()
+    ResponseWriter(sink).finish(CONTROL)
+
+    assert json.loads(sink.getvalue()) == {"control": CONTROL, "data": []}
+
+
+def test_writer_ndjson():
+    sink = io.StringIO()
+    writer = ResponseWriter(sink, "ndjson")
+    writer.start(CONTROL)
+    for record in RECORDS:
+        writer.write(record)
+    writer.finish(CONTROL)
+
+    lines = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert lines == [{"control": CONTROL}, *RECORDS]
+
+
+class GeneratedRequest(io.TextIOBase):
+    """A request document produced on demand, so the test itself holds no full copy."""
+
+    def __init__(self, count):
+        self._parts = self._generate(count)
+        self._pending = ""
+
+    @staticmethod
+    def _generate(count):
+        yield '{"control": ' + json.dumps(CONTROL) + ', "data": ['
+        for index in range(count):
+            record = {"id": index, "address": {"streetNumber": str(index), "city": "Victoria"}}
+            yield ("," if index else "") + json.dumps(record)
+        yield "]}"
+
+    def read(self, size=-1):
+        while len(self._pending) < size:
+            part = next(self._parts, None)
+            if part is None:
+                break
+            self._pending += part
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+
+class CountingSink(io.TextIOBase):
+    def __init__(self):
+        self.size = 0
+
+    def write(self, text):
+        self.size += len(text)
+        return len(text)
+
+
+def _peak_memory(count):
+    tracemalloc.start()
+    try:
+        streamer = JsonArrayStreamer(GeneratedRequest(count), read_size=4096)
+        writer = ResponseWriter(CountingSink())
+        for record in streamer:
+            writer.start(streamer.fields.get("control"))
+            writer.write({**record, "isStraaExempt": False})
+        writer.finish(streamer.fields.get("control"))
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_peak_memory_is_flat():
+    small = _peak_memory(1_000)
+    large = _peak_memory(20_000)
+
+    assert large < small * 2
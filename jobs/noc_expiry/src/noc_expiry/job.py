@@ -14,15 +14,26 @@
 """NOC Expiry Job."""
 import logging
 import os
+import time
 import traceback
+from dataclasses import asdict, dataclass
 from datetime import datetime
 
 from flask import Flask
 from sentry_sdk.integrations.logging import LoggingIntegration
+from sqlalchemy import Table, and_, case, exists, select, tuple_, update
 from strr_api.enums.enum import RegistrationNocStatus
 from strr_api.models import db
 from strr_api.models.application import Application
+from strr_api.models.events import Events
+from strr_api.models.notice_of_consideration import NoticeOfConsideration
+from strr_api.models.registration_notice_of_consideration import (
+    RegistrationNoticeOfConsideration,
+)
 from strr_api.models.rental import Registration
+from strr_api.models.unit_of_work import unit_of_work
+from strr_api.models.versioned_update import versioned_update
+from strr_api.services.events_service import EventsService
 from strr_api.utils.date_util import DateUtil
 
 from noc_expiry.config import CONFIGURATION
@@ -32,6 +43,11 @@ setup_logging(os.path.join(os.path.abspath(os.path.dirname(__file__)), "logging.
 
 SENTRY_LOGGING = LoggingIntegration(event_level=logging.ERROR)  # send errors as events
 
+NOC_PENDING_STATUSES = [
+    Application.Status.NOC_PENDING,
+    Application.Status.PROVISIONAL_REVIEW_NOC_PENDING,
+]
+
 
 def create_app(run_mode=os.getenv("FLASK_ENV", "production")):
     """Return a configured Flask App using the Factory method."""
@@ -52,51 +68,138 @@ def register_shellcontext(app):
     app.shell_context_processor(shell_context)
 
 
-def update_status_for_noc_expired_applications(app):
+@dataclass
+class NocExpirySummary:
+    """What one pass of the NOC expiry job did."""
+
+    name: str
+    scanned: int = 0
+    updated: int = 0
+    elapsed_seconds: float = 0.0
+
+
+def _expired_noc_filter(nocs: Table, parent_column: str, cut_off: datetime):
+    """Where clause matching the latest NOC of its application or registration when it ended before the cut off.
+
+    The job starts from the NOCs that ended, using the end date index, so pending rows whose NOC is still open are
+    never looked at.
+    """
+    later = nocs.alias("later_noc")
+    return and_(
+        nocs.c.end_date < cut_off,
+        ~exists().where(
+            later.c[parent_column] == nocs.c[parent_column],
+            tuple_(later.c.start_date, later.c.id)
+            > tuple_(nocs.c.start_date, nocs.c.id),
+        ),
+    )
+
+
+def _run_pass(app, name: str, expire) -> NocExpirySummary:
+    """Run one pass in its own transaction and log its summary."""
+    summary = NocExpirySummary(name=name)
+    started = time.perf_counter()
+    try:
+        with unit_of_work():
+            summary.scanned, summary.updated = expire()
+    except Exception as err:  # pylint: disable=broad-except
+        app.logger.error(f"Unexpected error: {str(err)}")
+        app.logger.error(traceback.format_exc())
+    summary.elapsed_seconds = round(time.perf_counter() - started, 3)
+    app.logger.info(f"NOC expiry summary: {asdict(summary)}")
+    return summary
+
+
+def update_status_for_noc_expired_applications(app) -> NocExpirySummary:
     """Update the application status for the NOC expired applications."""
-    statuses = [
-        Application.Status.NOC_PENDING,
-        Application.Status.PROVISIONAL_REVIEW_NOC_PENDING,
-    ]
-    applications = Application.query.filter(Application.status.in_(statuses)).all()
     cut_off_datetime = DateUtil.as_legislation_timezone(datetime.utcnow())
-    for application in applications:
-        try:
-            app.logger.info(f"Processing application # {str(application.id)}")
-            if application.noc.end_date < cut_off_datetime:
-                app.logger.info(
-                    f"Updating status for application {str(application.id)}"
+
+    def expire():
+        applications = Application.__table__
+        nocs = NoticeOfConsideration.__table__
+        ids = (
+            db.session.execute(
+                select(applications.c.id)
+                .join(nocs, nocs.c.application_id == applications.c.id)
+                .where(
+                    _expired_noc_filter(nocs, "application_id", cut_off_datetime),
+                    applications.c.status.in_(NOC_PENDING_STATUSES),
                 )
-                application.status = (
-                    Application.Status.NOC_EXPIRED
-                    if application.status == Application.Status.NOC_PENDING
-                    else Application.Status.PROVISIONAL_REVIEW_NOC_EXPIRED
+                .with_for_update(of=applications, skip_locked=True)
+            )
+            .scalars()
+            .all()
+        )
+        if not ids:
+            return 0, 0
+        updated = (
+            db.session.execute(
+                update(applications)
+                .where(
+                    applications.c.id.in_(ids),
+                    applications.c.status.in_(NOC_PENDING_STATUSES),
                 )
-                application.save()
-        except Exception as err:  # pylint: disable=broad-except
-            app.logger.error(f"Unexpected error: {str(err)}")
-            app.logger.error(traceback.format_exc())
-
-
-def update_noc_status_for_expired_registrations(app):
+                .values(
+                    status=case(
+                        (
+                            applications.c.status == Application.Status.NOC_PENDING,
+                            Application.Status.NOC_EXPIRED,
+                        ),
+                        else_=Application.Status.PROVISIONAL_REVIEW_NOC_EXPIRED,
+                    )
+                )
+                .returning(applications.c.id)
+            )
+            .scalars()
+            .all()
+        )
+        EventsService.save_events(
+            {
+                "event_type": Events.EventType.APPLICATION,
+                "event_name": Events.EventName.NOC_EXPIRED,
+                "application_id": application_id,
+            }
+            for application_id in updated
+        )
+        return len(ids), len(updated)
+
+    return _run_pass(app, "applications", expire)
+
+
+def update_noc_status_for_expired_registrations(app) -> NocExpirySummary:
     """Update the NOC status for the NOC expired registrations."""
-    registrations = Registration.query.filter(
-        Registration.noc_status == RegistrationNocStatus.NOC_PENDING
-    ).all()
-    for registration in registrations:
-        try:
-            app.logger.info(f"Processing registration # {str(registration.id)}")
-            noc = max(registration.nocs, key=lambda noc: noc.start_date)
-            cut_off_datetime = DateUtil.as_legislation_timezone(datetime.utcnow())
-            if noc.end_date < cut_off_datetime:
-                app.logger.info(
-                    f"Updating status for registration {str(registration.id)}"
+    cut_off_datetime = DateUtil.as_legislation_timezone(datetime.utcnow())
+
+    def expire():
+        registrations = Registration.__table__
+        nocs = RegistrationNoticeOfConsideration.__table__
+        ids = (
+            db.session.execute(
+                select(registrations.c.id)
+                .join(nocs, nocs.c.registration_id == registrations.c.id)
+                .where(
+                    _expired_noc_filter(nocs, "registration_id", cut_off_datetime),
+                    registrations.c.noc_status == RegistrationNocStatus.NOC_PENDING,
                 )
-                registration.noc_status = RegistrationNocStatus.NOC_EXPIRED
-                registration.save()
-        except Exception as err:  # pylint: disable=broad-except
-            app.logger.error(f"Unexpected error: {str(err)}")
-            app.logger.error(traceback.format_exc())
+                .with_for_update(of=registrations, skip_locked=True)
+            )
+            .scalars()
+            .all()
+        )
+        updated = versioned_update(
+            Registration, ids, {"noc_status": RegistrationNocStatus.NOC_EXPIRED}
+        )
+        EventsService.save_events(
+            {
+                "event_type": Events.EventType.REGISTRATION,
+                "event_name": Events.EventName.NOC_EXPIRED,
+                "registration_id": row.id,
+            }
+            for row in updated
+        )
+        return len(ids), len(updated)
+
+    return _run_pass(app, "registrations", expire)
 
 
 def run():
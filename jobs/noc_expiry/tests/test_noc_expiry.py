@@ -0,0 +1,166 @@
+# pylint: disable=C0114, C0116, W0613, W0621
+"""Set-based NOC expiry."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert, text
+from strr_api.models import db
+from strr_api.models.application import Application
+from strr_api.models.notice_of_consideration import NoticeOfConsideration
+from strr_api.models.registration_notice_of_consideration import (
+    RegistrationNoticeOfConsideration,
+)
+from strr_api.models.rental import Registration
+from strr_api.models.user import User
+
+from noc_expiry.config import TestConfig
+from noc_expiry.job import (
+    create_app,
+    update_noc_status_for_expired_registrations,
+    update_status_for_noc_expired_applications,
+)
+
+NOW = datetime.now(timezone.utc)
+DAY = timedelta(days=1)
+
+
+@pytest.fixture
+def noc_app(db_engine):
+    """Job app bound to the migrated test database, cleaned up after the test."""
+    TestConfig.SQLALCHEMY_DATABASE_URI = str(db_engine.url)
+    app = create_app("test")
+    with app.app_context():
+        yield app
+        db.session.rollback()
+        for table in (
+            "events",
+            "notice_of_consideration",
+            "registration_notice_of_consideration",
+            "application",
+            "registrations_history",
+            "registrations",
+            "users",
+        ):
+            db.session.execute(text(f"DELETE FROM {table}"))
+        db.session.commit()
+
+
+def _insert_application(application_id: int, status: str, noc_end: datetime):
+    db.session.execute(
+        insert(Application.__table__).values(
+            id=application_id,
+            application_json={},
+            application_number=f"{application_id:014d}",
+            type="registration",
+            status=status,
+        )
+    )
+    db.session.execute(
+        insert(NoticeOfConsideration.__table__).values(
+            application_id=application_id,
+            content="noc",
+            start_date=noc_end - 8 * DAY,
+            end_date=noc_end,
+        )
+    )
+
+
+def _insert_registration(registration_id: int, noc_windows: list):
+    if not db.session.get(User, 1):
+        db.session.execute(
+            insert(User.__table__).values(id=1, firstname="Noc", lastname="Job")
+        )
+    db.session.execute(
+        insert(Registration.__table__).values(
+            id=registration_id,
+            registration_type="HOST",
+            registration_number=f"H{registration_id:09d}",
+            sbc_account_id=1,
+            status="ACTIVE",
+            start_date=NOW - 365 * DAY,
+            expiry_date=NOW + 365 * DAY,
+            updated_date=NOW,
+            user_id=1,
+            version=1,
+            noc_status="NOC_PENDING",
+        )
+    )
+    for start_date, end_date in noc_windows:
+        db.session.execute(
+            insert(RegistrationNoticeOfConsideration.__table__).values(
+                registration_id=registration_id,
+                content="noc",
+                start_date=start_date,
+                end_date=end_date,
+            )
+        )
+
+
+def _scalar(sql: str):
+    return db.session.execute(text(sql)).scalar_one()
+
+
+def test_expires_applications(noc_app):
+    _insert_application(1, Application.Status.NOC_PENDING, NOW - DAY)
+    _insert_application(2, Application.Status.PROVISIONAL_REVIEW_NOC_PENDING, NOW - DAY)
+    _insert_application(3, Application.Status.NOC_PENDING, NOW + DAY)
+    _insert_application(4, Application.Status.FULL_REVIEW, NOW - DAY)
+    db.session.commit()
+
+    summary = update_status_for_noc_expired_applications(noc_app)
+
+    assert (summary.scanned, summary.updated) == (2, 2)
+    assert (
+        _scalar("SELECT status FROM application WHERE id = 1")
+        == Application.Status.NOC_EXPIRED
+    )
+    assert (
+        _scalar("SELECT status FROM application WHERE id = 2")
+        == Application.Status.PROVISIONAL_REVIEW_NOC_EXPIRED
+    )
+    assert (
+        _scalar("SELECT status FROM application WHERE id = 3")
+        == Application.Status.NOC_PENDING
+    )
+    assert (
+        _scalar("SELECT status FROM application WHERE id = 4")
+        == Application.Status.FULL_REVIEW
+    )
+    assert (
+        _scalar(
+            "SELECT COUNT(*) FROM events WHERE event_name = 'NOC_EXPIRED' AND application_id IS NOT NULL"
+        )
+        == 2
+    )
+
+    assert update_status_for_noc_expired_applications(noc_app).updated == 0
+
+
+def test_expires_registrations_by_latest_noc(noc_app):
+    # An older NOC that ended does not count when a newer one is still open
+    _insert_registration(1, [(NOW - 9 * DAY, NOW - 8 * DAY), (NOW - DAY, NOW + DAY)])
+    _insert_registration(
+        2, [(NOW - 9 * DAY, NOW - 8 * DAY), (NOW - 5 * DAY, NOW - 2 * DAY)]
+    )
+    db.session.commit()
+
+    summary = update_noc_status_for_expired_registrations(noc_app)
+
+    assert (summary.scanned, summary.updated) == (1, 1)
+    assert _scalar("SELECT noc_status FROM registrations WHERE id = 1") == "NOC_PENDING"
+    assert _scalar("SELECT noc_status FROM registrations WHERE id = 2") == "NOC_EXPIRED"
+    assert _scalar("SELECT version FROM registrations WHERE id = 2") == 2
+    assert (
+        _scalar(
+            "SELECT noc_status FROM registrations_history WHERE id = 2 AND version = 1"
+        )
+        == "NOC_PENDING"
+    )
+    assert (
+        _scalar(
+            "SELECT COUNT(*) FROM events WHERE event_name = 'NOC_EXPIRED' AND registration_id = 2"
+        )
+        == 1
+    )
+
+    assert update_noc_status_for_expired_registrations(noc_app).updated == 0
@@ -70,6 +70,9 @@ class _Config:  # pylint: disable=too-few-public-methods
     # projects/<project_id-env>/topics/<topic_name>
     GCP_EMAIL_TOPIC = os.getenv("GCP_EMAIL_TOPIC")
 
+    # Must match the API, see strr_api.models.number_allocator
+    NUMBER_ALLOCATOR_KEY = os.getenv("NUMBER_ALLOCATOR_KEY", "")
+
     TESTING = False
     DEBUG = False
 
@@ -19,6 +19,7 @@ from flask import Flask
 from strr_api.models import db
 from strr_api.models.application import Application
 from strr_api.models.events import Events
+from strr_api.models.number_allocator import check_number_allocator_key
 from strr_api.models.rental import Registration
 from strr_api.services import ApprovalService
 from structured_logging import StructuredLogging
@@ -32,6 +33,7 @@ def create_app(run_mode=os.getenv("FLASK_ENV", "production")):
     """Return a configured Flask App using the Factory method."""
     app = Flask(__name__)
     app.config.from_object(CONFIGURATION[run_mode])
+    check_number_allocator_key(app)
     db.init_app(app)
     register_shellcontext(app)
     return app
@@ -65,6 +65,13 @@ class _Config:  # pylint: disable=too-few-public-methods
             f"postgresql+pg8000://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
         )
 
+    # REDIS, shared with the API permit cache
+    REDIS_HOST = os.getenv("REDIS_HOST", "")
+    REDIS_PORT = os.getenv("REDIS_PORT", "6379")
+
+    # Registrations expired per committed chunk
+    EXPIRY_CHUNK_SIZE = int(os.getenv("EXPIRY_CHUNK_SIZE", "1000"))
+
     TESTING = False
     DEBUG = False
 
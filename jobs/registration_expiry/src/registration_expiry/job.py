@@ -14,17 +14,25 @@
 """registration Expiry Job."""
 import logging
 import os
+import time
 import traceback
+from dataclasses import asdict, dataclass
 from datetime import datetime
 
 from flask import Flask
 from sentry_sdk.integrations.logging import LoggingIntegration
-from sqlalchemy import and_
+from sqlalchemy import select
 from strr_api.enums.enum import RegistrationStatus
 from strr_api.models import db
 from strr_api.models.events import Events
 from strr_api.models.rental import Registration
+from strr_api.models.unit_of_work import unit_of_work
+from strr_api.models.versioned_update import versioned_update
 from strr_api.services.events_service import EventsService
+from strr_api.services.permit_snapshot_service import (
+    PermitSnapshotService,
+    permit_cache,
+)
 from strr_api.utils.date_util import DateUtil
 
 from registration_expiry.config import CONFIGURATION
@@ -40,6 +48,8 @@ def create_app(run_mode=os.getenv("FLASK_ENV", "production")):
     app = Flask(__name__)
     app.config.from_object(CONFIGURATION[run_mode])
     db.init_app(app)
+    # the job drops the permit snapshots of expired registrations from the shared Redis tier
+    permit_cache.init_app(app)
     register_shellcontext(app)
     return app
 
@@ -54,34 +64,97 @@ def register_shellcontext(app):
     app.shell_context_processor(shell_context)
 
 
-def update_status_for_registration_expired_applications(app):
-    """getting the date in the same format as the db"""
-    cut_off_datetime = DateUtil.as_legislation_timezone(datetime.utcnow())
+@dataclass
+class ExpiryRunSummary:
+    """What a registration expiry run did."""
 
-    # Get the registration status for applications older then now.
-    rentals = Registration.query.filter(
-        and_(
-            Registration.status != RegistrationStatus.EXPIRED.value,
-            Registration.expiry_date < cut_off_datetime,
-        )
-    ).all()
+    cut_off: datetime
+    expired: int = 0
+    chunks: int = 0
+    failed: bool = False
+    elapsed_seconds: float = 0.0
 
-    # Update registration status to expired.
-    for rental in rentals:
-        try:
-            app.logger.info(f"Processing registration # {str(rental.id)}")
-            app.logger.info(f"Updating status for registration {str(rental.id)}")
-            rental.status = RegistrationStatus.EXPIRED.value
-            rental.save()
-            EventsService.save_event(
-                event_type=Events.EventType.REGISTRATION,
-                event_name=Events.EventName.REGISTRATION_EXPIRED,
-                registration_id=rental.id,
+
+def _expire_chunk(cut_off: datetime, chunk_size: int) -> list:
+    """Expire up to chunk_size registrations past the cut off and return their (id, registration_number) rows.
+
+    The update writes the registration history rows the same way the versioned session does for an ORM update.
+    """
+    registrations = Registration.__table__
+    ids = (
+        db.session.execute(
+            select(registrations.c.id)
+            .where(
+                registrations.c.status != RegistrationStatus.EXPIRED,
+                registrations.c.expiry_date < cut_off,
             )
-            app.logger.info(f"Registration {str(rental.id)} status updated to expired")
+            .order_by(registrations.c.id)
+            .limit(chunk_size)
+            .with_for_update(skip_locked=True)
+        )
+        .scalars()
+        .all()
+    )
+    if not ids:
+        return []
+
+    expired = versioned_update(
+        Registration,
+        ids,
+        {"status": RegistrationStatus.EXPIRED},
+        returning=[registrations.c.registration_number],
+    )
+
+    EventsService.save_events(
+        {
+            "event_type": Events.EventType.REGISTRATION,
+            "event_name": Events.EventName.REGISTRATION_EXPIRED,
+            "registration_id": registration_id,
+        }
+        for registration_id, _ in expired
+    )
+    for _, registration_number in expired:
+        PermitSnapshotService.invalidate(registration_number)
+    return expired
+
+
+def update_status_for_registration_expired_applications(
+    app, chunk_size: int = None
+) -> ExpiryRunSummary:
+    """Expire every registration past its expiry date, one committed chunk at a time.
+
+    Each chunk flips the status with one UPDATE, writes the history rows and the REGISTRATION_EXPIRED events in
+    bulk and commits. Registrations that are already expired are never selected, so a rerun only picks up what an
+    earlier run did not finish.
+    """
+    chunk_size = chunk_size or app.config["EXPIRY_CHUNK_SIZE"]
+    summary = ExpiryRunSummary(
+        cut_off=DateUtil.as_legislation_timezone(datetime.utcnow())
+    )
+    started = time.perf_counter()
+
+    while True:
+        try:
+            with unit_of_work():
+                expired = _expire_chunk(summary.cut_off, chunk_size)
         except Exception as err:  # pylint: disable=broad-except
             app.logger.error(f"Unexpected error: {str(err)}")
             app.logger.error(traceback.format_exc())
+            summary.failed = True
+            break
+        if not expired:
+            break
+        summary.expired += len(expired)
+        summary.chunks += 1
+        app.logger.info(
+            f"Expired {len(expired)} registrations, ids {expired[0][0]} to {expired[-1][0]}"
+        )
+        if len(expired) < chunk_size:
+            break
+
+    summary.elapsed_seconds = round(time.perf_counter() - started, 3)
+    app.logger.info(f"Registration expiry run summary: {asdict(summary)}")
+    return summary
 
 
 def run():
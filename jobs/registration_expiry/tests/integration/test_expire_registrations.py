@@ -0,0 +1,164 @@
+# pylint: disable=C0114, C0116, W0613, W0621
+"""Set-based registration expiry.
+
+The benchmarks are marked slow, run them with `pytest -m slow -s`.
+"""
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert, text
+from strr_api.models import db
+from strr_api.models.rental import Registration
+from strr_api.models.user import User
+from strr_api.services.permit_snapshot_service import REDIS_KEY_PREFIX, permit_cache
+
+from registration_expiry.config import TestConfig
+from registration_expiry.job import (
+    create_app,
+    update_status_for_registration_expired_applications,
+)
+
+
+@pytest.fixture
+def expiry_app(db_engine):
+    """Job app bound to the migrated test database, cleaned up after the test."""
+    TestConfig.SQLALCHEMY_DATABASE_URI = str(db_engine.url)
+    app = create_app("test")
+    with app.app_context():
+        yield app
+        db.session.rollback()
+        for table in ("events", "registrations_history", "registrations", "users"):
+            db.session.execute(text(f"DELETE FROM {table}"))
+        db.session.commit()
+
+
+def _insert_registrations(
+    count: int, expired_days_ago: int = 1, status: str = "ACTIVE", first_id: int = 1
+):
+    now = datetime.now()
+    if not db.session.get(User, 1):
+        db.session.execute(
+            insert(User.__table__).values(id=1, firstname="Expiry", lastname="Job")
+        )
+    db.session.execute(
+        insert(Registration.__table__),
+        [
+            {
+                "id": registration_id,
+                "registration_type": "HOST",
+                "registration_number": f"H{registration_id:09d}",
+                "sbc_account_id": 1,
+                "status": status,
+                "start_date": now - timedelta(days=365),
+                "expiry_date": now - timedelta(days=expired_days_ago),
+                "updated_date": now,
+                "user_id": 1,
+                "version": 1,
+            }
+            for registration_id in range(first_id, first_id + count)
+        ],
+    )
+    db.session.commit()
+
+
+def _count(sql: str) -> int:
+    return db.session.execute(text(sql)).scalar_one()
+
+
+def test_expires_registrations_in_chunks(expiry_app):
+    _insert_registrations(5)
+    _insert_registrations(2, expired_days_ago=-30, first_id=6)
+    _insert_registrations(1, status="EXPIRED", first_id=8)
+
+    summary = update_status_for_registration_expired_applications(
+        expiry_app, chunk_size=2
+    )
+
+    assert summary.expired == 5
+    assert summary.chunks == 3
+    assert not summary.failed
+    assert _count("SELECT COUNT(*) FROM registrations WHERE status = 'EXPIRED'") == 6
+    assert _count("SELECT COUNT(*) FROM registrations WHERE status = 'ACTIVE'") == 2
+    assert (
+        _count(
+            "SELECT COUNT(*) FROM registrations WHERE status = 'EXPIRED' AND version = 2"
+        )
+        == 5
+    )
+    # The history keeps the version each registration had before it expired
+    assert (
+        _count(
+            "SELECT COUNT(*) FROM registrations_history WHERE status = 'ACTIVE' AND version = 1"
+        )
+        == 5
+    )
+    assert (
+        _count("SELECT COUNT(*) FROM events WHERE event_name = 'REGISTRATION_EXPIRED'")
+        == 5
+    )
+
+
+def test_rerun_is_idempotent(expiry_app):
+    _insert_registrations(3)
+
+    assert update_status_for_registration_expired_applications(expiry_app).expired == 3
+    summary = update_status_for_registration_expired_applications(expiry_app)
+
+    assert summary.expired == 0
+    assert summary.chunks == 0
+    assert _count("SELECT COUNT(*) FROM registrations_history") == 3
+    assert _count("SELECT COUNT(*) FROM events") == 3
+
+
+@pytest.fixture
+def shared_permit_cache(redis_container, redis_client, db_engine):
+    """Expiry app whose permit cache talks to the test Redis, restored after the test."""
+    TestConfig.SQLALCHEMY_DATABASE_URI = str(db_engine.url)
+    TestConfig.REDIS_HOST = redis_container.get_container_host_ip()
+    TestConfig.REDIS_PORT = redis_container.get_exposed_port(6379)
+    app = create_app("test")
+    try:
+        with app.app_context():
+            yield app, redis_client
+            db.session.rollback()
+            for table in ("events", "registrations_history", "registrations", "users"):
+                db.session.execute(text(f"DELETE FROM {table}"))
+            db.session.commit()
+    finally:
+        TestConfig.REDIS_HOST = ""
+        permit_cache.redis = None
+        permit_cache.clear()
+
+
+def test_expiry_drops_shared_permit_snapshots(shared_permit_cache):
+    app, redis_client = shared_permit_cache
+    _insert_registrations(2)
+    for registration_id in (1, 2):
+        redis_client.set(
+            f"{REDIS_KEY_PREFIX}H{registration_id:09d}", '{"status": "ACTIVE"}'
+        )
+    redis_client.set(f"{REDIS_KEY_PREFIX}H000000099", '{"status": "ACTIVE"}')
+
+    assert update_status_for_registration_expired_applications(app).expired == 2
+
+    assert redis_client.get(f"{REDIS_KEY_PREFIX}H000000001") is None
+    assert redis_client.get(f"{REDIS_KEY_PREFIX}H000000002") is None
+    assert redis_client.get(f"{REDIS_KEY_PREFIX}H000000099") is not None
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("count", [10_000, 100_000])
+def test_expiry_benchmark(expiry_app, count):
+    _insert_registrations(count)
+
+    started = time.perf_counter()
+    summary = update_status_for_registration_expired_applications(expiry_app)
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"\nexpired {summary.expired} registrations in {summary.chunks} chunks, {elapsed:.2f}s"
+    )
+    assert summary.expired == count
+    assert _count("SELECT COUNT(*) FROM registrations_history") == count
+    assert _count("SELECT COUNT(*) FROM events") == count
@@ -69,6 +69,9 @@ class _Config:  # pylint: disable=too-few-public-methods
     # projects/<project_id-env>/topics/<topic_name>
     GCP_EMAIL_TOPIC = os.getenv("GCP_EMAIL_TOPIC")
 
+    # Reminders queued and committed together
+    REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", "500"))
+
     TESTING = False
     DEBUG = False
 
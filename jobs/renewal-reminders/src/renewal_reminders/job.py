@@ -12,7 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Registration Renewal Reminder Job."""
+from dataclasses import dataclass
+from datetime import date
 from datetime import datetime
+from datetime import time
 from datetime import timedelta
 from datetime import timezone
 import logging
@@ -21,14 +24,18 @@ import traceback
 
 from flask import Flask
 from flask_migrate import Migrate
+from sqlalchemy import and_
 from sqlalchemy import exists
-from sqlalchemy import func
+from sqlalchemy import or_
+from sqlalchemy import select
+from sqlalchemy import true
 from strr_api.enums.enum import ApplicationType
 from strr_api.enums.enum import RegistrationStatus
 from strr_api.models import CustomerInteraction
 from strr_api.models import db
 from strr_api.models.application import Application
 from strr_api.models.rental import Registration
+from strr_api.models.unit_of_work import unit_of_work
 from strr_api.services.email_service import EmailService
 from strr_api.services.events_service import Events
 from strr_api.services.events_service import EventsService
@@ -47,219 +54,136 @@ def renewal_job_key(target_date: datetime = datetime.now(timezone.utc), days: in
     return f"{target_date.year}:RENEWAL_REMINDER:{days}"
 
 
-def send_forty_days_reminder(app, registration_type):
-    """Send the reminder before 40 days."""
-    with app.app_context():
-        app.logger.info("Starting 40 days renewal notifications")
-
-        days = 40
-        target_date = (datetime.now(timezone.utc) + timedelta(days=days)).date()
-        job_key = renewal_job_key(target_date, days)
-
-        # Create the subquery correlating CustomerInteraction to Registrations
-        interaction_exists = exists().where(
-            CustomerInteraction.registration_id == Registration.id,
-            CustomerInteraction.idempotency_key == job_key,
-        )
-
-        # Filter the registrations (Database-level exclusion)
-        registrations = Registration.query.filter(
-            Registration.registration_type == registration_type,
-            Registration.status == RegistrationStatus.ACTIVE,
-            func.date(Registration.expiry_date) == target_date,
-            ~interaction_exists,  # Only return records that lack this specific interaction
-        ).all()
-
-        app.logger.info(f"Found {len(registrations)} active registrations expiring in 40 days.")
-
-        for reg in registrations:
-            app.logger.info(
-                f"Sending reminder for registration ID: {reg.id} using job key {job_key}"
-            )
-
-            EmailService.send_renewal_reminder_for_registration(
-                registration=reg, interaction=job_key
+@dataclass(frozen=True)
+class ReminderRule:
+    """One renewal reminder: which registrations get it and how many days before they expire."""
+
+    registration_type: str
+    days: int
+    skip_if_renewal_in_progress: bool = False
+
+
+REMINDER_SCHEDULE = (
+    ReminderRule(Registration.RegistrationType.HOST.value, 40),
+    ReminderRule(Registration.RegistrationType.HOST.value, 14, skip_if_renewal_in_progress=True),
+    ReminderRule(Registration.RegistrationType.HOST.value, 0, skip_if_renewal_in_progress=True),
+    ReminderRule(Registration.RegistrationType.PLATFORM.value, 40),
+    ReminderRule(
+        Registration.RegistrationType.PLATFORM.value, 14, skip_if_renewal_in_progress=True
+    ),
+    ReminderRule(Registration.RegistrationType.STRATA_HOTEL.value, 60),
+    ReminderRule(
+        Registration.RegistrationType.STRATA_HOTEL.value, 30, skip_if_renewal_in_progress=True
+    ),
+)
+
+# A renewal application in one of these states does not stop the reminders
+RENEWAL_NOT_STARTED_STATUSES = (Application.Status.DRAFT, Application.Status.PAYMENT_DUE)
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min)
+
+
+def find_due_reminders(today: date, schedule=REMINDER_SCHEDULE) -> list:
+    """Return (rule, registration row) pairs for every reminder due today.
+
+    Every rule is evaluated by one query: the expiry date ranges of the rules are matched with the expiry date index,
+    registrations already reminded under the rule's job key are excluded, and the status of the latest renewal
+    application comes from a lateral join.
+    """
+    rules_by_key = {}
+    branches = []
+    for rule in schedule:
+        target_date = today + timedelta(days=rule.days)
+        job_key = renewal_job_key(target_date, rule.days)
+        rules_by_key[(rule.registration_type, target_date)] = (rule, job_key)
+        branches.append(
+            and_(
+                Registration.registration_type == rule.registration_type,
+                Registration.expiry_date >= _day_start(target_date),
+                Registration.expiry_date < _day_start(target_date + timedelta(days=1)),
+                ~exists().where(
+                    CustomerInteraction.registration_id == Registration.id,
+                    CustomerInteraction.idempotency_key == job_key,
+                ),
             )
-            EventsService.save_event(
-                event_type=Events.EventType.REGISTRATION,
-                event_name=Events.EventName.RENEWAL_REMINDER_SENT,
-                registration_id=reg.id,
-            )
-        app.logger.info("Finished sending 40 days renewal notifications")
-
-
-def send_final_day_reminder(app, registration_type):
-    """Send the reminder on the last day of the permit before expiry."""
-    with app.app_context():
-        app.logger.info("Starting final day renewal notifications")
-
-        days = 0
-        target_date = (datetime.now(timezone.utc) + timedelta(days=days)).date()
-        job_key = renewal_job_key(target_date, days)
-
-        # Create the subquery correlating CustomerInteraction to Registrations
-        interaction_exists = exists().where(
-            CustomerInteraction.registration_id == Registration.id,
-            CustomerInteraction.idempotency_key == job_key,
         )
-        registrations = Registration.query.filter(
-            Registration.registration_type == registration_type,
-            Registration.status == RegistrationStatus.ACTIVE,
-            func.date(Registration.expiry_date) == target_date,
-            ~interaction_exists,
-        ).all()
-        app.logger.info(f"Found {len(registrations)} active registrations expiring in 1 day.")
-        for reg in registrations:
-            renewal_application = (
-                Application.query.filter(
-                    Application.registration_id == reg.id,
-                    Application.type == ApplicationType.RENEWAL.value,
-                )
-                .order_by(Application.id.desc())
-                .first()
-            )
-            if not renewal_application or renewal_application.status in [
-                Application.Status.DRAFT,
-                Application.Status.PAYMENT_DUE,
-            ]:
-                app.logger.info(f"Sending reminder for registration ID: {reg.id}")
-                EmailService.send_renewal_reminder_for_registration(
-                    registration=reg, interaction=job_key
-                )
-                EventsService.save_event(
-                    event_type=Events.EventType.REGISTRATION,
-                    event_name=Events.EventName.RENEWAL_REMINDER_SENT,
-                    registration_id=reg.id,
-                )
-        app.logger.info("Finished sending final day renewal notifications.")
-
 
-def send_fourteen_days_reminder(app, registration_type):
-    """Send the reminder before 14 days."""
-    with app.app_context():
-        app.logger.info("Starting 14 days renewal notifications")
-        days = 14
-        target_date = (datetime.now(timezone.utc) + timedelta(days=days)).date()
-        job_key = renewal_job_key(target_date, days)
-
-        # Create the subquery correlating CustomerInteraction to Registrations
-        interaction_exists = exists().where(
-            CustomerInteraction.registration_id == Registration.id,
-            CustomerInteraction.idempotency_key == job_key,
+    latest_renewal = (
+        select(Application.status.label("renewal_status"))
+        .where(
+            Application.registration_id == Registration.id,
+            Application.type == ApplicationType.RENEWAL.value,
         )
-
-        registrations = Registration.query.filter(
-            Registration.registration_type == registration_type,
-            Registration.status == RegistrationStatus.ACTIVE,
-            func.date(Registration.expiry_date) == target_date,
-            ~interaction_exists,
-        ).all()
-        app.logger.info(f"Found {len(registrations)} active registrations expiring in 14 days.")
-        for reg in registrations:
-            renewal_application = (
-                Application.query.filter(
-                    Application.registration_id == reg.id,
-                    Application.type == ApplicationType.RENEWAL.value,
-                )
-                .order_by(Application.id.desc())
-                .first()
-            )
-            if not renewal_application or renewal_application.status in [
-                Application.Status.DRAFT,
-                Application.Status.PAYMENT_DUE,
-            ]:
-                app.logger.info(f"Sending reminder for registration ID: {reg.id}")
-                EmailService.send_renewal_reminder_for_registration(
-                    registration=reg, interaction=job_key
-                )
-                EventsService.save_event(
-                    event_type=Events.EventType.REGISTRATION,
-                    event_name=Events.EventName.RENEWAL_REMINDER_SENT,
-                    registration_id=reg.id,
-                )
-        app.logger.info("Finished sending 14 days renewal notifications")
-
-
-def send_sixty_days_reminder_for_strata_hotels(app):
-    """Send the reminder before 60 days."""
-    with app.app_context():
-        app.logger.info("Starting 60 days renewal notifications")
-        days = 60
-        target_date = (datetime.now(timezone.utc) + timedelta(days=days)).date()
-        job_key = renewal_job_key(target_date, days)
-
-        # Create the subquery correlating CustomerInteraction to Registrations
-        interaction_exists = exists().where(
-            CustomerInteraction.registration_id == Registration.id,
-            CustomerInteraction.idempotency_key == job_key,
+        .order_by(Application.id.desc())
+        .limit(1)
+        .lateral()
+    )
+    rows = db.session.execute(
+        select(
+            Registration.id,
+            Registration.registration_number,
+            Registration.registration_type,
+            Registration.expiry_date,
+            latest_renewal.c.renewal_status,
         )
-
-        registrations = Registration.query.filter(
-            Registration.registration_type == Registration.RegistrationType.STRATA_HOTEL,
+        .outerjoin(latest_renewal, true())
+        .where(
             Registration.status == RegistrationStatus.ACTIVE,
-            func.date(Registration.expiry_date) == target_date,
-            ~interaction_exists,
-        ).all()
-        app.logger.info(
-            f"Found {len(registrations)} active strata hotel registrations expiring in 60 days."
+            Registration.expiry_date >= _day_start(today),
+            Registration.expiry_date
+            < _day_start(today + timedelta(days=max(rule.days for rule in schedule) + 1)),
+            or_(*branches),
         )
-        for reg in registrations:
-            app.logger.info(f"Sending reminder for registration ID: {reg.id}")
-            EmailService.send_renewal_reminder_for_registration(
-                registration=reg, interaction=job_key
-            )
-            EventsService.save_event(
-                event_type=Events.EventType.REGISTRATION,
-                event_name=Events.EventName.RENEWAL_REMINDER_SENT,
-                registration_id=reg.id,
-            )
-        app.logger.info("Finished sending 60 days renewal notifications")
-
-
-def send_thirty_days_reminder_for_strata_hotels(app):
-    """Send the reminder before 30 days."""
-    with app.app_context():
-        app.logger.info("Starting 30 days renewal notifications")
-        days = 30
-        target_date = (datetime.now(timezone.utc) + timedelta(days=days)).date()
-        job_key = renewal_job_key(target_date, days)
-
-        # Create the subquery correlating CustomerInteraction to Registrations
-        interaction_exists = exists().where(
-            CustomerInteraction.registration_id == Registration.id,
-            CustomerInteraction.idempotency_key == job_key,
+        .order_by(Registration.id)
+    ).all()
+
+    due = []
+    for row in rows:
+        rule, job_key = rules_by_key[(row.registration_type, row.expiry_date.date())]
+        if (
+            rule.skip_if_renewal_in_progress
+            and row.renewal_status is not None
+            and row.renewal_status not in RENEWAL_NOT_STARTED_STATUSES
+        ):
+            continue
+        due.append((rule, job_key, row))
+    return due
+
+
+def send_renewal_reminders(app, today: date = None) -> dict:
+    """Send every renewal reminder due today and return how many were sent per (type, days) rule."""
+    today = today or datetime.now(timezone.utc).date()
+    batch_size = app.config["REMINDER_BATCH_SIZE"]
+    due = find_due_reminders(today)
+    app.logger.info(f"Found {len(due)} renewal reminders due.")
+
+    by_key = {}
+    for rule, job_key, row in due:
+        by_key.setdefault((rule, job_key), []).append(row)
+
+    sent = {}
+    for (rule, job_key), registrations in by_key.items():
+        app.logger.info(
+            f"Sending {len(registrations)} {rule.registration_type} {rule.days} days renewal "
+            f"reminders using job key {job_key}"
         )
-
-        registrations = Registration.query.filter(
-            Registration.registration_type == Registration.RegistrationType.STRATA_HOTEL,
-            Registration.status == RegistrationStatus.ACTIVE,
-            func.date(Registration.expiry_date) == target_date,
-            ~interaction_exists,
-        ).all()
-        app.logger.info(f"Found {len(registrations)} active registrations expiring in 30 days.")
-        for reg in registrations:
-            renewal_application = (
-                Application.query.filter(
-                    Application.registration_id == reg.id,
-                    Application.type == ApplicationType.RENEWAL.value,
-                )
-                .order_by(Application.id.desc())
-                .first()
-            )
-            if not renewal_application or renewal_application.status in [
-                Application.Status.DRAFT,
-                Application.Status.PAYMENT_DUE,
-            ]:
-                app.logger.info(f"Sending reminder for registration ID: {reg.id}")
-                EmailService.send_renewal_reminder_for_registration(
-                    registration=reg, interaction=job_key
+        for start in range(0, len(registrations), batch_size):
+            batch = registrations[start : start + batch_size]
+            with unit_of_work():
+                EmailService.send_renewal_reminders(registrations=batch, interaction=job_key)
+                EventsService.save_events(
+                    {
+                        "event_type": Events.EventType.REGISTRATION,
+                        "event_name": Events.EventName.RENEWAL_REMINDER_SENT,
+                        "registration_id": registration.id,
+                    }
+                    for registration in batch
                 )
-                EventsService.save_event(
-                    event_type=Events.EventType.REGISTRATION,
-                    event_name=Events.EventName.RENEWAL_REMINDER_SENT,
-                    registration_id=reg.id,
-                )
-        app.logger.info("Finished sending 30 days renewal notifications")
+        sent[(rule.registration_type, rule.days)] = len(registrations)
+    app.logger.info(f"Finished sending renewal reminders: {sent}")
+    return sent
 
 
 def run(app: Flask = None):
@@ -269,15 +193,7 @@ def run(app: Flask = None):
             app = create_app()
         with app.app_context():
             app.logger.info("Starting renewal reminder job")
-            send_forty_days_reminder(app, registration_type=Registration.RegistrationType.HOST)
-            send_fourteen_days_reminder(app, registration_type=Registration.RegistrationType.HOST)
-            send_final_day_reminder(app, registration_type=Registration.RegistrationType.HOST)
-            send_forty_days_reminder(app, registration_type=Registration.RegistrationType.PLATFORM)
-            send_fourteen_days_reminder(
-                app, registration_type=Registration.RegistrationType.PLATFORM
-            )
-            send_sixty_days_reminder_for_strata_hotels(app)
-            send_thirty_days_reminder_for_strata_hotels(app)
+            send_renewal_reminders(app)
             app.logger.info("Renewal reminder job completed")
     except Exception as err:  # pylint: disable=broad-except
         app.logger.error(f"Unexpected error: {str(err)}")
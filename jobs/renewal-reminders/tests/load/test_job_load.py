@@ -66,9 +66,7 @@ def test_40_validation_scan(mocker, app, session, setup_bulk_parents):
     expected_40_day_ids = graph_info["target_reg_ids"][40]
     assert len(expected_40_day_ids) == scenario["records"]
 
-    mock_service = mocker.patch(
-        "renewal_reminders.job.EmailService.send_renewal_reminder_for_registration"
-    )
+    mock_service = mocker.patch("renewal_reminders.job.EmailService.send_renewal_reminders")
 
     from renewal_reminders.job import run
 
@@ -85,7 +83,7 @@ def test_40_validation_scan(mocker, app, session, setup_bulk_parents):
     mock_service.assert_called_once()
 
     _, kwargs = mock_service.call_args
-    assert kwargs["registration"].id == registration.id
+    assert [reg.id for reg in kwargs["registrations"]] == [registration.id]
 
 
 scenario_idempotent = {
@@ -105,9 +103,7 @@ def test_single_idempotent_skip(mocker, app, session, setup_bulk_parents):
     expected_day_ids = graph_info["target_reg_ids"][0]
     assert len(expected_day_ids) == scenario["records"]
 
-    mock_service = mocker.patch(
-        "renewal_reminders.job.EmailService.send_renewal_reminder_for_registration"
-    )
+    mock_service = mocker.patch("renewal_reminders.job.EmailService.send_renewal_reminders")
 
     from renewal_reminders.job import renewal_job_key
     from renewal_reminders.job import run
@@ -167,9 +163,7 @@ def test_idempotent_skip(mocker, app, session, setup_bulk_parents):
     graph_info, scenario = setup_bulk_parents
     assert graph_info["record_count"] == scenario["records"]
 
-    mock_service = mocker.patch(
-        "renewal_reminders.job.EmailService.send_renewal_reminder_for_registration"
-    )
+    mock_service = mocker.patch("renewal_reminders.job.EmailService.send_renewal_reminders")
 
     from renewal_reminders.job import renewal_job_key
     from renewal_reminders.job import run
@@ -190,4 +184,5 @@ def test_idempotent_skip(mocker, app, session, setup_bulk_parents):
 
     run(app)
 
-    assert mock_service.call_count == (scenario["records"] - expected_skip_count)
+    sent = sum(len(call.kwargs["registrations"]) for call in mock_service.call_args_list)
+    assert sent == (scenario["records"] - expected_skip_count)
@@ -2,6 +2,7 @@ import logging
 import time
 
 import pytest
+from sqlalchemy import event
 
 # We want to test chunk sizes of 500, 1000, 2000, 5000, and 10000
 chunk_scenarios = [
@@ -22,3 +23,46 @@ def test_benchmark_chunk_sizes(setup_bulk_parents, request, capsys):
     # Check the logs for the chunk times, to choose the best chunk_size
     captured = capsys.readouterr()
     # assert False, f"\n--- BENCHMARK RESULTS ---\n{captured.out}"
+
+
+reminder_run_scenarios = [
+    {"records": 50000, "chunk_size": 2000, "target_days": [0, 14, 40], "target_pct": 0.05},
+]
+
+
+@pytest.mark.load
+@pytest.mark.parametrize("setup_bulk_parents", reminder_run_scenarios, indirect=True)
+def test_benchmark_reminder_run(mocker, app, session, setup_bulk_parents):
+    """Time a full reminder run over 50k registrations, found with a single registrations query."""
+    graph_info, scenario = setup_bulk_parents
+    publish = mocker.patch("strr_api.services.email_service.gcp_queue_publisher.publish_many")
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    from renewal_reminders.job import send_renewal_reminders
+
+    bind = session.get_bind()
+    event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    start_time = time.perf_counter()
+    try:
+        sent = send_renewal_reminders(app)
+    finally:
+        event.remove(bind, "before_cursor_execute", before_cursor_execute)
+    duration = time.perf_counter() - start_time
+
+    expected = sum(len(ids) for ids in graph_info["target_reg_ids"].values())
+    print(
+        f"\n[PROFILER] Sent {sum(sent.values())} reminders over {scenario['records']} registrations "
+        f"with {len(statements)} statements -> Time: {duration:.3f} seconds"
+    )
+    assert sum(sent.values()) == expected
+    assert sum(len(call.args[0]) for call in publish.call_args_list) == expected
+    registration_scans = [
+        statement
+        for statement in statements
+        if statement.lstrip().startswith("SELECT registrations.id")
+    ]
+    assert len(registration_scans) == 1
@@ -99,6 +99,19 @@ class _Config:  # pylint: disable=too-few-public-methods
     BACKFILL_REGISTRATION_SEARCH_BATCH_SIZE = int(
         os.getenv("BACKFILL_REGISTRATION_SEARCH_BATCH_SIZE") or "100"
     )
+    BACKFILL_ADDRESS_MATCH_KEYS = (
+        os.getenv("BACKFILL_ADDRESS_MATCH_KEYS", "False").lower() == "true"
+    )
+    BACKFILL_ADDRESS_MATCH_KEYS_BATCH_SIZE = int(
+        os.getenv("BACKFILL_ADDRESS_MATCH_KEYS_BATCH_SIZE") or "1000"
+    )
+    BACKFILL_SNAPSHOT_DELTAS = (
+        os.getenv("BACKFILL_SNAPSHOT_DELTAS", "False").lower() == "true"
+    )
+    BACKFILL_SNAPSHOT_DELTAS_BATCH_SIZE = int(
+        os.getenv("BACKFILL_SNAPSHOT_DELTAS_BATCH_SIZE") or "100"
+    )
+    SNAPSHOT_KEYFRAME_INTERVAL = int(os.getenv("SNAPSHOT_KEYFRAME_INTERVAL") or "10")
 
     # GEOCODER
     GEOCODER_SVC_URL = os.getenv("GEOCODER_API_URL", "")
@@ -17,12 +17,19 @@ import os
 
 from flask import Flask
 from sentry_sdk.integrations.logging import LoggingIntegration
+from sqlalchemy import func, select, update
 from strr_api.enums.enum import StrataHotelCategory
-from strr_api.models import db
+from strr_api.models import Address, RegistrationSnapshot, db
 from strr_api.models.application import Application
 from strr_api.models.rental import Registration, RentalProperty
 from strr_api.models.strata_hotels import StrataHotel
-from strr_api.services import ApprovalService, RegistrationService
+from strr_api.services import (
+    RegistrationService,
+    SnapshotService,
+    StrRequirementsService,
+)
+from strr_api.services.geocode_cache import geocode_cache
+from strr_api.utils.address_match import address_match_keys
 
 from backfiller.config import CONFIGURATION
 from backfiller.utils.logging import setup_logging
@@ -62,17 +69,15 @@ def backfill_jurisdiction(app):
         try:
             app.logger.info(f"Processing registration {str(registration.id)}")
             address = registration.rental_property.address
-            address_line_1 = ""
-            if unit_number := address.unit_number:
-                address_line_1 = f"{unit_number}-"
-            address_line_1 = (
-                f"{address_line_1}{address.street_number} {address.street_address}"
+            address = StrRequirementsService.format_address(
+                address.street_number,
+                address.street_address,
+                address.city,
+                address.province,
+                unit_number=address.unit_number,
+                address_line_2=address.street_address_additional,
             )
-            address_line_2 = {address.street_address_additional}
-            address = (
-                f"{address_line_1} {address_line_2}, {address.city}, {address.province}"
-            )
-            str_data = ApprovalService.getSTRDataForAddress(address=address)
+            str_data = StrRequirementsService.get_requirements(address)
             if not str_data:
                 app.logger.info(
                     f"Could not get the requirements for registration {registration.id}, Address: {address}"
@@ -88,6 +93,7 @@ def backfill_jurisdiction(app):
                 rental_property.save()
         except Exception as err:  # pylint: disable=broad-except
             app.logger.error(f"Unexpected error: {str(err)}")
+    app.logger.info(f"Geocode cache stats: {geocode_cache.stats.to_dict()}")
 
 
 def backfill_strata_hotel_category(app):
@@ -289,6 +295,120 @@ def backfill_registration_search(app, batch_size=100):
     app.logger.info(f"Total errors: {stats['total_errors']}")
 
 
+def backfill_address_match_keys(app, batch_size=1000):
+    """Backfill the normalized address match keys for addresses written before they existed."""
+
+    stats = {"total_processed": 0, "total_updated": 0, "total_errors": 0}
+    last_id = 0
+
+    while True:
+        # Only the source columns are read, and rows are updated by primary key in one statement per batch.
+        batch = (
+            db.session.query(
+                Address.id,
+                Address.street_number,
+                Address.street_address,
+                Address.postal_code,
+                Address.unit_number,
+            )
+            .filter(Address.match_postal_code.is_(None), Address.id > last_id)
+            .order_by(Address.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            break
+        last_id = batch[-1].id
+        stats["total_processed"] += len(batch)
+
+        try:
+            db.session.execute(
+                update(Address),
+                [
+                    {
+                        "id": row.id,
+                        **address_match_keys(
+                            row.street_number,
+                            row.street_address,
+                            row.postal_code,
+                            row.unit_number,
+                        ),
+                    }
+                    for row in batch
+                ],
+            )
+            db.session.commit()
+            stats["total_updated"] += len(batch)
+        except Exception as err:  # pylint: disable=broad-except
+            db.session.rollback()
+            stats["total_errors"] += len(batch)
+            app.logger.error(
+                f"Error updating addresses {batch[0].id}-{last_id}: {str(err)}"
+            )
+
+        app.logger.info(
+            f"Progress: {stats['total_processed']} addresses "
+            f"(Updated: {stats['total_updated']}, Errors: {stats['total_errors']})"
+        )
+
+    app.logger.info("Address match key backfill completed!")
+    app.logger.info(f"Total processed: {stats['total_processed']}")
+    app.logger.info(f"Total updated: {stats['total_updated']}")
+    app.logger.info(f"Total errors: {stats['total_errors']}")
+    return stats
+
+
+def backfill_snapshot_deltas(app, batch_size=100):
+    """Rewrite registration snapshots taken before delta snapshots as keyframes and JSON patch deltas."""
+
+    stats = {"total_processed": 0, "total_compacted": 0, "total_errors": 0}
+    interval = app.config.get("SNAPSHOT_KEYFRAME_INTERVAL") or 10
+    # Registrations with more keyframes than a compacted history keeps, one per interval versions
+    keyframes = func.count().filter(RegistrationSnapshot.is_keyframe)
+    last_id = 0
+
+    while True:
+        registration_ids = (
+            db.session.execute(
+                select(RegistrationSnapshot.registration_id)
+                .where(RegistrationSnapshot.registration_id > last_id)
+                .group_by(RegistrationSnapshot.registration_id)
+                .having((keyframes - 1) * interval >= func.count())
+                .order_by(RegistrationSnapshot.registration_id)
+                .limit(batch_size)
+            )
+            .scalars()
+            .all()
+        )
+        if not registration_ids:
+            break
+        last_id = registration_ids[-1]
+
+        for registration_id in registration_ids:
+            stats["total_processed"] += 1
+            try:
+                stats["total_compacted"] += SnapshotService.compact_snapshots(
+                    registration_id
+                )
+            except Exception as err:  # pylint: disable=broad-except
+                db.session.rollback()
+                stats["total_errors"] += 1
+                app.logger.error(
+                    f"Error compacting snapshots of registration {registration_id}: {str(err)}"
+                )
+
+        app.logger.info(
+            f"Progress: {stats['total_processed']} registrations "
+            f"(Snapshots compacted: {stats['total_compacted']}, Errors: {stats['total_errors']})"
+        )
+
+    app.logger.info("Snapshot delta backfill completed!")
+    app.logger.info(f"Total processed: {stats['total_processed']}")
+    app.logger.info(f"Total compacted: {stats['total_compacted']}")
+    app.logger.info(f"Total errors: {stats['total_errors']}")
+    return stats
+
+
 def run():
     """Run the backfiller job."""
     try:
@@ -306,6 +426,24 @@ def run():
                 )
                 backfill_registration_search(app, batch_size=batch_size)
 
+            if app.config.get("BACKFILL_ADDRESS_MATCH_KEYS", False):
+                batch_size = app.config.get(
+                    "BACKFILL_ADDRESS_MATCH_KEYS_BATCH_SIZE", 1000
+                )
+                app.logger.info(
+                    "Running address match key backfiller with batch size %s",
+                    batch_size,
+                )
+                backfill_address_match_keys(app, batch_size=batch_size)
+
+            if app.config.get("BACKFILL_SNAPSHOT_DELTAS", False):
+                batch_size = app.config.get("BACKFILL_SNAPSHOT_DELTAS_BATCH_SIZE", 100)
+                app.logger.info(
+                    "Running snapshot delta backfiller with batch size %s",
+                    batch_size,
+                )
+                backfill_snapshot_deltas(app, batch_size=batch_size)
+
             # backfill_jurisdiction(app)
             # backfill_strata_hotel_category(app)
     except Exception as err:  # pylint: disable=broad-except
@@ -46,7 +46,6 @@ from flask import current_app
 from flask import jsonify
 from flask import request
 from jinja2 import Template
-import requests
 from simple_cloudevent import SimpleCloudEvent
 from strr_api.enums.enum import ChannelType
 from strr_api.enums.enum import RegistrationNocStatus
@@ -59,6 +58,7 @@ from strr_api.models.application import ApplicationSerializer
 from strr_api.services import AuthService
 from strr_api.services import InteractionService
 from strr_api.services import RegistrationService
+from strr_api.services.http_client import http_client
 from strr_api.services.interaction import EmailInfo
 from structured_logging import StructuredLogging
 
@@ -195,8 +195,9 @@ def worker():
 
     else:
         token = AuthService.get_service_client_token()
-        resp = requests.post(
+        resp = http_client.post(
             current_app.config["NOTIFY_SVC_URL"],
+            service="notify",
             json=email,
             headers={
                 "Content-Type": "application/json",
@@ -0,0 +1,47 @@
+"""Add normalized address match keys
+
+Revision ID: 3b8e41c7d2a5
+Revises: f25ac17d6c02
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '3b8e41c7d2a5'
+down_revision = 'f25ac17d6c02'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The keys are filled in as addresses are written; existing rows are backfilled by the
+    # strr-backfiller job (BACKFILL_ADDRESS_MATCH_KEYS).
+    with op.batch_alter_table('addresses', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('match_street_number', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('match_postal_code', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('match_postal_prefix', sa.String(length=4), nullable=True))
+        batch_op.add_column(sa.Column('match_unit_number', sa.String(), nullable=True))
+        batch_op.create_index('ix_addresses_match_keys', ['match_postal_prefix', 'match_street_number'], unique=False)
+
+    with op.batch_alter_table('addresses_history', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('match_street_number', sa.String(), autoincrement=False, nullable=True))
+        batch_op.add_column(sa.Column('match_postal_code', sa.String(), autoincrement=False, nullable=True))
+        batch_op.add_column(sa.Column('match_postal_prefix', sa.String(length=4), autoincrement=False, nullable=True))
+        batch_op.add_column(sa.Column('match_unit_number', sa.String(), autoincrement=False, nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('addresses_history', schema=None) as batch_op:
+        batch_op.drop_column('match_unit_number')
+        batch_op.drop_column('match_postal_prefix')
+        batch_op.drop_column('match_postal_code')
+        batch_op.drop_column('match_street_number')
+
+    with op.batch_alter_table('addresses', schema=None) as batch_op:
+        batch_op.drop_index('ix_addresses_match_keys')
+        batch_op.drop_column('match_unit_number')
+        batch_op.drop_column('match_postal_prefix')
+        batch_op.drop_column('match_postal_code')
+        batch_op.drop_column('match_street_number')
@@ -0,0 +1,34 @@
+"""Index notice of consideration end dates for the NOC expiry job
+
+Revision ID: 5d2c7a9e4b61
+Revises: 3b8e41c7d2a5
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '5d2c7a9e4b61'
+down_revision = '3b8e41c7d2a5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('notice_of_consideration', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_notice_of_consideration_application_id'), ['application_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_notice_of_consideration_end_date'), ['end_date'], unique=False)
+
+    with op.batch_alter_table('registration_notice_of_consideration', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_registration_notice_of_consideration_registration_id'), ['registration_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_registration_notice_of_consideration_end_date'), ['end_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('registration_notice_of_consideration', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_registration_notice_of_consideration_end_date'))
+        batch_op.drop_index(batch_op.f('ix_registration_notice_of_consideration_registration_id'))
+
+    with op.batch_alter_table('notice_of_consideration', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_notice_of_consideration_end_date'))
+        batch_op.drop_index(batch_op.f('ix_notice_of_consideration_application_id'))
@@ -0,0 +1,30 @@
+"""Index registration expiry dates and application registrations for the renewal reminder job
+
+Revision ID: 8f1e6b3c9a27
+Revises: 5d2c7a9e4b61
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '8f1e6b3c9a27'
+down_revision = '5d2c7a9e4b61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('registrations', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_registrations_expiry_date'), ['expiry_date'], unique=False)
+
+    with op.batch_alter_table('application', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_application_registration_id'), ['registration_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('application', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_application_registration_id'))
+
+    with op.batch_alter_table('registrations', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_registrations_expiry_date'))
@@ -0,0 +1,24 @@
+"""Index certificate registrations for the has_certificate EXISTS
+
+Revision ID: 2c9d7f4e1a83
+Revises: 8f1e6b3c9a27
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '2c9d7f4e1a83'
+down_revision = '8f1e6b3c9a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('certificates', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_certificates_registration_id'), ['registration_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('certificates', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_certificates_registration_id'))
@@ -0,0 +1,31 @@
+"""Store registration snapshots as keyframes and JSON patch deltas
+
+Revision ID: 7b3e9d1f5c42
+Revises: 2c9d7f4e1a83
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '7b3e9d1f5c42'
+down_revision = '2c9d7f4e1a83'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('registration_snapshot', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('snapshot_patch', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+        batch_op.add_column(sa.Column('is_keyframe', sa.Boolean(), server_default='true', nullable=False))
+        batch_op.alter_column('snapshot_data', existing_type=postgresql.JSONB(astext_type=sa.Text()), nullable=True)
+
+
+def downgrade():
+    # Fails while delta snapshots exist, they have no snapshot_data.
+    with op.batch_alter_table('registration_snapshot', schema=None) as batch_op:
+        batch_op.alter_column('snapshot_data', existing_type=postgresql.JSONB(astext_type=sa.Text()), nullable=False)
+        batch_op.drop_column('is_keyframe')
+        batch_op.drop_column('snapshot_patch')
@@ -0,0 +1,25 @@
+"""Sequences behind the registration and application number allocator
+
+Revision ID: 4a6c8e2b0d19
+Revises: 7b3e9d1f5c42
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '4a6c8e2b0d19'
+down_revision = '7b3e9d1f5c42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(sa.schema.CreateSequence(sa.Sequence('registration_number_seq')))
+    op.execute(sa.schema.CreateSequence(sa.Sequence('application_number_seq')))
+
+
+def downgrade():
+    op.execute(sa.schema.DropSequence(sa.Sequence('application_number_seq')))
+    op.execute(sa.schema.DropSequence(sa.Sequence('registration_number_seq')))
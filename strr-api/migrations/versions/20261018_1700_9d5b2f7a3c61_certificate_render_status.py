@@ -0,0 +1,40 @@
+"""Certificate render status, keyed by registration version
+
+Revision ID: 9d5b2f7a3c61
+Revises: 4a6c8e2b0d19
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '9d5b2f7a3c61'
+down_revision = '4a6c8e2b0d19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('certificates', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('registration_version', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('status', sa.String(length=20), server_default='COMPLETED', nullable=False))
+        batch_op.add_column(sa.Column('error', sa.String(length=1000), nullable=True))
+        batch_op.add_column(sa.Column('updated_date', sa.DateTime(), nullable=True))
+        batch_op.alter_column('certificate', existing_type=sa.LargeBinary(), nullable=True)
+        batch_op.create_index(batch_op.f('ix_certificates_status'), ['status'], unique=False)
+        batch_op.create_unique_constraint(
+            batch_op.f('uq_certificates_registration_id'), ['registration_id', 'registration_version']
+        )
+
+
+def downgrade():
+    op.execute("DELETE FROM certificates WHERE certificate IS NULL")
+    with op.batch_alter_table('certificates', schema=None) as batch_op:
+        batch_op.drop_constraint(batch_op.f('uq_certificates_registration_id'), type_='unique')
+        batch_op.drop_index(batch_op.f('ix_certificates_status'))
+        batch_op.alter_column('certificate', existing_type=sa.LargeBinary(), nullable=False)
+        batch_op.drop_column('updated_date')
+        batch_op.drop_column('error')
+        batch_op.drop_column('status')
+        batch_op.drop_column('registration_version')
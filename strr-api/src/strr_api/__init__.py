@@ -49,8 +49,14 @@ from .common.auth import jwt
 from .common.run_version import get_run_version
 from .config import Config, Production
 from .models import db
+from .models.number_allocator import check_number_allocator_key
 from .resources import register_endpoints
 from .services import strr_pay
+from .services.geocode_cache import geocode_cache
+from .services.http_client import http_client
+from .services.permit_snapshot_service import permit_cache
+from .services.str_requirements_service import str_requirements_cache
+from .services.user_service import user_cache
 from .translations import babel
 
 logging.config.fileConfig(fname=os.path.join(os.path.abspath(os.path.dirname(__file__)), "logging.conf"))
@@ -72,7 +78,13 @@ def create_app(environment: Config = Production, **kwargs) -> Flask:
         if app.config.get("POD_NAMESPACE", "production") == "Testing":
             Migrate(app, db)
 
+        check_number_allocator_key(app)
         strr_pay.init_app(app)
+        http_client.init_app(app)
+        geocode_cache.init_app(app)
+        str_requirements_cache.init_app(app)
+        permit_cache.init_app(app)
+        user_cache.init_app(app)
         babel.init_app(app)
         register_endpoints(app)
         setup_jwt_manager(app, jwt)
@@ -108,8 +108,32 @@ class Config:  # pylint: disable=too-few-public-methods
     LTSA_SVC_URL = os.getenv("LTSA_API_URL", "") + os.getenv("LTSA_API_VERSION", "")
     LTSA_SVC_AUTH_KEY = os.getenv("LTSA_API_KEY_STRR", "")
 
+    # Outbound HTTP connection pools, per service and host
+    HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+    HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+
     GEOCODER_SVC_URL = os.getenv("GEOCODER_API_URL", "")
     GEOCODER_SVC_AUTH_KEY = os.getenv("GEOCODER_API_AUTH_KEY", "")
+    GEOCODE_CACHE_MAX_ENTRIES = int(os.getenv("GEOCODE_CACHE_MAX_ENTRIES", "10000"))
+    GEOCODE_CACHE_TTL_SECONDS = int(os.getenv("GEOCODE_CACHE_TTL_SECONDS", str(7 * 24 * 60 * 60)))
+    GEOCODE_CACHE_NEGATIVE_TTL_SECONDS = int(os.getenv("GEOCODE_CACHE_NEGATIVE_TTL_SECONDS", "3600"))
+    GEOCODE_CACHE_REDIS_ENABLED = os.getenv("GEOCODE_CACHE_REDIS_ENABLED", "True").lower() == "true"
+    STR_REQUIREMENTS_CACHE_MAX_ENTRIES = int(os.getenv("STR_REQUIREMENTS_CACHE_MAX_ENTRIES", "10000"))
+    STR_REQUIREMENTS_CACHE_TTL_SECONDS = int(os.getenv("STR_REQUIREMENTS_CACHE_TTL_SECONDS", "3600"))
+    STR_REQUIREMENTS_CACHE_REDIS_ENABLED = os.getenv("STR_REQUIREMENTS_CACHE_REDIS_ENABLED", "True").lower() == "true"
+
+    PERMIT_CACHE_MAX_ENTRIES = int(os.getenv("PERMIT_CACHE_MAX_ENTRIES", "50000"))
+    PERMIT_CACHE_TTL_SECONDS = int(os.getenv("PERMIT_CACHE_TTL_SECONDS", str(6 * 60 * 60)))
+    PERMIT_CACHE_NEGATIVE_TTL_SECONDS = int(os.getenv("PERMIT_CACHE_NEGATIVE_TTL_SECONDS", "60"))
+    PERMIT_CACHE_MEMORY_TTL_SECONDS = int(os.getenv("PERMIT_CACHE_MEMORY_TTL_SECONDS", "30"))
+    PERMIT_CACHE_REDIS_ENABLED = os.getenv("PERMIT_CACHE_REDIS_ENABLED", "True").lower() == "true"
+    USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "1000"))
+    USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+    USER_CACHE_REDIS_ENABLED = os.getenv("USER_CACHE_REDIS_ENABLED", "False").lower() == "true"
+
+    # Shared cache
+    REDIS_HOST = os.getenv("REDIS_HOST", "")
+    REDIS_PORT = os.getenv("REDIS_PORT", "6379")
 
     KEYCLOAK_AUTH_TOKEN_URL = os.getenv("KEYCLOAK_AUTH_TOKEN_URL")
     STRR_SERVICE_ACCOUNT_CLIENT_ID = os.getenv("STRR_SERVICE_ACCOUNT_CLIENT_ID")
@@ -121,6 +145,12 @@ class Config:  # pylint: disable=too-few-public-methods
     GCP_AUTH_KEY = os.getenv("GCP_AUTH_KEY")
     # projects/<project_id-env>/topics/<topic_name>
     GCP_EMAIL_TOPIC = os.getenv("GCP_EMAIL_TOPIC")
+    # Client side batching of gcp_queue_publisher.publish_many
+    GCP_PUBLISH_MAX_MESSAGES = int(os.getenv("GCP_PUBLISH_MAX_MESSAGES", "100"))
+    GCP_PUBLISH_MAX_BYTES = int(os.getenv("GCP_PUBLISH_MAX_BYTES", "1000000"))
+    GCP_PUBLISH_MAX_LATENCY = float(os.getenv("GCP_PUBLISH_MAX_LATENCY", "0.05"))
+    GCP_PUBLISH_TIMEOUT = float(os.getenv("GCP_PUBLISH_TIMEOUT", "60"))
+    GCP_QUEUE_IN_MEMORY = os.getenv("GCP_QUEUE_IN_MEMORY", "False").lower() == "true"
 
     # DATA PORTAL API
     STR_DATA_API_CLIENT_ID = os.getenv("STR_DATA_API_CLIENT_ID", "")
@@ -128,6 +158,19 @@ class Config:  # pylint: disable=too-few-public-methods
     STR_DATA_API_TOKEN_URL = os.getenv("STR_DATA_API_TOKEN_URL", "")
     STR_DATA_API_URL = os.getenv("STR_DATA_API_URL", "")
 
+    # Keys the permutation of the registration and application number sequences; never change it once numbers are issued
+    NUMBER_ALLOCATOR_KEY = os.getenv("NUMBER_ALLOCATOR_KEY", "")
+    NUMBER_ALLOCATOR_BLOCK_SIZE = int(os.getenv("NUMBER_ALLOCATOR_BLOCK_SIZE", "50"))
+
+    # Registration snapshots keep a full keyframe every this many versions and JSON patches in between
+    SNAPSHOT_KEYFRAME_INTERVAL = int(os.getenv("SNAPSHOT_KEYFRAME_INTERVAL", "10"))
+
+    # Certificate rendering: worker processes of the renderer pool, 0 renders in the calling process
+    CERTIFICATE_RENDER_WORKERS = int(os.getenv("CERTIFICATE_RENDER_WORKERS", "0"))
+    CERTIFICATE_RENDER_TIMEOUT = float(os.getenv("CERTIFICATE_RENDER_TIMEOUT", "120"))
+    CERTIFICATE_RENDER_BATCH_SIZE = int(os.getenv("CERTIFICATE_RENDER_BATCH_SIZE", "50"))
+    CERTIFICATE_RENDER_STALE_SECONDS = int(os.getenv("CERTIFICATE_RENDER_STALE_SECONDS", "900"))
+
     BULK_VALIDATION_REQUESTS_BUCKET = os.getenv("BULK_VALIDATION_REQUESTS_BUCKET")
     NOC_EXPIRY_DAYS = os.getenv("NOC_EXPIRY_DAYS", "8")
 
@@ -177,6 +220,7 @@ class Testing(Config):  # pylint: disable=too-few-public-methods
     """Testing class configuration that should override vars for Testing."""
 
     TESTING = True
+    REDIS_HOST = ""
 
     DATABASE_TEST_USERNAME = os.getenv("DATABASE_TEST_USERNAME", "postgres")
     DATABASE_TEST_PASSWORD = os.getenv("DATABASE_TEST_PASSWORD", "postgres")
@@ -199,6 +243,7 @@ class Testing(Config):  # pylint: disable=too-few-public-methods
     STRR_SERVICE_ACCOUNT_SECRET = "fake"
 
     GCP_EMAIL_TOPIC = os.getenv("GCP_EMAIL_TOPIC_TEST", None)
+    GCP_QUEUE_IN_MEMORY = True
 
     # JWT OIDC settings
     # JWT_OIDC_TEST_MODE will set jwt_manager to use
@@ -5,9 +5,10 @@
 from __future__ import annotations
 
 from sql_versioning import Versioned
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 
 from strr_api.models.base_model import BaseModel
+from strr_api.utils.address_match import address_match_keys
 
 from .db import db
 
@@ -28,11 +29,44 @@ class Address(Versioned, BaseModel):
     unit_number = db.Column(db.String, nullable=True)
     street_number = db.Column(db.String, nullable=True)
 
+    # Normalized keys for permit validation and duplicate address detection, derived from the columns above
+    match_street_number = db.Column(db.String, nullable=True)
+    match_postal_code = db.Column(db.String, nullable=True)
+    match_postal_prefix = db.Column(db.String(4), nullable=True)
+    match_unit_number = db.Column(db.String, nullable=True)
+
+    __table_args__ = (db.Index("ix_addresses_match_keys", "match_postal_prefix", "match_street_number"),)
+
     contact = relationship("Contact", back_populates="address", foreign_keys="Contact.address_id")
     rental_properties_address = relationship(
         "RentalProperty", back_populates="address", foreign_keys="RentalProperty.address_id"
     )
 
+    @validates("street_number", "street_address", "postal_code", "unit_number")
+    def _update_match_keys(self, key, value):
+        """Keep the match keys in step with the address columns they are derived from."""
+        columns = {
+            "street_number": self.street_number,
+            "street_address": self.street_address,
+            "postal_code": self.postal_code,
+            "unit_number": self.unit_number,
+        }
+        columns[key] = value
+        for match_key, match_value in address_match_keys(**columns).items():
+            setattr(self, match_key, match_value)
+        return value
+
+    def match_keys(self) -> dict:
+        """Return the stored match keys, computing them for rows written before they were persisted."""
+        if self.match_postal_code is None:
+            return address_match_keys(self.street_number, self.street_address, self.postal_code, self.unit_number)
+        return {
+            "match_street_number": self.match_street_number,
+            "match_postal_code": self.match_postal_code,
+            "match_postal_prefix": self.match_postal_prefix,
+            "match_unit_number": self.match_unit_number,
+        }
+
     def to_oneline_address(self):
         """Convert object to one line address."""
         unit = ""
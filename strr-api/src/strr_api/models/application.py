@@ -38,28 +38,52 @@
 """Registration Application Model."""
 from __future__ import annotations
 
-import copy
 from typing import List, Optional
 
-from nanoid import generate
 from sqlalchemy import Boolean, func
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import Query, backref
+from sqlalchemy.orm import Query, backref, joinedload, selectinload, undefer
 from sqlalchemy_utils.types.ts_vector import TSVectorType
 
 from strr_api.common.enum import BaseEnum, auto
 from strr_api.enums.enum import ApplicationType, StrrRequirement
 from strr_api.models.base_model import BaseModel
 from strr_api.models.dataclass import ApplicationSearch
-from strr_api.models.rental import Registration
+from strr_api.models.number_allocator import APPLICATION_NUMBER_SEQUENCE, NumberAllocator
+from strr_api.models.rental import Registration, RentalProperty
 from strr_api.models.user import User
 
 from .db import db
 
+APPLICATION_NUMBERS = NumberAllocator(
+    APPLICATION_NUMBER_SEQUENCE, digits=14, number_column=lambda: Application.application_number
+)
+
+
+def _serializer_loader_options() -> tuple:
+    """Eager loading for everything ApplicationSerializer.to_dict reads.
+
+    Single rows (users, NOC, registration, rental property, address) are joined into the page query and the
+    registration collections are loaded with one IN query each, so a page costs the same number of queries
+    whatever its size. Certificates are never loaded: the serializer only needs Registration.has_certificate, an EXISTS
+    undeferred into the page query.
+    """
+    return (
+        joinedload(Application.submitter),
+        joinedload(Application.reviewer),
+        joinedload(Application.decider),
+        joinedload(Application.noc),
+        joinedload(Application.registration).options(
+            undefer(Registration.has_certificate),
+            selectinload(Registration.documents),
+            joinedload(Registration.rental_property).joinedload(RentalProperty.address),
+        ),
+    )
 
-def _generate_application_number() -> str:
-    """Generate an application number."""
-    return generate(alphabet="0123456789", size=14)
+
+LOADER_PROFILES = {
+    "serializer": _serializer_loader_options,
+}
 
 
 class Application(BaseModel):
@@ -105,7 +129,9 @@ class Application(BaseModel):
     payment_account = db.Column("payment_account", db.String(30))
 
     # Relationships
-    registration_id = db.Column("registration_id", db.Integer, db.ForeignKey("registrations.id"), nullable=True)
+    registration_id = db.Column(
+        "registration_id", db.Integer, db.ForeignKey("registrations.id"), nullable=True, index=True
+    )
     submitter_id = db.Column("submitter_id", db.Integer, db.ForeignKey("users.id"))
     reviewer_id = db.Column("reviewer_id", db.Integer, db.ForeignKey("users.id"), nullable=True)
     decider_id = db.Column("decider_id", db.Integer, db.ForeignKey("users.id"), nullable=True)
@@ -152,6 +178,11 @@ class Application(BaseModel):
 
     noc = db.relationship("NoticeOfConsideration", back_populates="application", uselist=False)
 
+    @classmethod
+    def loader_options(cls, profile: str) -> tuple:
+        """Return the eager loading options of a named loader profile."""
+        return LOADER_PROFILES[profile]()
+
     @classmethod
     def find_by_id(cls, application_id: int) -> Application | None:
         """Return the application by id."""
@@ -163,14 +194,9 @@ class Application(BaseModel):
         return cls.query.filter_by(invoice_id=invoice_id).one_or_none()
 
     @classmethod
-    def generate_unique_application_number(cls):  # pylint: disable=inconsistent-return-statements
-        """Generate a unique application number."""
-        max_attempts = 10
-        for _ in range(max_attempts):
-            new_number = _generate_application_number()
-            if not cls.query.filter_by(application_number=new_number).first():
-                return new_number
-        raise ValueError("Failed to generate a unique application number")
+    def generate_unique_application_number(cls) -> str:
+        """Allocate a unique application number."""
+        return APPLICATION_NUMBERS.allocate()
 
     @classmethod
     def find_by_application_number(cls, application_number: str) -> Application | None:
@@ -238,6 +264,7 @@ class Application(BaseModel):
         else:
             query = query.order_by(sort_column.desc())
 
+        query = query.options(*cls.loader_options("serializer"))
         paginated_result = query.paginate(per_page=filter_criteria.limit, page=filter_criteria.page)
         return paginated_result
 
@@ -251,6 +278,24 @@ class Application(BaseModel):
         """Return all applications associated with a given registration_id."""
         return cls.query.filter_by(registration_id=registration_id).all()
 
+    @classmethod
+    def get_all_by_registration_ids(cls, registration_ids: list[int]) -> dict[int, list[Application]]:
+        """Return the applications of several registrations with one query, keyed by registration_id."""
+        applications_by_registration: dict[int, list[Application]] = {
+            registration_id: [] for registration_id in registration_ids
+        }
+        if not registration_ids:
+            return applications_by_registration
+        applications = (
+            cls.query.filter(cls.registration_id.in_(registration_ids))
+            .options(joinedload(cls.reviewer), joinedload(cls.decider))
+            .order_by(cls.id)
+            .all()
+        )
+        for application in applications:
+            applications_by_registration[application.registration_id].append(application)
+        return applications_by_registration
+
     @classmethod
     def _filter_by_application_registration_number(cls, search_term: str, query: Query) -> Query:
         """Filter query by application or registration number."""
@@ -479,6 +524,7 @@ class Application(BaseModel):
             query = query.order_by(sort_column.asc())
         else:
             query = query.order_by(sort_column.desc())
+        query = query.options(*cls.loader_options("serializer"))
         paginated_result = query.paginate(per_page=filter_criteria.limit, page=filter_criteria.page)
         return paginated_result
 
@@ -541,82 +587,81 @@ class ApplicationSerializer:
 
     @staticmethod
     def to_dict(application: Application) -> dict:
-        """Return the application object as a dict."""
-        application_dict = copy.deepcopy(application.application_json)
-        if not application_dict.get("header", None):
-            application_dict["header"] = {}
-        application_dict["header"]["applicationNumber"] = application.application_number
-        application_dict["header"]["name"] = application.type
-        application_dict["header"]["paymentToken"] = application.invoice_id
-        application_dict["header"]["paymentStatus"] = application.payment_status_code
-        application_dict["header"]["paymentAccount"] = application.payment_account
-        application_dict["header"]["status"] = application.status
-        application_dict["header"]["isSetAside"] = application.is_set_aside
-        application_dict["header"]["hostStatus"] = (
+        """Return the application object as a dict.
+
+        The stored application_json is never copied as a whole: the result is a shallow copy with a new header and,
+        when present, a copy of the registration documents, which are the only parts written to here. Callers must
+        not mutate other nested values of the result in place.
+        """
+        application_json = application.application_json
+        application_dict = dict(application_json)
+        header = dict(application_json.get("header") or {})
+        application_dict["header"] = header
+        header["applicationNumber"] = application.application_number
+        header["name"] = application.type
+        header["paymentToken"] = application.invoice_id
+        header["paymentStatus"] = application.payment_status_code
+        header["paymentAccount"] = application.payment_account
+        header["status"] = application.status
+        header["isSetAside"] = application.is_set_aside
+        header["hostStatus"] = (
             "Pending Review"
             if application.is_set_aside
             else ApplicationSerializer.HOST_STATUSES.get(application.status, "")
         )
-        application_dict["header"]["examinerStatus"] = ApplicationSerializer.EXAMINER_STATUSES.get(
-            application.status, ""
-        )
-        application_dict["header"]["hostActions"] = ApplicationSerializer.HOST_ACTIONS.get(application.status, [])
+        header["examinerStatus"] = ApplicationSerializer.EXAMINER_STATUSES.get(application.status, "")
+        header["hostActions"] = ApplicationSerializer.HOST_ACTIONS.get(application.status, [])
 
         if application.is_set_aside:
-            application_dict["header"]["examinerActions"] = ["APPROVE", "REJECT"]
+            header["examinerActions"] = ["APPROVE", "REJECT"]
         else:
-            application_dict["header"]["examinerActions"] = ApplicationSerializer.EXAMINER_ACTIONS.get(
-                application.status, []
-            )
+            header["examinerActions"] = ApplicationSerializer.EXAMINER_ACTIONS.get(application.status, [])
         if application.status == Application.Status.FULL_REVIEW_APPROVED:
-            certificates = application.registration.certificates
-            if certificates:
-                application_dict["header"]["examinerActions"] = []
-        application_dict["header"]["applicationDateTime"] = application.application_date.isoformat()
-        application_dict["header"]["decisionDate"] = (
-            application.decision_date.isoformat() if application.decision_date else None
-        )
-        application_dict["header"]["submitter"] = {}
+            if application.registration.has_certificate:
+                header["examinerActions"] = []
+        header["applicationDateTime"] = application.application_date.isoformat()
+        header["decisionDate"] = application.decision_date.isoformat() if application.decision_date else None
+        header["submitter"] = {}
         if application.submitter_id:
-            application_dict["header"]["submitter"]["username"] = application.submitter.username
+            header["submitter"]["username"] = application.submitter.username
 
             submitter_display_name = ""
             if application.submitter.firstname:
                 submitter_display_name = f"{submitter_display_name}{application.submitter.firstname}"
             if application.submitter.lastname:
                 submitter_display_name = f"{submitter_display_name} {application.submitter.lastname}"
-            application_dict["header"]["submitter"]["displayName"] = submitter_display_name
+            header["submitter"]["displayName"] = submitter_display_name
 
-        application_dict["header"]["assignee"] = {}
+        header["assignee"] = {}
         if application.reviewer_id:
-            application_dict["header"]["assignee"]["username"] = application.reviewer.username
+            header["assignee"]["username"] = application.reviewer.username
 
             reviewer_display_name = ""
             if application.reviewer.firstname:
                 reviewer_display_name = f"{reviewer_display_name}{application.reviewer.firstname}"
             if application.reviewer.lastname:
                 reviewer_display_name = f"{reviewer_display_name} {application.reviewer.lastname}"
-            application_dict["header"]["assignee"]["displayName"] = reviewer_display_name
+            header["assignee"]["displayName"] = reviewer_display_name
 
-        application_dict["header"]["decider"] = {}
+        header["decider"] = {}
         if application.decider_id:
-            application_dict["header"]["decider"]["username"] = application.decider.username
+            header["decider"]["username"] = application.decider.username
 
             decider_display_name = ""
             if application.decider.firstname:
                 decider_display_name = f"{decider_display_name}{application.decider.firstname}"
             if application.decider.lastname:
                 decider_display_name = f"{decider_display_name} {application.decider.lastname}"
-            application_dict["header"]["decider"]["displayName"] = decider_display_name
+            header["decider"]["displayName"] = decider_display_name
 
-        application_dict["header"]["isCertificateIssued"] = False
+        header["isCertificateIssued"] = False
         if application.registration_id:
-            application_dict["header"]["registrationId"] = application.registration_id
-            application_dict["header"]["registrationStartDate"] = application.registration.start_date.isoformat()
-            application_dict["header"]["registrationEndDate"] = application.registration.expiry_date.isoformat()
-            application_dict["header"]["registrationStatus"] = application.registration.status.value
-            application_dict["header"]["registrationNumber"] = application.registration.registration_number
-            application_dict["header"]["isCertificateIssued"] = bool(application.registration.certificates)
+            header["registrationId"] = application.registration_id
+            header["registrationStartDate"] = application.registration.start_date.isoformat()
+            header["registrationEndDate"] = application.registration.expiry_date.isoformat()
+            header["registrationStatus"] = application.registration.status.value
+            header["registrationNumber"] = application.registration.registration_number
+            header["isCertificateIssued"] = bool(application.registration.has_certificate)
             registration_address = None
             if application.registration.rental_property and application.registration.rental_property.address:
                 address = application.registration.rental_property.address
@@ -632,15 +677,18 @@ class ApplicationSerializer:
                     "locationDescription": address.location_description,
                 }
             if registration_address:
-                application_dict["header"]["registrationAddress"] = registration_address
+                header["registrationAddress"] = registration_address
             if application.registration.noc_status:
-                application_dict["header"]["registrationNocStatus"] = application.registration.noc_status.value
+                header["registrationNocStatus"] = application.registration.noc_status.value
         if application.noc:
-            application_dict["header"]["nocStartDate"] = application.noc.start_date.strftime("%Y-%m-%d")
-            application_dict["header"]["nocEndDate"] = application.noc.end_date.strftime("%Y-%m-%d")
+            header["nocStartDate"] = application.noc.start_date.strftime("%Y-%m-%d")
+            header["nocEndDate"] = application.noc.end_date.strftime("%Y-%m-%d")
 
         # Set addedOn for registration documents (application-stage docs live only in application_json, not in DB)
-        if registration_docs := application_dict.get("registration", {}).get("documents"):
+        registration_json = application_dict.get("registration", {})
+        if registration_docs := registration_json.get("documents"):
+            registration_docs = [dict(doc_item) for doc_item in registration_docs]
+            application_dict["registration"] = {**registration_json, "documents": registration_docs}
             # First: use stored addedOn or uploadDate so application-stage docs show a date when we have one
             for doc_item in registration_docs:
                 doc_item["addedOn"] = doc_item.get("addedOn") or doc_item.get("uploadDate")
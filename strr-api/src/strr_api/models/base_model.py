@@ -34,13 +34,13 @@
 """Base Model."""
 import datetime
 
+from flask import g, has_app_context
 from sqlalchemy import Column, DateTime, ForeignKey, MetaData
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import relationship
 
-from strr_api.models.user import User
-
 from .db import db
+from .unit_of_work import in_unit_of_work
 
 convention = {
     "ix": "ix_%(column_0_label)s",
@@ -60,8 +60,11 @@ class SimpleBaseModel(db.Model):
 
     @staticmethod
     def commit():
-        """Commit the session."""
-        db.session.commit()
+        """Commit the session; inside a unit of work only flush, the unit of work commits."""
+        if in_unit_of_work():
+            db.session.flush()
+        else:
+            db.session.commit()
 
     def flush(self):
         """Save and flush."""
@@ -74,18 +77,20 @@ class SimpleBaseModel(db.Model):
         return self.flush()
 
     def save(self):
-        """Save and commit."""
+        """Save and commit; inside a unit of work only flush, the unit of work commits."""
         db.session.add(self)
         db.session.flush()
-        db.session.commit()
+        if not in_unit_of_work():
+            db.session.commit()
 
         return self
 
     def delete(self):
-        """Delete and commit."""
+        """Delete and commit; inside a unit of work only flush, the unit of work commits."""
         db.session.delete(self)
         db.session.flush()
-        db.session.commit()
+        if not in_unit_of_work():
+            db.session.commit()
 
     @staticmethod
     def rollback():
@@ -96,7 +101,7 @@ class SimpleBaseModel(db.Model):
         """Reset."""
         if self:
             db.session.delete(self)
-            db.session.commit()
+            self.commit()
 
 
 class BaseModel(SimpleBaseModel):
@@ -129,5 +134,10 @@ class BaseModel(SimpleBaseModel):
 
     @staticmethod
     def _get_current_user():
-        user = User.find_user_in_context()
-        return user.id if user else None
+        if not has_app_context() or not g.get("jwt_oidc_token_info"):
+            # jobs and queue listeners run without a JWT, there is no user to look up
+            return None
+        # pylint: disable=import-outside-toplevel
+        from strr_api.services.user_service import UserService
+
+        return UserService.find_user_id_in_context()
@@ -1,26 +1,55 @@
 """
 ORM Mapping for Certificate Records
+
+The PDF is deferred: loading certificates, or checking Registration.has_certificate, never reads the blob. The
+download path reads it in chunks with Certificate.stream().
+
+A certificate is requested once per registration version and rendered asynchronously: the row is created PENDING and
+the PDF is filled in when the renderer completes it, see strr_api.services.certificate_service.
 """
 from __future__ import annotations
 
-from sqlalchemy.orm import backref, relationship
+from typing import Iterator
+
+from sqlalchemy import exists, func, select
+from sqlalchemy.orm import backref, column_property, deferred, relationship
 from sqlalchemy.sql import text
 
+from strr_api.common.enum import BaseEnum, auto
 from strr_api.models.base_model import BaseModel
+from strr_api.models.rental import Registration
 
 from .db import db
 
+STREAM_CHUNK_SIZE = 256 * 1024
+
 
 class Certificate(BaseModel):
     """Certificate Model."""
 
+    class Status(BaseEnum):
+        """Enum of the certificate render statuses."""
+
+        PENDING = auto()  # pylint: disable=invalid-name
+        RENDERING = auto()  # pylint: disable=invalid-name
+        COMPLETED = auto()  # pylint: disable=invalid-name
+        FAILED = auto()  # pylint: disable=invalid-name
+
     __tablename__ = "certificates"
+    __table_args__ = (db.UniqueConstraint("registration_id", "registration_version"),)
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    registration_id = db.Column(db.Integer, db.ForeignKey("registrations.id"), nullable=False)
+    registration_id = db.Column(db.Integer, db.ForeignKey("registrations.id"), nullable=False, index=True)
     issued_date = db.Column(db.DateTime, nullable=False, server_default=text("(NOW())"))
     issuer_id = db.Column(db.Integer, db.ForeignKey("users.id"))
-    certificate = db.Column(db.LargeBinary, nullable=False)
+    certificate = deferred(db.Column(db.LargeBinary, nullable=True))
+    # Certificates issued before rendering went asynchronous have no version and are COMPLETED
+    registration_version = db.Column(db.Integer, nullable=True)
+    status = db.Column(
+        db.String(20), nullable=False, index=True, default=Status.COMPLETED, server_default=Status.COMPLETED.value
+    )
+    error = db.Column(db.String(1000), nullable=True)
+    updated_date = db.Column(db.DateTime, nullable=True)
 
     registration = relationship("Registration", back_populates="certificates")
     issuer = db.relationship(
@@ -28,3 +57,24 @@ class Certificate(BaseModel):
         backref=backref("issuer", uselist=False),
         foreign_keys=[issuer_id],
     )
+
+    def stream(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield the PDF in chunks of chunk_size bytes, reading one chunk per query."""
+        size = db.session.execute(
+            select(func.length(Certificate.certificate)).where(Certificate.id == self.id)
+        ).scalar_one()
+        for offset in range(0, size, chunk_size):
+            yield db.session.execute(
+                select(func.substring(Certificate.certificate, offset + 1, chunk_size)).where(Certificate.id == self.id)
+            ).scalar_one()
+
+
+# Registration is mapped first, so the EXISTS is attached here. Deferred: undefer it to check a page of registrations
+# in the page query, or it is loaded on first access.
+Registration.has_certificate = column_property(
+    exists().where(
+        Certificate.registration_id == Registration.id,
+        Certificate.status == Certificate.Status.COMPLETED,
+    ),
+    deferred=True,
+)
@@ -78,7 +78,7 @@ class Events(SimpleBaseModel):
         query = cls.query.filter_by(registration_id=registration_id)
         if applicant_visible_events_only:
             query = query.filter_by(visible_to_applicant=True)  # noqa
-        return query.order_by(Events.created_date).all()
+        return query.order_by(Events.created_date, Events.id).all()
 
     @classmethod
     def fetch_application_events(cls, application_id: int, applicant_visible_events_only: bool = True):
@@ -86,4 +86,4 @@ class Events(SimpleBaseModel):
         query = cls.query.filter_by(application_id=application_id)
         if applicant_visible_events_only:
             query = query.filter_by(visible_to_applicant=True)  # noqa
-        return query.order_by(Events.created_date).all()
+        return query.order_by(Events.created_date, Events.id).all()
@@ -48,6 +48,7 @@ from strr_api.enums.enum import ChannelType, InteractionStatus
 
 from .base_model import SimpleBaseModel
 from .db import db
+from .unit_of_work import in_unit_of_work
 
 if TYPE_CHECKING:
     from .application import Application
@@ -103,9 +104,12 @@ class CustomerInteraction(Versioned, SimpleBaseModel):
     )
 
     def save(self):
-        """Store the Interaction."""
+        """Store the Interaction; inside a unit of work only flush, the unit of work commits."""
         db.session.add(self)
-        db.session.commit()
+        if in_unit_of_work():
+            db.session.flush()
+        else:
+            db.session.commit()
 
     @classmethod
     def find_by_id_idempotency_key(
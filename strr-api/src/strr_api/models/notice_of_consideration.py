@@ -16,10 +16,10 @@ class NoticeOfConsideration(SimpleBaseModel):
     __tablename__ = "notice_of_consideration"
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    application_id = db.Column(db.Integer, db.ForeignKey("application.id"), nullable=False)
+    application_id = db.Column(db.Integer, db.ForeignKey("application.id"), nullable=False, index=True)
     content = db.Column(db.Text, nullable=False)
     start_date = db.Column(db.DateTime(timezone=True), nullable=False)
-    end_date = db.Column(db.DateTime(timezone=True), nullable=False)
+    end_date = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
     creation_date = db.Column(db.DateTime(timezone=True), nullable=False, server_default=text("(NOW())"))
 
     application = db.relationship("Application", foreign_keys=[application_id], back_populates="noc")
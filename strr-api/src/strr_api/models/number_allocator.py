@@ -0,0 +1,143 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Collision-free, unguessable registration and application numbers.
+
+Numbers come from a database sequence, so no two pods ever get the same one, and each sequence value is mapped to a
+number of the same length by a keyed permutation (a Feistel network with cycle walking), so consecutive values do not
+look consecutive. A pod reserves a block of sequence values in one query and hands them out from memory, dropping the
+few that collide with numbers issued at random before the sequence existed; allocating a number then costs no round
+trip for most calls.
+
+NUMBER_ALLOCATOR_KEY keys the permutation. It must never change once numbers have been issued with it, and every
+process that shares the sequences must use the same key: check_number_allocator_key() stops an app from starting without
+one.
+"""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import threading
+from collections import deque
+from typing import Callable
+
+from flask import Flask, current_app
+from sqlalchemy import func, select
+
+from .db import db
+
+BLOCK_SIZE = 50
+
+REGISTRATION_NUMBER_SEQUENCE = db.Sequence("registration_number_seq", metadata=db.metadata)
+APPLICATION_NUMBER_SEQUENCE = db.Sequence("application_number_seq", metadata=db.metadata)
+
+
+def check_number_allocator_key(app: Flask):
+    """Raise when NUMBER_ALLOCATOR_KEY is not set, unless the app is testing.
+
+    With an empty key anyone can compute the permutation, and a process with a different key maps sequence values to
+    numbers the reserve time check cannot tell apart from fresh ones.
+    """
+    if not app.config.get("NUMBER_ALLOCATOR_KEY") and not app.config.get("TESTING"):
+        raise ValueError("NUMBER_ALLOCATOR_KEY is not set")
+
+
+class FeistelPermutation:
+    """A keyed permutation of the integers below 10 ** digits."""
+
+    ROUNDS = 4
+
+    def __init__(self, key: bytes, digits: int):
+        """Permute the numbers of the given number of digits with the key."""
+        self.key = key
+        self.limit = 10**digits
+        bits = (self.limit - 1).bit_length()
+        self.half_bits = (bits + 1) // 2
+        self.mask = (1 << self.half_bits) - 1
+
+    def _round(self, round_number: int, value: int) -> int:
+        digest = hmac.new(self.key, f"{round_number}:{value}".encode(), hashlib.sha256).digest()
+        return int.from_bytes(digest[:8], "big") & self.mask
+
+    def _encrypt(self, value: int) -> int:
+        left, right = value >> self.half_bits, value & self.mask
+        for round_number in range(self.ROUNDS):
+            left, right = right, left ^ self._round(round_number, right)
+        return (left << self.half_bits) | right
+
+    def permute(self, value: int) -> int:
+        """Return the number value maps to; distinct values always map to distinct numbers."""
+        if not 0 <= value < self.limit:
+            raise ValueError(f"Number space of {len(str(self.limit)) - 1} digits exhausted")
+        # The Feistel network permutes a power of two range; walking the cycle until the result falls below the limit
+        # keeps it a permutation of [0, limit).
+        value = self._encrypt(value)
+        while value >= self.limit:
+            value = self._encrypt(value)
+        return value
+
+
+class NumberAllocator:
+    """Hands out the permuted values of a sequence, reserved a block at a time."""
+
+    def __init__(self, sequence: db.Sequence, digits: int, number_column: Callable, prefixes: tuple[str, ...] = ("",)):
+        """Allocate numbers of digits digits; number_column returns the column issued numbers are stored in."""
+        self.sequence = sequence
+        self.digits = digits
+        self.number_column = number_column
+        self.prefixes = prefixes
+        self._numbers: deque[str] = deque()
+        self._lock = threading.Lock()
+
+    def allocate(self) -> str:
+        """Return an unused number, without the prefix."""
+        with self._lock:
+            while not self._numbers:
+                self._numbers.extend(self._reserve_block())
+            return self._numbers.popleft()
+
+    def _reserve_block(self) -> list[str]:
+        """Reserve the next block of sequence values and return their numbers that were never issued."""
+        size = current_app.config.get("NUMBER_ALLOCATOR_BLOCK_SIZE") or BLOCK_SIZE
+        values = db.session.execute(
+            select(self.sequence.next_value()).select_from(func.generate_series(1, size))
+        ).scalars()
+        permutation = FeistelPermutation(current_app.config.get("NUMBER_ALLOCATOR_KEY", "").encode(), self.digits)
+        numbers = [f"{permutation.permute(value):0{self.digits}d}" for value in values]
+
+        column = self.number_column()
+        issued = db.session.execute(
+            select(column).where(column.in_([f"{prefix}{number}" for prefix in self.prefixes for number in numbers]))
+        ).scalars()
+        taken = {number[-self.digits :] for number in issued}
+        return [number for number in numbers if number not in taken]
@@ -16,10 +16,10 @@ class RegistrationNoticeOfConsideration(SimpleBaseModel):
     __tablename__ = "registration_notice_of_consideration"
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    registration_id = db.Column(db.Integer, db.ForeignKey("registrations.id"), nullable=False)
+    registration_id = db.Column(db.Integer, db.ForeignKey("registrations.id"), nullable=False, index=True)
     content = db.Column(db.Text, nullable=False)
     start_date = db.Column(db.DateTime(timezone=True), nullable=False)
-    end_date = db.Column(db.DateTime(timezone=True), nullable=False)
+    end_date = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
     creation_date = db.Column(db.DateTime(timezone=True), nullable=False, server_default=text("(NOW())"))
 
     registration = db.relationship("Registration", foreign_keys=[registration_id], back_populates="nocs")
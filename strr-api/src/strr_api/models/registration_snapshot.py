@@ -1,9 +1,19 @@
 """
 Registration Snapshot model
+
+Snapshots are stored as keyframes, which keep the full serialized registration in snapshot_data, and deltas, which
+keep the JSON patch from the previous version in snapshot_patch. Any version is rebuilt from the latest keyframe at or
+below it plus the deltas after that keyframe (see find_chain and SnapshotService.get_snapshot_data).
+
+Both payloads are deferred so listing the snapshots of a registration only reads the id, version and date.
 """
 from __future__ import annotations
 
+from typing import Optional
+
+from sqlalchemy import Boolean, func, select
 from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred, undefer
 
 from strr_api.models.base_model import SimpleBaseModel
 
@@ -14,7 +24,9 @@ class RegistrationSnapshot(SimpleBaseModel):
     """Registration snapshot model."""
 
     id = db.Column(db.Integer, primary_key=True)
-    snapshot_data = db.Column("snapshot_data", JSONB, nullable=False)
+    snapshot_data = deferred(db.Column("snapshot_data", JSONB, nullable=True))
+    snapshot_patch = deferred(db.Column("snapshot_patch", JSONB, nullable=True))
+    is_keyframe = db.Column(Boolean, nullable=False, default=True, server_default="true")
     version = db.Column(db.Integer, nullable=False, index=True)
     snapshot_datetime = db.Column("snapshot_datetime", db.DateTime(timezone=True))
     registration_id = db.Column(db.Integer, db.ForeignKey("registrations.id"), nullable=False, index=True)
@@ -25,3 +37,18 @@ class RegistrationSnapshot(SimpleBaseModel):
     def find_latest_snapshot(cls, registration_id):
         """Returns the latest snapshot of a registration if present."""
         return cls.query.filter_by(registration_id=registration_id).order_by(RegistrationSnapshot.id.desc()).first()
+
+    @classmethod
+    def find_chain(cls, registration_id: int, version: Optional[int] = None) -> list[RegistrationSnapshot]:
+        """Returns the snapshots from the latest keyframe at or below version up to version, oldest first.
+
+        Without a version the chain ends at the latest snapshot. The payloads are loaded with the rows in one query.
+        """
+        keyframe_version = select(func.max(cls.version)).where(cls.registration_id == registration_id, cls.is_keyframe)
+        query = cls.query.options(undefer(cls.snapshot_data), undefer(cls.snapshot_patch)).filter(
+            cls.registration_id == registration_id
+        )
+        if version is not None:
+            keyframe_version = keyframe_version.where(cls.version <= version)
+            query = query.filter(cls.version <= version)
+        return query.filter(cls.version >= keyframe_version.scalar_subquery()).order_by(cls.version).all()
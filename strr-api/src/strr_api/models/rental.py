@@ -9,7 +9,7 @@ from typing import TYPE_CHECKING
 from sql_versioning import Versioned
 from sqlalchemy import Boolean, Enum
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import joinedload, relationship, selectinload
 from sqlalchemy_utils.types.ts_vector import TSVectorType
 
 from strr_api.common.enum import BaseEnum, auto
@@ -21,6 +21,7 @@ from strr_api.enums.enum import (
     StrrRequirement,
 )
 from strr_api.models.base_model import BaseModel
+from strr_api.models.number_allocator import REGISTRATION_NUMBER_SEQUENCE, NumberAllocator
 
 from .db import db
 
@@ -29,6 +30,91 @@ if TYPE_CHECKING:
     from strr_api.models.dataclass import RegistrationSearch
 
 
+def _serializer_common_loader_options() -> tuple:
+    """Eager loading for the parts of RegistrationSerializer.serialize shared by every registration type."""
+    return (
+        joinedload(Registration.reviewer),
+        joinedload(Registration.decider),
+        joinedload(Registration.conditionsOfApproval),
+        selectinload(Registration.nocs),
+        selectinload(Registration.documents),
+        selectinload(Registration.snapshots),
+    )
+
+
+def _serializer_host_loader_options() -> tuple:
+    """Eager loading for a page of host registrations."""
+    # pylint: disable=import-outside-toplevel
+    from strr_api.models.user import Contact
+
+    rental_property = joinedload(Registration.rental_property)
+    return (
+        *_serializer_common_loader_options(),
+        rental_property.joinedload(RentalProperty.address),
+        rental_property.selectinload(RentalProperty.contacts)
+        .joinedload(PropertyContact.contact)
+        .joinedload(Contact.address),
+        rental_property.selectinload(RentalProperty.property_listings),
+        rental_property.joinedload(RentalProperty.property_manager).options(
+            joinedload(PropertyManager.business_mailing_address),
+            joinedload(PropertyManager.primary_contact).joinedload(Contact.address),
+        ),
+    )
+
+
+def _serializer_platform_loader_options() -> tuple:
+    """Eager loading for a page of platform registrations."""
+    # pylint: disable=import-outside-toplevel
+    from strr_api.models.platforms import Platform, PlatformRegistration, PlatformRepresentative
+
+    platform = joinedload(Registration.platform_registration).joinedload(PlatformRegistration.platform)
+    return (
+        *_serializer_common_loader_options(),
+        platform.joinedload(Platform.mailingAddress),
+        platform.joinedload(Platform.registered_office_attorney_mailing_address),
+        platform.selectinload(Platform.representatives).joinedload(PlatformRepresentative.contact),
+        platform.selectinload(Platform.brands),
+    )
+
+
+def _serializer_strata_hotel_loader_options() -> tuple:
+    """Eager loading for a page of strata hotel registrations."""
+    # pylint: disable=import-outside-toplevel
+    from strr_api.models.strata_hotels import (
+        StrataHotel,
+        StrataHotelBuilding,
+        StrataHotelRegistration,
+        StrataHotelRepresentative,
+    )
+
+    strata_hotel = joinedload(Registration.strata_hotel_registration).joinedload(StrataHotelRegistration.strata_hotel)
+    return (
+        *_serializer_common_loader_options(),
+        strata_hotel.joinedload(StrataHotel.mailingAddress),
+        strata_hotel.joinedload(StrataHotel.location),
+        strata_hotel.joinedload(StrataHotel.registered_office_attorney_mailing_address),
+        strata_hotel.selectinload(StrataHotel.representatives).joinedload(StrataHotelRepresentative.contact),
+        strata_hotel.selectinload(StrataHotel.buildings).joinedload(StrataHotelBuilding.address),
+    )
+
+
+# Keyed by registration type, see Registration.load_for_serializer.
+LOADER_PROFILES = {
+    "HOST": _serializer_host_loader_options,
+    "PLATFORM": _serializer_platform_loader_options,
+    "STRATA_HOTEL": _serializer_strata_hotel_loader_options,
+}
+
+
+REGISTRATION_NUMBER_PREFIXES = ("H", "PM", "PL", "ST")
+REGISTRATION_NUMBERS = NumberAllocator(
+    REGISTRATION_NUMBER_SEQUENCE,
+    digits=9,
+    number_column=lambda: Registration.registration_number,
+    prefixes=REGISTRATION_NUMBER_PREFIXES,
+)
+
+
 class Registration(Versioned, BaseModel):
     """Registration model"""
 
@@ -49,7 +135,7 @@ class Registration(Versioned, BaseModel):
     sbc_account_id = db.Column(db.Integer, nullable=False, index=True)
     status = db.Column(Enum(RegistrationStatus), nullable=False, index=True)
     start_date = db.Column(db.DateTime, nullable=False)
-    expiry_date = db.Column(db.DateTime, nullable=False)
+    expiry_date = db.Column(db.DateTime, nullable=False, index=True)
     updated_date = db.Column(db.DateTime, default=datetime.now, nullable=False)
     cancelled_date = db.Column(db.DateTime, nullable=True)
     is_set_aside = db.Column(Boolean, default=False)
@@ -80,6 +166,7 @@ class Registration(Versioned, BaseModel):
         foreign_keys=[decider_id],
     )
 
+    # has_certificate, an EXISTS over the certificates, is mapped in certificate.py
     certificates = relationship("Certificate", back_populates="registration")
     rental_property = relationship(
         "RentalProperty",
@@ -102,7 +189,9 @@ class Registration(Versioned, BaseModel):
     documents = relationship("Document", back_populates="registration")
     nocs = relationship("RegistrationNoticeOfConsideration", back_populates="registration")
     conditionsOfApproval = relationship("ConditionsOfApproval", back_populates="registration", uselist=False)
-    snapshots = relationship("RegistrationSnapshot", back_populates="registration")
+    snapshots = relationship(
+        "RegistrationSnapshot", back_populates="registration", order_by="desc(RegistrationSnapshot.version)"
+    )
 
     __table_args__ = (
         db.Index("idx_registration_tsv", registration_tsv, postgresql_using="gin"),
@@ -114,6 +203,32 @@ class Registration(Versioned, BaseModel):
         ),
     )
 
+    @classmethod
+    def allocate_registration_number(cls, registration_code: str) -> str:
+        """Allocate a unique registration number with the given prefix."""
+        return f"{registration_code}{REGISTRATION_NUMBERS.allocate()}"
+
+    @classmethod
+    def loader_options(cls, profile: str) -> tuple:
+        """Return the eager loading options of a named loader profile."""
+        return LOADER_PROFILES[profile]()
+
+    @classmethod
+    def load_for_serializer(cls, registrations: list[Registration]) -> None:
+        """Load everything RegistrationSerializer reads for a page of registrations.
+
+        The page is grouped by registration type and each group is reloaded once with the loader profile of its
+        type, which fills the relationships of the instances already in the session. A page therefore costs the
+        same number of queries whatever its size.
+        """
+        ids_by_type: dict[str, list[int]] = {}
+        for registration in registrations:
+            ids_by_type.setdefault(registration.registration_type, []).append(registration.id)
+        for registration_type, registration_ids in ids_by_type.items():
+            if registration_type not in LOADER_PROFILES:
+                continue
+            cls.query.filter(cls.id.in_(registration_ids)).options(*cls.loader_options(registration_type)).all()
+
     @classmethod
     def search_registrations(cls, filter_criteria: RegistrationSearch):
         """Returns the registrations matching the search criteria."""
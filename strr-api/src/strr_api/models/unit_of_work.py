@@ -0,0 +1,111 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Unit of work: run a whole service operation in one database transaction.
+
+Inside unit_of_work() the model save(), delete() and commit() helpers only flush, and the single commit happens when
+the outermost block exits. Side effects that must not happen for rolled back work, such as queue publishes and shared
+cache writes, are registered with after_commit() and run once the commit succeeded. A nested block runs in a
+savepoint: when it fails only its own changes and deferred callbacks are dropped.
+
+Outside a unit of work nothing changes: save() commits and after_commit() runs the callback straight away.
+"""
+from __future__ import annotations
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+from .db import db
+
+logger = logging.getLogger("api")
+
+
+class UnitOfWork:
+    """State of an open unit of work."""
+
+    def __init__(self, parent: Optional[UnitOfWork] = None):
+        """Create an empty unit of work, nested in parent when given."""
+        self.parent = parent
+        self.callbacks: list[Callable[[], None]] = []
+
+    def after_commit(self, callback: Callable[[], None]):
+        """Run the callback once the outermost unit of work has committed."""
+        self.callbacks.append(callback)
+
+
+_current: ContextVar[Optional[UnitOfWork]] = ContextVar("strr_unit_of_work", default=None)
+
+
+def in_unit_of_work() -> bool:
+    """Return True when called inside a unit of work."""
+    return _current.get() is not None
+
+
+def after_commit(callback: Callable[[], None]):
+    """Defer the callback until the surrounding unit of work commits, or run it now when there is none."""
+    if (uow := _current.get()) is not None:
+        uow.after_commit(callback)
+    else:
+        callback()
+
+
+@contextmanager
+def unit_of_work() -> Iterator[UnitOfWork]:
+    """Run the block in one transaction, committed on exit and rolled back when the block raises."""
+    parent = _current.get()
+    uow = UnitOfWork(parent)
+    token = _current.set(uow)
+    try:
+        if parent is None:
+            yield uow
+            db.session.commit()
+        else:
+            with db.session.begin_nested():
+                yield uow
+    except BaseException:
+        if parent is None:
+            db.session.rollback()
+        raise
+    finally:
+        _current.reset(token)
+
+    if parent is not None:
+        parent.callbacks.extend(uow.callbacks)
+        return
+    for callback in uow.callbacks:
+        try:
+            callback()
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            logger.error("Deferred after commit callback failed: %s", err, exc_info=True)
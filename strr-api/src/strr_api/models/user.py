@@ -47,6 +47,7 @@ from sqlalchemy.orm import relationship
 from strr_api.utils.user_context import UserContext, user_context
 
 from .db import db
+from .unit_of_work import in_unit_of_work
 
 
 class Contact(Versioned, db.Model):
@@ -183,11 +184,16 @@ class User(db.Model):
     def save(self):
         """Store the User into the local cache."""
         db.session.add(self)
-        db.session.commit()
+        db.session.flush()
+        if not in_unit_of_work():
+            db.session.commit()
 
     def update(self):
         """Store the User into the local cache."""
-        db.session.commit()
+        if in_unit_of_work():
+            db.session.flush()
+        else:
+            db.session.commit()
 
     def delete(self):
         """Cannot delete User records."""
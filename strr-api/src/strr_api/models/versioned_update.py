@@ -0,0 +1,77 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Bulk updates of versioned models that keep their history rows.
+
+The versioned session writes the history of a Versioned model when the ORM flushes a changed object: the current row
+is copied to the <table>_history table with its version and the object is saved with the next version. A bulk UPDATE
+bypasses the session, so versioned_update() does the same in SQL for a whole set of rows.
+"""
+from __future__ import annotations
+
+from typing import Sequence
+
+from sqlalchemy import MetaData, Row, Table, func, insert, select, update
+
+from .db import db
+
+HISTORY_CHANGED_COLUMN = "changed"
+
+
+def history_table(model) -> Table:
+    """Return the versioning history table of the model."""
+    name = f"{model.__tablename__}_history"
+    if (history := db.metadata.tables.get(name)) is not None:
+        return history
+    return Table(name, MetaData(), autoload_with=db.session.connection())
+
+
+def versioned_update(model, ids: Sequence[int], values: dict, returning: Sequence = ()) -> list[Row]:
+    """Update the rows with the given ids, write their history rows and return the returning columns of each row."""
+    if not ids:
+        return []
+    table = model.__table__
+    history = history_table(model)
+    columns = [column.name for column in history.c if column.name != HISTORY_CHANGED_COLUMN]
+    db.session.execute(
+        insert(history).from_select(
+            [*columns, HISTORY_CHANGED_COLUMN],
+            select(*[table.c[name] for name in columns], func.now()).where(table.c.id.in_(ids)),
+        )
+    )
+    return db.session.execute(
+        update(table)
+        .where(table.c.id.in_(ids))
+        .values(**values, version=table.c.version + 1)
+        .returning(table.c.id, *returning)
+    ).all()
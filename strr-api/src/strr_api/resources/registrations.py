@@ -66,7 +66,7 @@ from strr_api.exceptions import (
     error_response,
     exception_response,
 )
-from strr_api.models import Application, Document, User
+from strr_api.models import Application, Document
 from strr_api.models.dataclass import RegistrationSearch
 from strr_api.responses import Events
 from strr_api.schemas.utils import validate
@@ -438,7 +438,7 @@ def get_registration_events(registration_id):
 
     try:
         account_id = request.headers.get("Account-Id")
-        user = User.get_or_create_user_by_jwt(g.jwt_oidc_token_info)
+        user = UserService.get_or_create_user_by_jwt(g.jwt_oidc_token_info)
         if not user:
             raise AuthException()
 
@@ -533,7 +533,7 @@ def get_todos(registration_id):
     """
     try:
         account_id = request.headers.get("Account-Id")
-        user = User.get_or_create_user_by_jwt(g.jwt_oidc_token_info)
+        user = UserService.get_or_create_user_by_jwt(g.jwt_oidc_token_info)
         if not user:
             raise AuthException()
         registration = RegistrationService.get_registration(account_id, registration_id)
@@ -691,14 +691,33 @@ def update_registration_unit_address(registration_id):
 #         if not certificate:
 #             return error_response(HTTPStatus.NOT_FOUND, "Certificate not found")
 #
-#         return send_file(
-#             BytesIO(certificate.certificate),
-#             as_attachment=True,
-#             download_name="Host Registration Certificate.pdf",
+#         return Response(
+#             stream_with_context(certificate.stream()),
 #             mimetype="application/pdf",
+#             headers={"Content-Disposition": 'attachment; filename="Host Registration Certificate.pdf"'},
 #         )
 #     except AuthException as auth_exception:
 #         return exception_response(auth_exception)
+#
+#
+# @bp.route("/<registration_id>/certificate/status", methods=("GET",))
+# @swag_from({"security": [{"Bearer": []}]})
+# @cross_origin(origin="*")
+# @jwt.requires_auth
+# def get_registration_certificate_status(registration_id):
+#     """Poll the render status of the certificate of a registration version, the current one by default."""
+#     try:
+#         account_id = request.headers.get("Account-Id")
+#         registration = RegistrationService.get_registration(account_id, registration_id)
+#         if not registration:
+#             raise AuthException()
+#
+#         status = CertificateService.get_status(registration, request.args.get("version", None, type=int))
+#         if not status:
+#             return error_response(HTTPStatus.NOT_FOUND, "Certificate not found")
+#         return status, HTTPStatus.OK
+#     except AuthException as auth_exception:
+#         return exception_response(auth_exception)
 
 
 @bp.route("/permit-validation-registration", methods=("POST",))
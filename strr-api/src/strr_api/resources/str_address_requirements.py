@@ -47,7 +47,7 @@ from strr_api.common.auth import jwt
 from strr_api.enums.enum import ErrorMessage
 from strr_api.exceptions import ExternalServiceException, error_response
 from strr_api.schemas.utils import validate
-from strr_api.services.approval_service import ApprovalService
+from strr_api.services.str_requirements_service import StrRequirementsService
 
 logger = logging.getLogger("api")
 bp = Blueprint("str-requirements", __name__)
@@ -88,17 +88,10 @@ def _get_address_requirements():
         [valid, errors] = validate(address_json, "rental_unit_address")
         if not valid:
             return error_response(message="Invalid request", http_status=HTTPStatus.BAD_REQUEST, errors=errors)
-        unit_address = address_json.get("address")
-        address_line_1 = ""
-        if unit_number := unit_address.get("unitNumber"):
-            address_line_1 = f"{unit_number}-"
-        address_line_1 = f"{address_line_1}{unit_address.get('streetNumber')} {unit_address.get('streetName')}"
-        address_line_2 = unit_address.get("addressLineTwo", "")
-        address = f"{address_line_1} {address_line_2}, {unit_address.get('city')}, {unit_address.get('province')}"
-        str_data = ApprovalService.getSTRDataForAddress(address=address)
+        str_data = StrRequirementsService.get_requirements_for_unit_address(address_json.get("address"))
         if not str_data:
             return error_response(message=ErrorMessage.ADDRESS_NOT_FOUND.value, http_status=HTTPStatus.NOT_FOUND)
-        return ApprovalService.getSTRDataForAddress(address=address), HTTPStatus.OK
+        return str_data, HTTPStatus.OK
     except ExternalServiceException as service_exception:
         logger.error("Error while getting STR requirements", exc_info=service_exception)
         return error_response(message=ErrorMessage.PROCESSING_ERROR.value, http_status=HTTPStatus.SERVICE_UNAVAILABLE)
@@ -17,8 +17,9 @@ Test helper functions to load and assert that a JSON payload validates against a
 """
 import json
 import logging
+import threading
 from os import listdir, path
-from typing import Tuple
+from typing import Dict, Optional, Tuple
 
 from jsonschema import Draft7Validator
 from referencing import Registry, Resource
@@ -28,6 +29,8 @@ logger = logging.getLogger("api")
 
 BASE_URI = "https://strr.gov.bc.ca/.well_known/schemas"
 
+SCHEMA_SEARCH_PATH = path.join(path.dirname(__file__), "schemas")
+
 
 def get_schema(filename: str) -> dict:
     """Return the given schema file identified by filename."""
@@ -65,27 +68,74 @@ def get_schema_store(schema_search_path: str) -> dict:
     return schemastore
 
 
-def validate_schema(
-    json_data: json,
-    schema_id: str,
-) -> Tuple[bool, iter]:
-    """Load the json file and validate against loaded schema."""
-
-    schema_search_path = path.join(path.dirname(__file__), "schemas")
-    schema_store = get_schema_store(schema_search_path)
-    schema_uri = f"{BASE_URI}/{schema_id}"
-    schema = schema_store.get(schema_uri)
+class SchemaRegistry:
+    """Process-wide store of compiled schema validators.
 
-    if schema is None:
-        raise ValueError(f"No schema found for URI {schema_uri}")
+    The schema directory is read and checked once, and a validator is compiled once per schema id.
+    Draft7Validator keeps no per-call state, so one instance is shared by every thread.
+    """
 
-    def retrieve_resource(uri):
-        contents = schema_store.get(uri)
-        return Resource.from_contents(contents)
+    def __init__(self, schema_search_path: str = SCHEMA_SEARCH_PATH):
+        """Create a registry for the schemas found in schema_search_path."""
+        self._schema_search_path = schema_search_path
+        self._lock = threading.Lock()
+        self._schema_store: Optional[dict] = None
+        self._registry: Optional[Registry] = None
+        self._validators: Dict[str, Draft7Validator] = {}
+
+    def _load(self):
+        """Load, check and register every schema in the search path."""
+        schema_store = get_schema_store(self._schema_search_path)
+
+        def retrieve_resource(uri):
+            return Resource.from_contents(schema_store.get(uri), default_specification=DRAFT7)
+
+        registry = Registry(retrieve=retrieve_resource).with_resources(
+            (uri, DRAFT7.create_resource(schema)) for uri, schema in schema_store.items()
+        )
+        self._registry = registry.crawl()
+        self._schema_store = schema_store
+        logger.debug(f"Loaded {len(schema_store)} schemas from {self._schema_search_path}")
+
+    def get_validator(self, schema_id: str) -> Draft7Validator:
+        """Return the compiled validator for the schema id, compiling it on first use."""
+        schema_uri = f"{BASE_URI}/{schema_id}"
+        if validator := self._validators.get(schema_uri):
+            return validator
+
+        with self._lock:
+            if validator := self._validators.get(schema_uri):
+                return validator
+            if self._schema_store is None:
+                self._load()
+            schema = self._schema_store.get(schema_uri)
+            if schema is None:
+                raise ValueError(f"No schema found for URI {schema_uri}")
+            validator = Draft7Validator(schema, format_checker=Draft7Validator.FORMAT_CHECKER, registry=self._registry)
+            self._validators[schema_uri] = validator
+        return validator
+
+    def is_valid(self, json_data: dict, schema_id: str) -> bool:
+        """Return whether the data is valid, without collecting the errors."""
+        return self.get_validator(schema_id).is_valid(json_data)
+
+    def clear(self):
+        """Drop the loaded schemas and validators so they are reloaded on next use."""
+        with self._lock:
+            self._schema_store = None
+            self._registry = None
+            self._validators = {}
+
+
+schema_registry = SchemaRegistry()
 
-    registry = Registry(retrieve=retrieve_resource).with_resource(schema_uri, DRAFT7.create_resource(schema))
 
-    validator = Draft7Validator(schema, format_checker=Draft7Validator.FORMAT_CHECKER, registry=registry)
+def validate_schema(
+    json_data: json,
+    schema_id: str,
+) -> Tuple[bool, iter]:
+    """Validate the json data against the compiled schema."""
+    validator = schema_registry.get_validator(schema_id)
     if validator.is_valid(json_data):
         return True, None
 
@@ -93,6 +143,14 @@ def validate_schema(
     return False, errors
 
 
+def is_valid(json_data: dict, schema_name: str) -> bool:
+    """Return whether the data is valid against the schema, for callers that do not need the errors.
+
+    Unlike validate, an unknown schema_name raises a ValueError.
+    """
+    return schema_registry.is_valid(json_data, schema_name)
+
+
 def validate(json_data: dict, schema_name: str) -> [bool, []]:
     """
     A method to validate data against a specified schema.
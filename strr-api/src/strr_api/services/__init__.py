@@ -36,15 +36,18 @@ from .user_service import UserService  # isort: skip
 from .account_service import AccountService
 from .application_service import ApplicationService
 from .auth_service import AuthService
+from .certificate_service import CertificateService
 from .document_service import DocumentService
 from .events_service import EventsService
 from .gcp_storage_service import GCPStorageService
 from .geocoder_service import GeoCoderService
 from .interaction import InteractionService
 from .payment_service import PayService
+from .permit_snapshot_service import PermitSnapshotService
 from .registration_service import RegistrationService
 from .rest_service import RestService
 from .snapshot_service import SnapshotService
+from .str_requirements_service import StrRequirementsService
 
 from .ltsa_service import LtsaService  # isort: skip
 from .approval_service import ApprovalService  # isort: skip
@@ -34,7 +34,8 @@
 """Service to interact with the account roles model."""
 from typing import List
 
-from strr_api.models import AccountRoles, User
+from strr_api.models import AccountRoles
+from strr_api.services.user_service import UserService
 from strr_api.utils.user_context import UserContext, user_context
 
 
@@ -46,7 +47,7 @@ class AccountService:
     def create_account_roles(account_id: int, roles: List[str], **kwargs):
         """Saves an account role."""
         usr_context: UserContext = kwargs["user_context"]
-        User.get_or_create_user_by_jwt(usr_context.token_info)
+        UserService.get_or_create_user_by_jwt(usr_context.token_info)
         for role in roles:
             account_roles = AccountRoles()
             account_roles.account_id = account_id
@@ -59,5 +60,5 @@ class AccountService:
     def list_account_roles(account_id, **kwargs):
         """List all roles assigned to the account."""
         usr_context: UserContext = kwargs["user_context"]
-        User.get_or_create_user_by_jwt(usr_context.token_info)
+        UserService.get_or_create_user_by_jwt(usr_context.token_info)
         return AccountRoles.get_account_roles(account_id)
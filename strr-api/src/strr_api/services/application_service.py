@@ -44,9 +44,11 @@ from strr_api.models import Application, Events, NoticeOfConsideration, Registra
 from strr_api.models.application import ApplicationSerializer
 from strr_api.models.dataclass import ApplicationSearch
 from strr_api.models.rental import PropertyContact
+from strr_api.models.unit_of_work import unit_of_work
 from strr_api.services.email_service import EmailService
 from strr_api.services.events_service import EventsService
 from strr_api.services.gcp_storage_service import GCPStorageService
+from strr_api.services.permit_snapshot_service import PermitSnapshotService
 from strr_api.services.registration_service import RegistrationService
 from strr_api.services.user_service import UserService
 
@@ -102,6 +104,26 @@ class ApplicationService:
             )
         return app_dict
 
+    @staticmethod
+    def serialize_all(applications: list[Application]) -> list[dict]:
+        """Returns the JSON for a page of applications.
+
+        The existing host registration counts for the whole page come from one grouped query.
+        """
+        app_dicts = [ApplicationSerializer.to_dict(application) for application in applications]
+        host_sins = {
+            application_index: host_sin
+            for application_index, (application, app_dict) in enumerate(zip(applications, app_dicts))
+            if application.registration_type == Registration.RegistrationType.HOST
+            and (host_sin := ApplicationService._get_host_sin(app_dict))
+        }
+        counts = RegistrationService.count_by_host_sins(set(host_sins.values())) if host_sins else {}
+        for application_index, (application, app_dict) in enumerate(zip(applications, app_dicts)):
+            if application.registration_type == Registration.RegistrationType.HOST:
+                host_sin = host_sins.get(application_index)
+                app_dict["header"]["existingHostRegistrations"] = counts.get(host_sin, 0) if host_sin else 0
+        return app_dicts
+
     @staticmethod
     def enrich_document_added_on_from_gcp(app_dict: dict) -> dict:
         """
@@ -145,9 +167,7 @@ class ApplicationService:
         UserService.get_or_create_user_in_context()
         is_examiner = UserService.is_strr_staff_or_system()
         paginated_result = Application.find_by_account(account_id, filter_criteria, is_examiner)
-        search_results = []
-        for item in paginated_result.items:
-            search_results.append(ApplicationService.serialize(item))
+        search_results = ApplicationService.serialize_all(paginated_result.items)
 
         return {
             "page": filter_criteria.page,
@@ -223,6 +243,7 @@ class ApplicationService:
         return application
 
     @staticmethod
+    @unit_of_work()
     def update_application_status(
         application: Application,
         application_status: Application.Status,
@@ -268,6 +289,7 @@ class ApplicationService:
                 registration.reviewer_id = reviewer.id
                 registration.decider_id = reviewer.id
                 registration.save()
+                PermitSnapshotService.refresh(registration)
 
                 event_name = (
                     Events.EventName.REGISTRATION_RENEWED
@@ -292,6 +314,7 @@ class ApplicationService:
                 registration.status = RegistrationStatus.CANCELLED.value
                 registration.cancelled_date = datetime.now(timezone.utc)
                 registration.save()
+                PermitSnapshotService.refresh(registration)
                 EventsService.save_event(
                     event_type=Events.EventType.REGISTRATION,
                     event_name=Events.EventName.REGISTRATION_CANCELLED,
@@ -336,9 +359,7 @@ class ApplicationService:
     def search_applications(filter_criteria: ApplicationSearch) -> dict:
         """List all applications matching the search criteria."""
         paginated_result = Application.search_applications(filter_criteria)
-        search_results = []
-        for item in paginated_result.items:
-            search_results.append(ApplicationService.serialize(item))
+        search_results = ApplicationService.serialize_all(paginated_result.items)
 
         return {
             "page": filter_criteria.page,
@@ -367,18 +388,22 @@ class ApplicationService:
     @staticmethod
     def get_existing_host_registrations_count(application_dict: dict) -> int:
         """Return the count of existing host registrations for the host of the given application."""
-        contact_type = application_dict.get("registration", {}).get("primaryContact", {}).get("contactType")
-        # NOTE: contactType may not be set
-        if contact_type == PropertyContact.ContactType.BUSINESS.value:
-            # TODO: does not not have anything to compare against when the host is a business
-            return 0
-
-        host_sin = application_dict.get("registration", {}).get("primaryContact", {}).get("socialInsuranceNumber")
+        host_sin = ApplicationService._get_host_sin(application_dict)
         if not host_sin:
             return 0
 
         return RegistrationService.find_all_by_host_sin(host_sin, True)
 
+    @staticmethod
+    def _get_host_sin(application_dict: dict) -> Optional[str]:
+        """Return the SIN of an individual host, which existing host registrations are matched on."""
+        primary_contact = application_dict.get("registration", {}).get("primaryContact", {})
+        # NOTE: contactType may not be set
+        if primary_contact.get("contactType") == PropertyContact.ContactType.BUSINESS.value:
+            # TODO: does not not have anything to compare against when the host is a business
+            return None
+        return primary_contact.get("socialInsuranceNumber") or None
+
     @staticmethod
     def send_notice_of_consideration(application: Application, content: str, reviewer: User = None) -> Application:
         """Sends the notice of consideration."""
@@ -40,13 +40,15 @@
 
 """For a successfully paid registration, this service determines its auto-approval state."""
 from datetime import datetime
+from http import HTTPStatus
 from typing import Any, List, Tuple
 
-import requests
 from flask import current_app
 
 from strr_api.enums.enum import ApplicationType, RegistrationType
+from strr_api.exceptions import ExternalServiceException
 from strr_api.models import Application, AutoApprovalRecord, Document, Events, PropertyContact, RentalProperty
+from strr_api.models.unit_of_work import unit_of_work
 from strr_api.requests import Registration, RegistrationRequest
 from strr_api.responses.AutoApprovalResponse import AutoApproval
 from strr_api.responses.LTSAResponse import LtsaResponse
@@ -55,6 +57,8 @@ from strr_api.services.email_service import EmailService
 from strr_api.services.geocoder_service import GeoCoderService
 from strr_api.services.registration_service import RegistrationService
 from strr_api.services.rest_service import RestService
+from strr_api.services.str_requirements_service import StrRequirementsService
+from strr_api.services.token_manager import token_manager
 
 
 class ApprovalService:
@@ -65,7 +69,7 @@ class ApprovalService:
     @classmethod
     def extract_longitude_and_latitude(cls, geocode_response):
         """Extract longitude and latitude from the geocode response."""
-        features = geocode_response.get("features", [])
+        features = (geocode_response or {}).get("features", [])
         if features:
             first_feature = features[0]
             geometry = first_feature.get("geometry", {})
@@ -105,15 +109,16 @@ class ApprovalService:
             if registration_type == RegistrationType.HOST.value:
                 registration_request = RegistrationRequest(**application_json)
                 registration = registration_request.registration
-                address_line_1 = ""
-                if unit_number := registration.unitAddress.unitNumber:
-                    address_line_1 = f"{unit_number}-"
-                address_line_1 = (
-                    f"{address_line_1}{registration.unitAddress.streetNumber} {registration.unitAddress.streetName}"
+                unit_address = registration.unitAddress
+                address = StrRequirementsService.format_address(
+                    unit_address.streetNumber,
+                    unit_address.streetName,
+                    unit_address.city,
+                    unit_address.province,
+                    unit_number=unit_address.unitNumber,
                 )
-                address = f"{address_line_1}, {registration.unitAddress.city}, {registration.unitAddress.province}"
 
-                organization = cls.getSTRDataForAddress(address)
+                organization = StrRequirementsService.get_requirements(address)
                 if organization:
                     auto_approval.businessLicenseRequired = organization.get("isBusinessLicenceRequired")
                     auto_approval.strProhibited = organization.get("isStrProhibited")
@@ -146,22 +151,23 @@ class ApprovalService:
 
                 cls._check_title_match(application, auto_approval, registration)
 
-                cls.save_approval_record_by_application(application.id, auto_approval)
+                with unit_of_work():
+                    cls.save_approval_record_by_application(application.id, auto_approval)
 
-                if auto_approval.suggestedAction == Application.Status.AUTO_APPROVED:
-                    registration_id = cls.approve_application(
-                        application=application,
-                        status=Application.Status.AUTO_APPROVED,
-                        event=Events.EventName.AUTO_APPROVAL_APPROVED,
-                    )
-                elif auto_approval.suggestedAction == Application.Status.PROVISIONALLY_APPROVED:
-                    registration_id = cls.approve_application(
-                        application=application,
-                        status=Application.Status.PROVISIONAL_REVIEW,
-                        event=Events.EventName.AUTO_APPROVAL_PROVISIONAL,
-                    )
-                else:
-                    cls._update_application_status_to_full_review(application)
+                    if auto_approval.suggestedAction == Application.Status.AUTO_APPROVED:
+                        registration_id = cls.approve_application(
+                            application=application,
+                            status=Application.Status.AUTO_APPROVED,
+                            event=Events.EventName.AUTO_APPROVAL_APPROVED,
+                        )
+                    elif auto_approval.suggestedAction == Application.Status.PROVISIONALLY_APPROVED:
+                        registration_id = cls.approve_application(
+                            application=application,
+                            status=Application.Status.PROVISIONAL_REVIEW,
+                            event=Events.EventName.AUTO_APPROVAL_PROVISIONAL,
+                        )
+                    else:
+                        cls._update_application_status_to_full_review(application)
 
             elif registration_type == RegistrationType.PLATFORM.value:
                 registration_id = cls.approve_application(
@@ -183,6 +189,7 @@ class ApprovalService:
             return application.status, None
 
     @classmethod
+    @unit_of_work()
     def approve_application(cls, application, status, event):
         """Creates the registration and creates the corresponding events."""
         registration = RegistrationService.create_registration(
@@ -252,23 +259,14 @@ class ApprovalService:
         token_url = current_app.config.get("STR_DATA_API_TOKEN_URL")
         timeout = 20
 
-        data = "grant_type=client_credentials"
-
-        # get service account token
-        res = requests.post(
-            url=token_url,
-            data=data,
-            headers={"content-type": "application/x-www-form-urlencoded"},
-            auth=(client_id, client_secret),
-            timeout=timeout,
-        )
         try:
-            token = res.json().get("access_token")
-            current_app.logger.info(f"Token: {token}")
+            token = token_manager.get_token(token_url, client_id, client_secret, timeout)
             endpoint = f"{current_app.config.get('STR_DATA_API_URL')}/api/organizations/strrequirements?longitude={longitude}&latitude={latitude}"  # noqa: E501
-            str_info_for_address = RestService.get(endpoint=endpoint, token=token).json()
+            str_info_for_address = RestService.get(endpoint=endpoint, token=token, service="data_portal").json()
             return str_info_for_address
         except Exception as exception:
+            if isinstance(exception, ExternalServiceException) and exception.status_code == HTTPStatus.UNAUTHORIZED:
+                token_manager.invalidate(token_url, client_id)
             current_app.logger.error("Error while calling Data Portal API", exc_info=exception)
             raise exception
 
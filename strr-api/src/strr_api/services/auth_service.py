@@ -35,7 +35,6 @@
 
 from http import HTTPStatus
 
-import requests
 from flask import current_app
 from requests.exceptions import HTTPError
 
@@ -43,6 +42,7 @@ from strr_api.exceptions import ExternalServiceException
 from strr_api.requests import SBCMailingAddress
 from strr_api.requests.SBCAccountCreationRequest import SBCAccountCreationRequest
 from strr_api.services.rest_service import RestService
+from strr_api.services.token_manager import token_manager
 from strr_api.utils.user_context import UserContext, user_context
 
 
@@ -57,7 +57,10 @@ class AuthService:
         token_url: str | None = None,
         timeout: int | None = None,
     ):
-        """Get service account client token for cross api calls."""
+        """Get service account client token for cross api calls.
+
+        The token is cached per token url and client id until shortly before it expires.
+        """
 
         # Load from config when any required arg is missing (empty list is falsy; [None, None, ...] is truthy)
         if not all([client_id, client_secret, token_url]):
@@ -67,21 +70,7 @@ class AuthService:
         if timeout is None:
             timeout = int(current_app.config.get("AUTH_SVC_TIMEOUT", 20))
 
-        data = "grant_type=client_credentials"
-
-        # get service account token
-        res = requests.post(
-            url=token_url,
-            data=data,
-            headers={"content-type": "application/x-www-form-urlencoded"},
-            auth=(client_id, client_secret),
-            timeout=timeout,
-        )
-
-        try:
-            return res.json().get("access_token")
-        except Exception:
-            return None
+        return token_manager.get_token(token_url, client_id, client_secret, timeout)
 
     @classmethod
     def search_accounts(cls, account_name: str):
@@ -0,0 +1,200 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Render certificate PDFs in a pool of worker processes.
+
+Rendering a certificate is CPU bound and most of the time goes into parsing the stylesheet and loading the three
+embedded BC Sans fonts, which are the same for every certificate. Each worker therefore prepares the template once when
+it starts: the <style> block is split off and parsed into a CSS object, its @font-face rules are loaded into a
+FontConfiguration that is reused for every document, and only the small HTML body is rendered per certificate.
+
+With CERTIFICATE_RENDER_WORKERS set to 0 the same warm state is kept in the calling process, which is what the tests
+and single certificate requests use.
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Optional
+
+from flask import current_app
+from jinja2 import Environment
+from weasyprint import CSS, HTML
+from weasyprint.text.fonts import FontConfiguration
+
+RENDERER_EXTENSION = "strr_certificate_renderer"
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "certificate.html")
+
+_STYLE = re.compile(r"<style>(.*?)</style>", re.DOTALL)
+
+logger = logging.getLogger("api")
+
+
+class _WarmTemplate:
+    """The certificate template with its stylesheet and fonts loaded."""
+
+    def __init__(self, template_path: str):
+        """Parse the stylesheet and fonts of the template once."""
+        with open(template_path, encoding="utf-8") as template_file:
+            source = template_file.read()
+        self.font_config = FontConfiguration()
+        self.stylesheets = [CSS(string=style, font_config=self.font_config) for style in _STYLE.findall(source)]
+        self.template = Environment(autoescape=True).from_string(_STYLE.sub("", source))
+
+    def render(self, data: dict) -> bytes:
+        """Return the certificate PDF for the template data."""
+        return HTML(string=self.template.render(**data)).write_pdf(
+            stylesheets=self.stylesheets, font_config=self.font_config
+        )
+
+
+_warm_template: Optional[_WarmTemplate] = None
+
+
+def _init_worker(template_path: str):
+    """Load the template in a worker process before it takes its first certificate."""
+    global _warm_template  # pylint: disable=global-statement
+    _warm_template = _WarmTemplate(template_path)
+
+
+def _render(data: dict) -> bytes:
+    """Render one certificate with the template of this process."""
+    return _warm_template.render(data)
+
+
+@dataclass
+class RenderResult:
+    """Outcome of one certificate rendered through the pool."""
+
+    data: dict
+    pdf: Optional[bytes] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """Return whether the certificate was rendered."""
+        return self.error is None
+
+
+class CertificateRenderer:
+    """Render certificates in worker processes that keep the template, stylesheet and fonts loaded."""
+
+    def __init__(self, max_workers: int = 0, timeout: Optional[float] = None, template_path: str = TEMPLATE_PATH):
+        """Render with max_workers processes, or in this process when it is 0."""
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.template_path = template_path
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._local: Optional[_WarmTemplate] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn, so the workers do not inherit the database connections and threads of the app process
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.template_path,),
+            )
+        return self._pool
+
+    def warm_up(self):
+        """Start the workers and load the template in each, so the first batch does not pay for it."""
+        if not self.max_workers:
+            self._local = self._local or _WarmTemplate(self.template_path)
+            return
+        pool = self._get_pool()
+        # a future per worker makes the pool start all of them; the initializer runs before the no-op
+        wait([pool.submit(os.getpid) for _ in range(self.max_workers)])
+
+    def render(self, data: dict) -> bytes:
+        """Render one certificate and return the PDF, raising when rendering failed."""
+        result = self.render_many([data])[0]
+        if not result.ok:
+            raise result.error
+        return result.pdf
+
+    def render_many(self, documents: list[dict]) -> list[RenderResult]:
+        """Render the certificates in parallel, returning one result per document in the same order."""
+        if not self.max_workers:
+            self._local = self._local or _WarmTemplate(self.template_path)
+            results = []
+            for data in documents:
+                try:
+                    results.append(RenderResult(data, pdf=self._local.render(data)))
+                except Exception as err:  # pylint: disable=broad-exception-caught
+                    results.append(RenderResult(data, error=err))
+            return results
+
+        results = []
+        try:
+            pool = self._get_pool()
+            futures = [pool.submit(_render, data) for data in documents]
+        except BrokenProcessPool as err:
+            # a worker died; start a fresh pool for the next batch
+            self._pool = None
+            results = [RenderResult(data, error=err) for data in documents]
+            futures = []
+        for data, future in zip(documents, futures):
+            try:
+                results.append(RenderResult(data, pdf=future.result(timeout=self.timeout)))
+            except BrokenProcessPool as err:
+                self._pool = None
+                results.append(RenderResult(data, error=err))
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                results.append(RenderResult(data, error=err))
+        failed = [result for result in results if not result.ok]
+        if failed:
+            logger.error("Failed to render %s of %s certificates: %s", len(failed), len(results), failed[0].error)
+        return results
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+def get_renderer() -> CertificateRenderer:
+    """Return the renderer of the current app, created on first use."""
+    if RENDERER_EXTENSION not in current_app.extensions:
+        current_app.extensions[RENDERER_EXTENSION] = CertificateRenderer(
+            max_workers=current_app.config.get("CERTIFICATE_RENDER_WORKERS", 0),
+            timeout=current_app.config.get("CERTIFICATE_RENDER_TIMEOUT"),
+        )
+    return current_app.extensions[RENDERER_EXTENSION]
@@ -0,0 +1,305 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Asynchronous registration certificates.
+
+A certificate is requested for a registration version: request_certificate() creates a PENDING certificate row, or
+returns the one that already exists for that version, so repeating the request never renders twice. The PENDING rows
+are the queue. render_pending() claims a batch of them with SKIP LOCKED, marks them RENDERING and commits, renders the
+PDFs in the CertificateRenderer pool outside the transaction and stores each outcome as COMPLETED or FAILED. A batch
+whose process died leaves RENDERING rows behind; they are claimed again once CERTIFICATE_RENDER_STALE_SECONDS passed.
+An outcome is only stored while its row is still RENDERING, so when a slow batch was claimed again the first run to
+finish wins and the other cannot overwrite its result.
+
+Callers poll get_status() for the outcome.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from flask import current_app
+from sqlalchemy import and_, bindparam, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+
+from strr_api.models import Certificate, Events, PropertyContact, Registration, RentalProperty, db
+from strr_api.models.unit_of_work import unit_of_work
+from strr_api.services.certificate_renderer import CertificateRenderer, get_renderer
+from strr_api.services.events_service import EventsService
+
+ERROR_MAX_LENGTH = 1000
+
+
+@dataclass
+class CertificateBatchSummary:
+    """What a render_pending run did."""
+
+    claimed: int = 0
+    completed: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+
+
+class CertificateService:
+    """Request, render and report on registration certificates."""
+
+    @staticmethod
+    def certificate_data(registration: Registration, issued_date: datetime) -> dict:
+        """Return the certificate template data of a registration."""
+        primary_property_contact = list(filter(lambda x: x.is_primary is True, registration.rental_property.contacts))[
+            0
+        ]
+        return {
+            "registration_number": f"{registration.registration_number}",
+            "creation_date": f'{registration.start_date.strftime("%B %d, %Y")}',
+            "expiry_date": f'{registration.expiry_date.strftime("%B %d, %Y")}',
+            "issued_date": f'{issued_date.strftime("%B %d, %Y")}',
+            "rental_address": registration.rental_property.address.to_oneline_address(),
+            "rental_type": registration.rental_property.property_type.value,
+            "registrant": primary_property_contact.contact.full_name(),
+            "host": primary_property_contact.contact.full_name(),
+        }
+
+    @classmethod
+    def get_certificate(cls, registration_id: int, version: Optional[int]) -> Optional[Certificate]:
+        """Return the certificate requested for the registration version."""
+        return Certificate.query.filter_by(registration_id=registration_id, registration_version=version).one_or_none()
+
+    @classmethod
+    def request_certificate(cls, registration: Registration, issuer_id: Optional[int] = None) -> Certificate:
+        """Queue a certificate for the current version of the registration, or return the one already requested."""
+        if certificate := cls.get_certificate(registration.id, registration.version):
+            return certificate
+        certificate = Certificate(
+            registration_id=registration.id,
+            registration_version=registration.version,
+            issuer_id=issuer_id,
+            status=Certificate.Status.PENDING,
+        )
+        try:
+            with db.session.begin_nested():
+                db.session.add(certificate)
+        except IntegrityError:
+            # requested concurrently, the other request won
+            return cls.get_certificate(registration.id, registration.version)
+        Certificate.commit()
+        return certificate
+
+    @classmethod
+    def get_status(cls, registration: Registration, version: Optional[int] = None) -> Optional[dict]:
+        """Return the render status of the certificate of the registration version, the current one by default."""
+        certificate = cls.get_certificate(registration.id, version or registration.version)
+        if not certificate:
+            return None
+        completed = certificate.status == Certificate.Status.COMPLETED
+        return {
+            "registrationId": certificate.registration_id,
+            "registrationVersion": certificate.registration_version,
+            "status": certificate.status,
+            "issuedDate": certificate.issued_date.isoformat() if completed else None,
+            "error": certificate.error,
+        }
+
+    @classmethod
+    def _claim(cls, batch_size: int, stale_before: datetime, issued_date: datetime) -> list[dict]:
+        """Mark up to batch_size pending, or stale rendering, certificates as RENDERING.
+
+        Returns a job per certificate: its id and registration id, and the template data or the error building it.
+        """
+        claimable = or_(
+            Certificate.status == Certificate.Status.PENDING,
+            and_(Certificate.status == Certificate.Status.RENDERING, Certificate.updated_date < stale_before),
+        )
+        ids = (
+            db.session.execute(
+                select(Certificate.id)
+                .where(claimable)
+                .order_by(Certificate.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            .scalars()
+            .all()
+        )
+        if not ids:
+            return []
+        db.session.execute(
+            update(Certificate)
+            .where(Certificate.id.in_(ids))
+            .values(status=Certificate.Status.RENDERING, updated_date=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        certificates = (
+            Certificate.query.filter(Certificate.id.in_(ids))
+            .options(
+                selectinload(Certificate.registration)
+                .selectinload(Registration.rental_property)
+                .options(
+                    selectinload(RentalProperty.address),
+                    selectinload(RentalProperty.contacts).selectinload(PropertyContact.contact),
+                )
+            )
+            .order_by(Certificate.id)
+            .all()
+        )
+        return [cls._job(certificate, issued_date) for certificate in certificates]
+
+    @classmethod
+    def _job(cls, certificate: Certificate, issued_date: datetime) -> dict:
+        """Return the render job of a certificate."""
+        job = {"id": certificate.id, "registration_id": certificate.registration_id, "data": None, "error": None}
+        try:
+            job["data"] = cls.certificate_data(certificate.registration, issued_date)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            job["error"] = f"Missing certificate data: {err}"
+        return job
+
+    @classmethod
+    def _render_and_store(
+        cls, jobs: list[dict], renderer: CertificateRenderer, issued_date: datetime
+    ) -> tuple[int, int]:
+        """Render the jobs that have data, store the outcomes and return how many completed and failed.
+
+        Rendering happens outside any transaction; the outcomes are written with one executemany UPDATE per status, for
+        the certificates that are still RENDERING only.
+        """
+        to_render = [job for job in jobs if job["data"] is not None]
+        for job, result in zip(to_render, renderer.render_many([job["data"] for job in to_render])):
+            job["pdf"] = result.pdf
+            job["error"] = None if result.ok else str(result.error)
+
+        now = datetime.now(timezone.utc)
+        certificates = Certificate.__table__
+        with unit_of_work():
+            rendering = set(
+                db.session.execute(
+                    select(Certificate.id)
+                    .where(
+                        Certificate.id.in_([job["id"] for job in jobs]),
+                        Certificate.status == Certificate.Status.RENDERING,
+                    )
+                    .with_for_update()
+                ).scalars()
+            )
+            completed = [job for job in jobs if job["id"] in rendering and not job["error"]]
+            failed = [job for job in jobs if job["id"] in rendering and job["error"]]
+            if completed:
+                db.session.execute(
+                    update(certificates).where(
+                        certificates.c.id == bindparam("b_id"),
+                        certificates.c.status == Certificate.Status.RENDERING,
+                    ),
+                    [
+                        {
+                            "b_id": job["id"],
+                            "status": Certificate.Status.COMPLETED,
+                            "certificate": job["pdf"],
+                            "issued_date": issued_date,
+                            "error": None,
+                            "updated_date": now,
+                        }
+                        for job in completed
+                    ],
+                )
+            if failed:
+                db.session.execute(
+                    update(certificates).where(
+                        certificates.c.id == bindparam("b_id"),
+                        certificates.c.status == Certificate.Status.RENDERING,
+                    ),
+                    [
+                        {
+                            "b_id": job["id"],
+                            "status": Certificate.Status.FAILED,
+                            "error": job["error"][:ERROR_MAX_LENGTH],
+                            "updated_date": now,
+                        }
+                        for job in failed
+                    ],
+                )
+            EventsService.save_events(
+                {
+                    "event_type": Events.EventType.REGISTRATION,
+                    "event_name": Events.EventName.CERTIFICATE_ISSUED,
+                    "registration_id": job["registration_id"],
+                    "visible_to_applicant": True,
+                }
+                for job in completed
+            )
+        return len(completed), len(failed)
+
+    @classmethod
+    def render_pending(
+        cls, batch_size: Optional[int] = None, renderer: Optional[CertificateRenderer] = None
+    ) -> CertificateBatchSummary:
+        """Render every pending certificate, batch_size at a time, and return what was done."""
+        batch_size = batch_size or current_app.config.get("CERTIFICATE_RENDER_BATCH_SIZE", 50)
+        stale_seconds = current_app.config.get("CERTIFICATE_RENDER_STALE_SECONDS", 900)
+        renderer = renderer or get_renderer()
+        summary = CertificateBatchSummary()
+        started = time.perf_counter()
+        while True:
+            now = datetime.now(timezone.utc)
+            with unit_of_work():
+                jobs = cls._claim(batch_size, now - timedelta(seconds=stale_seconds), now)
+            if not jobs:
+                break
+            completed, failed = cls._render_and_store(jobs, renderer, now)
+            summary.claimed += len(jobs)
+            summary.completed += completed
+            summary.failed += failed
+        summary.elapsed_seconds = round(time.perf_counter() - started, 3)
+        return summary
+
+    @classmethod
+    def generate_certificate(cls, registration: Registration, issuer_id: Optional[int] = None) -> Certificate:
+        """Request the certificate of the registration and render it now, unless it was rendered or is rendering."""
+        certificate = cls.request_certificate(registration, issuer_id)
+        issued_date = datetime.now(timezone.utc)
+        with unit_of_work():
+            claimed = db.session.execute(
+                update(Certificate)
+                .where(
+                    Certificate.id == certificate.id,
+                    Certificate.status.in_([Certificate.Status.PENDING, Certificate.Status.FAILED]),
+                )
+                .values(status=Certificate.Status.RENDERING, updated_date=issued_date)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+        if claimed:
+            cls._render_and_store([cls._job(certificate, issued_date)], get_renderer(), issued_date)
+        db.session.refresh(certificate)
+        return certificate
@@ -33,12 +33,13 @@
 # POSSIBILITY OF SUCH DAMAGE.
 """This module provides Email type services."""
 import logging
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Iterable, Optional
 
 from flask import current_app
 
-from strr_api.enums.enum import ChannelType, RegistrationStatus
-from strr_api.models import Application, Registration
+from strr_api.enums.enum import ChannelType, InteractionStatus, RegistrationStatus
+from strr_api.models import Application, CustomerInteraction, Registration, db
+from strr_api.models.unit_of_work import after_commit
 from strr_api.services import gcp_queue_publisher
 
 # from strr_api.services import InteractionService
@@ -65,6 +66,30 @@ EMAIL_TYPE = "strr.email"
 class EmailService:
     """Service to handle email logic and to interact with the email queue."""
 
+    @staticmethod
+    def _publish(queue_message: gcp_queue_publisher.QueueMessage):
+        """Publish the email message, after the commit when called inside a unit of work."""
+
+        def publish():
+            try:
+                gcp_queue_publisher.publish_to_queue(queue_message)
+            except Exception as err:
+                logger.error("Failed to publish email notification: %s", err.with_traceback(None))
+
+        after_commit(publish)
+
+    @staticmethod
+    def _publish_many(queue_messages: list[gcp_queue_publisher.QueueMessage]):
+        """Publish the email messages in batches, after the commit when called inside a unit of work."""
+
+        def publish():
+            try:
+                gcp_queue_publisher.publish_many(queue_messages)
+            except Exception as err:
+                logger.error("Failed to publish email notifications: %s", err.with_traceback(None))
+
+        after_commit(publish)
+
     @staticmethod
     def send_application_status_update_email(application: Application, custom_content: Optional[str] = None):
         """Send email notification for the application if applicable.
@@ -81,7 +106,7 @@ class EmailService:
                     Application.Status.DECLINED,
                 ]:
                     payload_data["customContent"] = custom_content
-                gcp_queue_publisher.publish_to_queue(
+                EmailService._publish(
                     # NOTE: if registrationType / status typing (str vs enum)
                     #       is updated in the model 'emailType' may need changes
                     gcp_queue_publisher.QueueMessage(
@@ -98,7 +123,7 @@ class EmailService:
     def send_notice_of_consideration_for_application(application: Application):
         """Send notice of consideration for the application."""
         try:
-            gcp_queue_publisher.publish_to_queue(
+            EmailService._publish(
                 gcp_queue_publisher.QueueMessage(
                     source=EMAIL_SOURCE,
                     message_type=EMAIL_TYPE,
@@ -120,7 +145,7 @@ class EmailService:
     def send_set_aside_email(application: Application, email_content=None):
         """Send notice of consideration for the application."""
         try:
-            gcp_queue_publisher.publish_to_queue(
+            EmailService._publish(
                 gcp_queue_publisher.QueueMessage(
                     source=EMAIL_SOURCE,
                     message_type=EMAIL_TYPE,
@@ -144,7 +169,7 @@ class EmailService:
         """Send status update email for a registration."""
         if registration.status in [RegistrationStatus.CANCELLED, RegistrationStatus.ACTIVE]:
             try:
-                gcp_queue_publisher.publish_to_queue(
+                EmailService._publish(
                     gcp_queue_publisher.QueueMessage(
                         source=EMAIL_SOURCE,
                         message_type=EMAIL_TYPE,
@@ -164,7 +189,7 @@ class EmailService:
     def send_notice_of_consideration_for_registration(registration: Registration):
         """Send notice of consideration for the application."""
         try:
-            gcp_queue_publisher.publish_to_queue(
+            EmailService._publish(
                 gcp_queue_publisher.QueueMessage(
                     source=EMAIL_SOURCE,
                     message_type=EMAIL_TYPE,
@@ -176,26 +201,45 @@ class EmailService:
             logger.error("Failed to publish email notification: %s", err.with_traceback(None))
 
     @staticmethod
-    def send_renewal_reminder_for_registration(registration: Registration):
+    def send_renewal_reminder_for_registration(registration: Registration, interaction: Optional[str] = None):
         """Send renewal reminder for the registration."""
-        # TODO: fix circular import issue
-        from strr_api.services import InteractionService
+        EmailService.send_renewal_reminders([registration], interaction)
 
-        email_type = "RENEWAL_REMINDER"
-        email_type = f"{registration.registration_type}_{email_type}"
-        interaction_uuid = InteractionService.queued(channel_type=ChannelType.EMAIL, registration_id=registration.id)
-        try:
-            gcp_queue_publisher.publish_to_queue(
+    @staticmethod
+    def send_renewal_reminders(registrations: Iterable[Registration], interaction: Optional[str] = None) -> list[str]:
+        """Send renewal reminders for the registrations and return the queued interaction uuids.
+
+        The queued interactions are written with one flush and tagged with the interaction key that the renewal
+        reminder job uses to skip registrations it already reminded.
+        """
+        registrations = list(registrations)
+        interactions = [
+            CustomerInteraction(
+                channel=ChannelType.EMAIL,
+                status=InteractionStatus.QUEUED,
+                registration_id=registration.id,
+                idempotency_key=interaction,
+            )
+            for registration in registrations
+        ]
+        db.session.add_all(interactions)
+        db.session.flush()
+        CustomerInteraction.commit()
+
+        topic = current_app.config.get("GCP_EMAIL_TOPIC")
+        EmailService._publish_many(
+            [
                 gcp_queue_publisher.QueueMessage(
                     source=EMAIL_SOURCE,
                     message_type=EMAIL_TYPE,
                     payload={
                         "registrationNumber": registration.registration_number,
-                        "emailType": email_type,
-                        "interaction_uuid": interaction_uuid,
+                        "emailType": f"{registration.registration_type}_RENEWAL_REMINDER",
+                        "interaction_uuid": queued.interaction_uuid,
                     },
-                    topic=current_app.config.get("GCP_EMAIL_TOPIC"),
+                    topic=topic,
                 )
-            )
-        except Exception as err:
-            logger.error("Failed to publish email notification: %s", err.with_traceback(None))
+                for registration, queued in zip(registrations, interactions)
+            ]
+        )
+        return [queued.interaction_uuid for queued in interactions]
@@ -36,12 +36,124 @@
 # pylint: disable=R0917
 
 """Events Service."""
-from strr_api.models import Events
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, Optional
+
+from flask import current_app
+from sqlalchemy import insert
+
+from strr_api.models import Events, db
+from strr_api.models.unit_of_work import after_commit
+
+EVENT_FIELDS = (
+    "event_type",
+    "event_name",
+    "details",
+    "visible_to_applicant",
+    "user_id",
+    "registration_id",
+    "application_id",
+    "created_date",
+)
+
+
+class EventCollector:
+    """Buffers events and writes them with one multi-row INSERT per flush."""
+
+    def __init__(self, flush_size: int = 500):
+        """Create an empty collector that flushes every flush_size events."""
+        self.flush_size = flush_size
+        self.rows: list[dict] = []
+        self.saved = 0
+
+    def add(self, **values):
+        """Buffer one event, stamped with its created date now so the flush keeps the order."""
+        row = EventsService.event_row(**values)
+        # Inside a unit of work only buffer the event once its transaction committed.
+        after_commit(lambda: self._append(row))
+        return row
+
+    def _append(self, row: dict):
+        self.rows.append(row)
+        if len(self.rows) >= self.flush_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write the buffered events."""
+        rows, self.rows = self.rows, []
+        count = EventsService.save_events(rows)
+        self.saved += count
+        return count
+
+
+_collector: ContextVar[Optional[EventCollector]] = ContextVar("strr_event_collector", default=None)
 
 
 class EventsService:
     """Service to interact with the event model."""
 
+    @staticmethod
+    def event_row(
+        event_type: str,
+        event_name: str,
+        details: str = None,
+        visible_to_applicant: bool = False,
+        user_id: int = None,
+        registration_id: int = None,
+        application_id: int = None,
+        created_date: datetime = None,
+    ) -> dict:  # pylint: disable=R0913
+        """Return the column values of an event, created now unless a date is given."""
+        return {
+            "event_type": event_type,
+            "event_name": event_name,
+            "details": details,
+            "visible_to_applicant": visible_to_applicant,
+            "user_id": user_id,
+            "registration_id": registration_id,
+            "application_id": application_id,
+            "created_date": created_date or datetime.now(timezone.utc),
+        }
+
+    @classmethod
+    def save_events(cls, events: Iterable[dict]) -> int:
+        """Bulk insert events, given as save_event keyword dicts, and return how many were written.
+
+        The rows are written in created date order with a single multi-row INSERT and committed, or only flushed
+        inside a unit of work.
+        """
+        rows = [cls.event_row(**{key: event.get(key) for key in EVENT_FIELDS if key in event}) for event in events]
+        if not rows:
+            return 0
+        rows.sort(key=lambda row: row["created_date"])
+        db.session.execute(insert(Events), rows)
+        Events.commit()
+        return len(rows)
+
+    @classmethod
+    @contextmanager
+    def collect(cls, flush_size: int = 500) -> Iterator[EventCollector]:
+        """Buffer every save_event call in the block and bulk insert them every flush_size events and on exit."""
+        collector = EventCollector(flush_size)
+        token = _collector.set(collector)
+        try:
+            yield collector
+        except BaseException:
+            # Keep the events of the work that already happened, such as emails already sent.
+            pending = list(collector.rows)
+            try:
+                collector.flush()
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                db.session.rollback()
+                current_app.logger.error(f"Failed to save {len(pending)} buffered events: {err}; events: {pending}")
+            raise
+        else:
+            collector.flush()
+        finally:
+            _collector.reset(token)
+
     @classmethod
     def save_event(
         cls,
@@ -53,7 +165,19 @@ class EventsService:
         registration_id: int = None,
         application_id: int = None,
     ):  # pylint: disable=R0913
-        """Saves STRR event."""
+        """Saves STRR event, or buffers it when called inside EventsService.collect()."""
+        if (collector := _collector.get()) is not None:
+            return Events(
+                **collector.add(
+                    event_type=event_type,
+                    event_name=event_name,
+                    details=details,
+                    visible_to_applicant=visible_to_applicant,
+                    user_id=user_id,
+                    registration_id=registration_id,
+                    application_id=application_id,
+                )
+            )
 
         event = Events(
             user_id=user_id,
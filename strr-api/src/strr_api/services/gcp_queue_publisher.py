@@ -31,18 +31,34 @@
 # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
-"""This module provides Queue type services."""
+"""This module provides Queue type services.
 
+publish_to_queue() publishes one message and waits for nothing, which is fine for a request handler sending an email
+or two. Jobs that enqueue thousands of messages use publish_many() or the publisher() context instead: the messages go
+through a Pub/Sub client with client side batching (GCP_PUBLISH_MAX_MESSAGES, GCP_PUBLISH_MAX_BYTES and
+GCP_PUBLISH_MAX_LATENCY), the futures are collected, and each message gets a PublishResult so a failed message is
+reported without aborting the rest of the batch.
+
+With GCP_QUEUE_IN_MEMORY set the batch API publishes to an InMemoryPublisher, which keeps the messages per topic in
+publish order and mimics the ordering key pause of the Pub/Sub client, for tests and local runs.
+"""
+
+import itertools
 import uuid
+from collections import defaultdict
+from concurrent.futures import Future
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional
 
 from flask import current_app
 from simple_cloudevent import SimpleCloudEvent
 
 from strr_api.services.gcp_queue import GcpQueue, queue
 
+PUBLISHER_EXTENSION = "strr_batch_publisher"
+
 
 @dataclass
 class QueueMessage:
@@ -55,14 +71,24 @@ class QueueMessage:
     ordering_key: Optional[str] = None
 
 
-def publish_to_queue(queue_message: QueueMessage):
-    """Publish to GCP PubSub Queue using queue."""
-    if queue_message.topic is None:
-        current_app.logger.info("Skipping queue message topic not set.")
-        return
+@dataclass
+class PublishResult:
+    """Outcome of one message published through the batch API."""
+
+    message: QueueMessage
+    message_id: Optional[str] = None
+    error: Optional[Exception] = None
+    skipped: bool = False
 
-    # Create a SimpleCloudEvent from the QueueMessage
-    cloud_event = SimpleCloudEvent(
+    @property
+    def ok(self) -> bool:
+        """Return True when the message was published."""
+        return self.message_id is not None
+
+
+def _to_cloud_event(queue_message: QueueMessage) -> SimpleCloudEvent:
+    """Wrap the queue message payload in a SimpleCloudEvent."""
+    return SimpleCloudEvent(
         id=str(uuid.uuid4()),
         source=queue_message.source,
         # Intentionally blank, this field has been moved to topic.
@@ -72,8 +98,174 @@ def publish_to_queue(queue_message: QueueMessage):
         data=queue_message.payload,
     )
 
+
+def publish_to_queue(queue_message: QueueMessage):
+    """Publish to GCP PubSub Queue using queue."""
+    if queue_message.topic is None:
+        current_app.logger.info("Skipping queue message topic not set.")
+        return
+
+    cloud_event = _to_cloud_event(queue_message)
+
     kwargs = {}
     if queue_message.ordering_key:
         kwargs.update({"ordering_key": queue_message.ordering_key})
 
     queue.publish(queue_message.topic, GcpQueue.to_queue_message(cloud_event), **kwargs)
+
+
+class InMemoryPublisher:
+    """Stand-in for the Pub/Sub PublisherClient that keeps the published messages in memory.
+
+    Messages are kept per topic in publish order. A publish rejected by fail_when() pauses its ordering key, like the
+    Pub/Sub client does, so later messages with that key fail until resume_publish() is called.
+    """
+
+    def __init__(self):
+        """Create a publisher with no messages."""
+        self.messages: dict[str, list[dict]] = defaultdict(list)
+        self._paused: set[tuple[str, str]] = set()
+        self._ids = itertools.count(1)
+        self._fail_when: Optional[Callable[[str, bytes, str], Optional[Exception]]] = None
+
+    def fail_when(self, check: Optional[Callable[[str, bytes, str], Optional[Exception]]]):
+        """Fail the publishes for which check(topic, data, ordering_key) returns an exception."""
+        self._fail_when = check
+
+    def publish(self, topic: str, data: bytes, ordering_key: str = "", **attributes) -> Future:
+        """Record the message and return an already resolved future."""
+        future = Future()
+        if ordering_key and (topic, ordering_key) in self._paused:
+            future.set_exception(RuntimeError(f"Ordering key {ordering_key} is paused for {topic}"))
+            return future
+        if self._fail_when and (error := self._fail_when(topic, data, ordering_key)):
+            if ordering_key:
+                self._paused.add((topic, ordering_key))
+            future.set_exception(error)
+            return future
+
+        message_id = str(next(self._ids))
+        self.messages[topic].append(
+            {"message_id": message_id, "data": data, "ordering_key": ordering_key, "attributes": attributes}
+        )
+        future.set_result(message_id)
+        return future
+
+    def resume_publish(self, topic: str, ordering_key: str):
+        """Accept messages with the ordering key again after a failure."""
+        self._paused.discard((topic, ordering_key))
+
+
+def create_publisher_client():
+    """Create a Pub/Sub publisher client with client side batching and message ordering from the app config."""
+    if current_app.config.get("GCP_QUEUE_IN_MEMORY"):
+        return InMemoryPublisher()
+
+    from google.cloud import pubsub_v1  # pylint: disable=import-outside-toplevel
+
+    batch_settings = pubsub_v1.types.BatchSettings(
+        max_messages=current_app.config.get("GCP_PUBLISH_MAX_MESSAGES") or 100,
+        max_bytes=current_app.config.get("GCP_PUBLISH_MAX_BYTES") or 1_000_000,
+        max_latency=current_app.config.get("GCP_PUBLISH_MAX_LATENCY") or 0.05,
+    )
+    publisher_options = pubsub_v1.types.PublisherOptions(enable_message_ordering=True)
+    credentials = getattr(queue, "credentials_pub", None)
+    return pubsub_v1.PublisherClient(
+        batch_settings=batch_settings, publisher_options=publisher_options, credentials=credentials
+    )
+
+
+def get_publisher_client():
+    """Return the batching client of the current app, created on first use."""
+    if PUBLISHER_EXTENSION not in current_app.extensions:
+        current_app.extensions[PUBLISHER_EXTENSION] = create_publisher_client()
+    return current_app.extensions[PUBLISHER_EXTENSION]
+
+
+class BatchPublisher:
+    """Publish messages without waiting for each one and collect the outcome per message."""
+
+    def __init__(self, client):
+        """Publish through the client, a PublisherClient or an InMemoryPublisher."""
+        self.client = client
+        self._pending: list[tuple[QueueMessage, Optional[Future]]] = []
+
+    def publish(self, queue_message: QueueMessage):
+        """Hand the message to the client, which sends it with the next batch."""
+        if queue_message.topic is None:
+            self._pending.append((queue_message, None))
+            return
+        kwargs = {}
+        if queue_message.ordering_key:
+            kwargs.update({"ordering_key": queue_message.ordering_key})
+        data = GcpQueue.to_queue_message(_to_cloud_event(queue_message))
+        try:
+            future = self.client.publish(queue_message.topic, data, **kwargs)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            future = Future()
+            future.set_exception(err)
+        self._pending.append((queue_message, future))
+
+    def results(self, timeout: Optional[float] = None) -> list[PublishResult]:
+        """Wait for the messages published so far and return their results in publish order.
+
+        Ordering keys paused by a failed message are resumed so the next batch can use them again.
+        """
+        if timeout is None:
+            timeout = current_app.config.get("GCP_PUBLISH_TIMEOUT")
+        results = []
+        paused = set()
+        for queue_message, future in self._pending:
+            if future is None:
+                results.append(PublishResult(queue_message, skipped=True))
+                continue
+            try:
+                results.append(PublishResult(queue_message, message_id=future.result(timeout=timeout)))
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                results.append(PublishResult(queue_message, error=err))
+                if queue_message.ordering_key:
+                    paused.add((queue_message.topic, queue_message.ordering_key))
+        self._pending = []
+
+        for topic, ordering_key in paused:
+            self.client.resume_publish(topic, ordering_key)
+        return results
+
+
+@contextmanager
+def publisher(client=None, timeout: Optional[float] = None) -> Iterator[BatchPublisher]:
+    """Yield a BatchPublisher and wait for everything published in the block on exit.
+
+    Failed messages are logged on exit, use BatchPublisher.results() inside the block to handle them instead.
+    """
+    batch = BatchPublisher(client or get_publisher_client())
+    try:
+        yield batch
+    finally:
+        _log_results(batch.results(timeout))
+
+
+def publish_many(
+    queue_messages: Iterable[QueueMessage], client=None, timeout: Optional[float] = None
+) -> list[PublishResult]:
+    """Publish the messages in batches and return one result per message, in order.
+
+    A message that fails to publish is reported in its result and does not stop the others.
+    """
+    batch = BatchPublisher(client or get_publisher_client())
+    for queue_message in queue_messages:
+        batch.publish(queue_message)
+    results = batch.results(timeout)
+    _log_results(results)
+    return results
+
+
+def _log_results(results: list[PublishResult]):
+    """Log the skipped and failed messages of a batch."""
+    if skipped := sum(1 for result in results if result.skipped):
+        current_app.logger.info("Skipping %s queue messages topic not set.", skipped)
+    for result in results:
+        if result.error is not None:
+            current_app.logger.error(
+                "Failed to publish %s to %s: %s", result.message.message_type, result.message.topic, result.error
+            )
@@ -0,0 +1,103 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Two-tier cache for BC Geocoder responses.
+
+Lookups are keyed on a canonical form of the address string, so "#101-123 Main St., Victoria, British Columbia" and
+"Unit 101 - 123 MAIN ST, VICTORIA, BC" share an entry. Responses without a usable match are cached for a shorter time.
+"""
+import re
+from typing import Callable, Optional
+
+from strr_api.services.tiered_cache import TieredCache
+
+MIN_SCORE = 95
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_NEGATIVE_TTL_SECONDS = 60 * 60
+REDIS_KEY_PREFIX = "geocode:v1:"
+
+_PROVINCE_SPELLINGS = re.compile(r"\b(?:BRITISH\s+COLUMBIA|B\s*C)\b")
+_UNIT_PREFIX = re.compile(r"(?:^|(?<=\s))(?:#|(?:UNIT|APT|APARTMENT|SUITE)\b\s*#?)\s*")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_address(address: str) -> str:
+    """Return the canonical cache key form of an address string."""
+    key = (address or "").upper().replace(".", " ")
+    key = _PROVINCE_SPELLINGS.sub("BC", key)
+    key = _UNIT_PREFIX.sub("", key)
+    key = _SPACES.sub(" ", key)
+    key = re.sub(r"\s*-\s*", "-", key)
+    parts = [part.strip() for part in key.split(",")]
+    return ", ".join(part for part in parts if part)
+
+
+def is_match(geocode_response: Optional[dict]) -> bool:
+    """Return whether the geocoder response holds a point with a score of at least MIN_SCORE."""
+    features = (geocode_response or {}).get("features") or []
+    if not features:
+        return False
+    feature = features[0]
+    score = (feature.get("properties") or {}).get("score", MIN_SCORE)
+    coordinates = (feature.get("geometry") or {}).get("coordinates") or []
+    return score >= MIN_SCORE and len(coordinates) == 2
+
+
+class GeocodeCache(TieredCache):
+    """Geocoder responses keyed by normalized address."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: int = DEFAULT_TTL_SECONDS,
+        negative_ttl: int = DEFAULT_NEGATIVE_TTL_SECONDS,
+        **kwargs,
+    ):
+        """Create an empty cache."""
+        super().__init__(
+            REDIS_KEY_PREFIX,
+            "GEOCODE_CACHE",
+            max_entries=max_entries,
+            ttl=ttl,
+            negative_ttl=negative_ttl,
+            is_positive=is_match,
+            **kwargs,
+        )
+
+    def get_or_fetch(self, address: str, fetch: Callable[[str], Optional[dict]]) -> Optional[dict]:
+        """Return the cached geocode response for the address, calling fetch(address) on a miss."""
+        return super().get_or_fetch(normalize_address(address), lambda: fetch(address))
+
+
+geocode_cache = GeocodeCache()
@@ -34,9 +34,11 @@
 """Uses BC Gov Geocoder service to fetch latitude and longitude."""
 from urllib.parse import quote
 
-import requests
 from flask import current_app
 
+from strr_api.services.geocode_cache import geocode_cache
+from strr_api.services.http_client import http_client
+
 
 class GeoCoderService:
     """
@@ -47,6 +49,11 @@ class GeoCoderService:
     @classmethod
     def get_geocode_by_address(cls, address):
         """Get geocode (latitude, longitude) by address"""
+        return geocode_cache.get_or_fetch(address, cls._fetch_geocode)
+
+    @classmethod
+    def _fetch_geocode(cls, address):
+        """Call the geocoder; returns None when the call failed so that nothing is cached."""
         svc_url = current_app.config.get("GEOCODER_SVC_URL")
         svc_key = current_app.config.get("GEOCODER_SVC_AUTH_KEY")
         timeout = current_app.config.get("GEOCODER_API_TIMEOUT", 20)
@@ -72,9 +79,8 @@ class GeoCoderService:
             "provinceCode=BC"
         )
 
-        geocode_response = requests.get(url=url, headers=headers, timeout=timeout).json()
-
-        try:
-            return geocode_response
-        except Exception:
+        response = http_client.get(url, service="geocoder", headers=headers, timeout=timeout)
+        if not response.ok:
+            current_app.logger.error(f"Geocoder call failed with status {response.status_code}")
             return None
+        return response.json()
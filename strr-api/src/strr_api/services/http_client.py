@@ -0,0 +1,239 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Shared, connection-pooled HTTP client for outbound service calls.
+
+Every outbound integration goes through one HttpClient so that TCP/TLS connections are kept alive and reused per
+host instead of being opened for each call. Each named service gets its own timeout and retry policy, and the client
+keeps per-host latency, failure and connection-reuse counters.
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from flask import Flask
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+DEFAULT_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+@dataclass(frozen=True)
+class ServicePolicy:
+    """Timeout and retry settings for one outbound service."""
+
+    timeout: float = 20
+    retries: int = 0
+    backoff_factor: float = 0.5
+    status_forcelist: Tuple[int, ...] = RETRY_STATUSES
+    # Only idempotent methods are retried on a bad status; connection errors are retried for every method.
+    allowed_methods: frozenset = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+    def to_retry(self) -> Retry:
+        """Return the urllib3 retry configuration for this policy."""
+        return Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=0,
+            status=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.status_forcelist,
+            allowed_methods=self.allowed_methods,
+            raise_on_status=False,
+        )
+
+
+SERVICE_POLICIES: Dict[str, ServicePolicy] = {
+    "default": ServicePolicy(timeout=60),
+    "rest_retry": ServicePolicy(timeout=60, retries=5, backoff_factor=1),
+    "auth": ServicePolicy(timeout=20, retries=2),
+    "token": ServicePolicy(timeout=20, retries=2),
+    "geocoder": ServicePolicy(timeout=20, retries=3),
+    "data_portal": ServicePolicy(timeout=20, retries=3),
+    "ltsa": ServicePolicy(timeout=20, retries=2),
+    "pay": ServicePolicy(timeout=20, retries=1),
+    "notify": ServicePolicy(timeout=20, retries=1),
+}
+
+
+@dataclass
+class HostMetrics:
+    """Counters for the calls made to one host."""
+
+    requests: int = 0
+    failures: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    status_codes: Dict[int, int] = field(default_factory=dict)
+    # Latest (requests, connections) counts of each urllib3 pool serving this host, keyed by pool id.
+    pools: Dict[int, Tuple[int, int]] = field(default_factory=dict)
+
+    @property
+    def pool_requests(self) -> int:
+        """Requests sent over the pooled connections of this host."""
+        return sum(requests_sent for requests_sent, _ in self.pools.values())
+
+    @property
+    def connections_opened(self) -> int:
+        """New connections opened to this host."""
+        return sum(opened for _, opened in self.pools.values())
+
+    def to_dict(self) -> dict:
+        """Return the counters with derived averages."""
+        reuse_ratio = 1 - (self.connections_opened / self.pool_requests) if self.pool_requests else 0.0
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "avgLatencyMs": round(1000 * self.total_latency / self.requests, 2) if self.requests else 0.0,
+            "maxLatencyMs": round(1000 * self.max_latency, 2),
+            "connectionsOpened": self.connections_opened,
+            "reuseRatio": round(max(reuse_ratio, 0.0), 4),
+            "statusCodes": dict(self.status_codes),
+        }
+
+
+class HttpClient:
+    """Keep-alive HTTP client with one pooled session per service policy."""
+
+    def __init__(self, pool_connections: int = DEFAULT_POOL_CONNECTIONS, pool_maxsize: int = DEFAULT_POOL_MAXSIZE):
+        """Create a client; sessions are built lazily on first use of each service."""
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.policies: Dict[str, ServicePolicy] = dict(SERVICE_POLICIES)
+        self._sessions: Dict[str, Tuple[requests.Session, HTTPAdapter]] = {}
+        self._metrics: Dict[str, HostMetrics] = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app: Flask):
+        """Apply pool sizes and service timeouts from the app config."""
+        self.configure(
+            pool_connections=int(app.config.get("HTTP_POOL_CONNECTIONS", self.pool_connections)),
+            pool_maxsize=int(app.config.get("HTTP_POOL_MAXSIZE", self.pool_maxsize)),
+        )
+
+    def configure(self, pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None, **policies):
+        """Change pool sizes and/or service policies; existing sessions are rebuilt on next use."""
+        with self._lock:
+            if pool_connections:
+                self.pool_connections = pool_connections
+            if pool_maxsize:
+                self.pool_maxsize = pool_maxsize
+            self.policies.update(policies)
+            self._close_sessions()
+
+    def policy(self, service: str) -> ServicePolicy:
+        """Return the policy for the service, falling back to the default."""
+        return self.policies.get(service) or self.policies["default"]
+
+    def _session(self, service: str) -> Tuple[requests.Session, HTTPAdapter]:
+        if entry := self._sessions.get(service):
+            return entry
+        with self._lock:
+            if entry := self._sessions.get(service):
+                return entry
+            adapter = HTTPAdapter(
+                pool_connections=self.pool_connections,
+                pool_maxsize=self.pool_maxsize,
+                max_retries=self.policy(service).to_retry(),
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._sessions[service] = (session, adapter)
+            return session, adapter
+
+    def request(self, method: str, url: str, service: str = "default", **kwargs) -> requests.Response:
+        """Send a request through the pooled session of the service."""
+        session, adapter = self._session(service)
+        kwargs.setdefault("timeout", self.policy(service).timeout)
+        parts = urlsplit(url)
+        host = parts.netloc
+        start = time.perf_counter()
+        response = None
+        try:
+            response = session.request(method.upper(), url, **kwargs)
+            return response
+        finally:
+            self._record(host, parts.hostname, adapter, time.perf_counter() - start, response)
+
+    def get(self, url: str, service: str = "default", **kwargs) -> requests.Response:
+        """Send a GET request."""
+        return self.request("GET", url, service=service, **kwargs)
+
+    def post(self, url: str, service: str = "default", **kwargs) -> requests.Response:
+        """Send a POST request."""
+        return self.request("POST", url, service=service, **kwargs)
+
+    @staticmethod
+    def _pools_for(adapter: HTTPAdapter, hostname: str) -> list:
+        pools = adapter.poolmanager.pools
+        return [pool for key in pools.keys() if (pool := pools.get(key)) is not None and key.key_host == hostname]
+
+    def _record(self, host: str, hostname: str, adapter: HTTPAdapter, elapsed: float, response):
+        pools = self._pools_for(adapter, hostname)
+        with self._lock:
+            metrics = self._metrics.setdefault(host, HostMetrics())
+            metrics.requests += 1
+            metrics.total_latency += elapsed
+            metrics.max_latency = max(metrics.max_latency, elapsed)
+            if response is None or response.status_code >= 500:
+                metrics.failures += 1
+            if response is not None:
+                metrics.status_codes[response.status_code] = metrics.status_codes.get(response.status_code, 0) + 1
+            for pool in pools:
+                metrics.pools[id(pool)] = (pool.num_requests, pool.num_connections)
+
+    def metrics(self) -> Dict[str, dict]:
+        """Return a snapshot of the per-host counters."""
+        with self._lock:
+            return {host: metrics.to_dict() for host, metrics in self._metrics.items()}
+
+    def reset_metrics(self):
+        """Clear the per-host counters."""
+        with self._lock:
+            self._metrics = {}
+
+    def _close_sessions(self):
+        for session, _ in self._sessions.values():
+            session.close()
+        self._sessions = {}
+
+
+http_client = HttpClient()
@@ -36,7 +36,6 @@ from dataclasses import dataclass
 from http import HTTPStatus
 from typing import overload
 
-import requests
 from flask import current_app, jsonify
 
 from strr_api.enums.enum import ChannelType, InteractionStatus
@@ -44,6 +43,7 @@ from strr_api.exceptions import ExternalServiceException, ValidationException
 from strr_api.models import CustomerInteraction, Events
 from strr_api.services import AuthService
 from strr_api.services.events_service import EventsService
+from strr_api.services.http_client import http_client
 from strr_api.utils.validate_calls import validate_mutex
 
 
@@ -171,8 +171,9 @@ class InteractionService:
     def _send_email_to_notify_service(email_info):
         token = AuthService.get_service_client_token()
         try:
-            resp = requests.post(
+            resp = http_client.post(
                 current_app.config["NOTIFY_SVC_URL"],
+                service="notify",
                 json=email_info.email,
                 headers={
                     "Content-Type": "application/json",
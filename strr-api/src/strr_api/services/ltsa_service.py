@@ -32,11 +32,11 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 """Uses Registries LTSA wrapper service to fetch title for a PID."""
-import requests
 from flask import current_app
 
 from strr_api.models import LTSARecord
 from strr_api.responses import LtsaResponse, TitleSummaries
+from strr_api.services.http_client import http_client
 
 
 class LtsaService:
@@ -54,8 +54,9 @@ class LtsaService:
             "x-apikey": svc_key,
             "Content-Type": "application/json",
         }
-        title_summaries = requests.get(
-            url=svc_url + f"/titledirect/search/api/titleSummaries?filter=parcelIdentifier:{pid}",
+        title_summaries = http_client.get(
+            svc_url + f"/titledirect/search/api/titleSummaries?filter=parcelIdentifier:{pid}",
+            service="ltsa",
             headers=headers,
             timeout=timeout,
         ).json()
@@ -84,8 +85,8 @@ class LtsaService:
                     "productOrderParameters": {"titleNumber": title_number},
                 }
             }
-            title_order = requests.post(
-                url=f"{svc_url}/titledirect/search/api/orders", headers=headers, json=data, timeout=timeout
+            title_order = http_client.post(
+                f"{svc_url}/titledirect/search/api/orders", service="ltsa", headers=headers, json=data, timeout=timeout
             ).json()
             try:
                 return title_order
@@ -34,7 +34,6 @@
 """Manages filing type codes and payment service interactions."""
 from http import HTTPStatus
 
-import requests
 from flask import Flask
 from flask_jwt_oidc import JwtManager
 
@@ -42,6 +41,7 @@ from strr_api.enums.enum import PropertyType, RegistrationType
 from strr_api.exceptions import ExternalServiceException
 from strr_api.models import Application, Events, RentalProperty
 from strr_api.services.events_service import EventsService
+from strr_api.services.http_client import http_client
 from strr_api.services.user_service import UserService
 from strr_api.utils.date_util import DateUtil
 
@@ -106,8 +106,8 @@ class PayService:
                 "Content-Type": "application/json",
                 "Account-Id": str(account_id),
             }
-            resp = requests.post(
-                url=self.svc_url + "/payment-requests", json=payload, headers=headers, timeout=self.timeout
+            resp = http_client.post(
+                self.svc_url + "/payment-requests", service="pay", json=payload, headers=headers, timeout=self.timeout
             )
 
             if resp.status_code not in [HTTPStatus.OK, HTTPStatus.CREATED] or not (resp.json()).get("id", None):
@@ -239,8 +239,8 @@ class PayService:
             "Content-Type": "application/json",
             "Account-Id": str(account_id),
         }
-        payment_details = requests.get(
-            url=self.svc_url + f"/payment-requests/{invoice_id}", headers=headers, timeout=self.timeout
+        payment_details = http_client.get(
+            self.svc_url + f"/payment-requests/{invoice_id}", service="pay", headers=headers, timeout=self.timeout
         ).json()
         return payment_details
 
@@ -258,8 +258,9 @@ class PayService:
             "effectiveDateTime": "",
             "filingIdentifier": str(application.id),
         }
-        response = requests.post(
+        response = http_client.post(
             url,
+            service="pay",
             json=payload,
             headers=headers,
         )
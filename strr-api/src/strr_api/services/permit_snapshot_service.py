@@ -0,0 +1,151 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Compact permit snapshots for permit validation, cached in the shared tiered cache.
+
+A snapshot holds only what the permit checks read: status, expiry and the address match keys. The real-time
+validatePermit path and the batch validator answer from the cache, so a hit needs no database read. The
+registration mutations that change any of these fields refresh the snapshot; the expiry job drops it.
+"""
+from typing import Iterable, Optional
+
+from strr_api.enums.enum import RegistrationStatus, RegistrationType
+from strr_api.models.unit_of_work import after_commit
+from strr_api.services.tiered_cache import TieredCache
+from strr_api.utils.date_util import DateUtil
+
+SNAPSHOT_VERSION = 2
+REDIS_KEY_PREFIX = f"permit:v{SNAPSHOT_VERSION}:"
+NOT_FOUND = {"found": False}
+
+permit_cache = TieredCache(
+    REDIS_KEY_PREFIX,
+    "PERMIT_CACHE",
+    ttl=6 * 60 * 60,
+    negative_ttl=60,
+    memory_ttl=30,
+    is_positive=lambda snapshot: snapshot.get("found", True),
+)
+
+
+def build_permit_snapshot(registration) -> dict:
+    """Return the permit snapshot for a registration."""
+    status = registration.status
+    if not isinstance(status, RegistrationStatus):
+        status = RegistrationStatus(status)
+    snapshot = {
+        "registrationNumber": registration.registration_number,
+        "registrationType": registration.registration_type,
+        "status": status.name,
+        "validUntil": (
+            DateUtil.as_legislation_timezone(registration.expiry_date).strftime("%Y-%m-%d")
+            if registration.expiry_date
+            else None
+        ),
+    }
+    if status != RegistrationStatus.ACTIVE:
+        return snapshot
+
+    if registration.registration_type == RegistrationType.HOST.value:
+        address = registration.rental_property.address
+        keys = address.match_keys()
+        # the street number is only checked when the permit has one of its own
+        snapshot["streetNumber"] = keys["match_street_number"] if address.street_number else None
+        snapshot["postalCode"] = keys["match_postal_code"]
+        snapshot["unitNumber"] = keys["match_unit_number"]
+    elif registration.registration_type == RegistrationType.STRATA_HOTEL.value:
+        strata_hotel = registration.strata_hotel_registration.strata_hotel
+        addresses = [strata_hotel.location, *(building.address for building in strata_hotel.buildings)]
+        snapshot["addresses"] = [
+            {"streetNumber": keys["match_street_number"], "postalPrefix": keys["match_postal_prefix"]}
+            for keys in (address.match_keys() for address in addresses)
+        ]
+    return snapshot
+
+
+class PermitSnapshotService:
+    """Cached permit snapshot lookups, keyed by registration number."""
+
+    @classmethod
+    def get_snapshot(cls, registration_number: str) -> Optional[dict]:
+        """Return the permit snapshot, or None when there is no registration with the number."""
+        snapshot = permit_cache.get_or_fetch(registration_number, lambda: cls._load(registration_number))
+        return snapshot if snapshot.get("found", True) else None
+
+    @classmethod
+    def get_snapshots(cls, registration_numbers: Iterable[str]) -> dict:
+        """Return the permit snapshots keyed by registration number; numbers with no registration are left out.
+
+        Cached snapshots are read in one pass over both tiers and the rest are loaded in batched queries.
+        """
+        from strr_api.services.registration_service import (  # pylint: disable=import-outside-toplevel
+            RegistrationService,
+        )
+
+        registration_numbers = list(
+            dict.fromkeys(number for number in registration_numbers if number and isinstance(number, str))
+        )
+        snapshots = permit_cache.get_many(registration_numbers)
+        if missing := [number for number in registration_numbers if number not in snapshots]:
+            registrations = RegistrationService.find_by_registration_numbers(missing)
+            for number in missing:
+                registration = registrations.get(number)
+                snapshot = build_permit_snapshot(registration) if registration else dict(NOT_FOUND)
+                permit_cache.set(number, snapshot)
+                snapshots[number] = snapshot
+        return {number: snapshot for number, snapshot in snapshots.items() if snapshot.get("found", True)}
+
+    @classmethod
+    def refresh(cls, registration):
+        """Replace the cached snapshot after the registration has been saved, once the unit of work commits."""
+
+        def refresh_snapshot():
+            if registration.registration_number:
+                permit_cache.set(registration.registration_number, build_permit_snapshot(registration))
+
+        after_commit(refresh_snapshot)
+
+    @classmethod
+    def invalidate(cls, registration_number: str):
+        """Drop the cached snapshot once the unit of work commits; the next lookup reloads it."""
+        if registration_number:
+            after_commit(lambda: permit_cache.delete(registration_number))
+
+    @classmethod
+    def _load(cls, registration_number: str) -> dict:
+        from strr_api.services.registration_service import (  # pylint: disable=import-outside-toplevel
+            RegistrationService,
+        )
+
+        registration = RegistrationService.find_by_registration_number(registration_number)
+        return build_permit_snapshot(registration) if registration else dict(NOT_FOUND)
@@ -38,14 +38,14 @@
 # pylint: disable=R0904
 """Manages registration model interactions."""
 import logging
-import random
 import traceback
 from datetime import date, datetime, time, timedelta, timezone
 
 import pytz
 from dateutil.relativedelta import relativedelta
-from flask import current_app, render_template
-from weasyprint import HTML
+from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
 
 from strr_api.enums.enum import (
     ApplicationType,
@@ -77,12 +77,16 @@ from strr_api.models import (
     StrataHotelRegistration,
     StrataHotelRepresentative,
     User,
+    db,
 )
 from strr_api.models.dataclass import RegistrationSearch
+from strr_api.models.unit_of_work import unit_of_work
 from strr_api.requests import RegistrationRequest
 from strr_api.responses import RegistrationSerializer
+from strr_api.services.certificate_service import CertificateService
 from strr_api.services.email_service import EmailService
 from strr_api.services.events_service import EventsService
+from strr_api.services.permit_snapshot_service import PermitSnapshotService
 from strr_api.services.snapshot_service import SnapshotService
 from strr_api.services.user_service import UserService
 
@@ -194,6 +198,7 @@ class RegistrationService:
             registration.strata_hotel_registration = cls._create_strata_hotel_registration(registration_request)
         registration.registration_json = cls._enrich_registration_json(registration_details, registration)
         registration.save()
+        PermitSnapshotService.refresh(registration)
         return registration
 
     @classmethod
@@ -240,6 +245,7 @@ class RegistrationService:
 
         registration.registration_json = cls._enrich_registration_json(registration_details, registration)
         registration.save()
+        PermitSnapshotService.refresh(registration)
         return registration
 
     @classmethod
@@ -602,9 +608,7 @@ class RegistrationService:
         query = query.order_by(sort_column.desc() if sort_desc else sort_column.asc())
         paginated_result = query.paginate(per_page=limit, page=offset)
 
-        search_results = []
-        for registration in paginated_result.items:
-            search_results.append(RegistrationService.serialize(registration))
+        search_results = RegistrationService.serialize_all(paginated_result.items)
 
         return {
             "page": offset,
@@ -630,11 +634,7 @@ class RegistrationService:
             registration_code = "PL"
         elif registration_type == RegistrationType.STRATA_HOTEL.value:
             registration_code = "ST"
-        while True:
-            random_digits = "".join(random.choices("0123456789", k=9))
-            registration_number = f"{registration_code}{random_digits}"
-            if Registration.query.filter(Registration.registration_number == registration_number).one_or_none() is None:
-                return registration_number
+        return Registration.allocate_registration_number(registration_code)
 
     @classmethod
     def get_registration(cls, account_id, registration_id):
@@ -655,6 +655,31 @@ class RegistrationService:
         """Get registration by registration number."""
         return Registration.query.filter_by(registration_number=registration_number).one_or_none()
 
+    @classmethod
+    def find_by_registration_numbers(cls, registration_numbers, batch_size: int = 1000) -> dict:
+        """Get registrations by registration number, keyed by registration number.
+
+        The addresses used for permit validation (rental unit address, strata hotel location and buildings) are
+        loaded eagerly, so the whole map takes a handful of queries per batch and validating against it takes none.
+        """
+        registration_numbers = list(
+            dict.fromkeys(number for number in registration_numbers if number and isinstance(number, str))
+        )
+        strata_hotel = selectinload(Registration.strata_hotel_registration).selectinload(
+            StrataHotelRegistration.strata_hotel
+        )
+        registrations = {}
+        for start in range(0, len(registration_numbers), batch_size):
+            query = Registration.query.filter(
+                Registration.registration_number.in_(registration_numbers[start : start + batch_size])
+            ).options(
+                selectinload(Registration.rental_property).selectinload(RentalProperty.address),
+                strata_hotel.selectinload(StrataHotel.location),
+                strata_hotel.selectinload(StrataHotel.buildings).selectinload(StrataHotelBuilding.address),
+            )
+            registrations.update((registration.registration_number, registration) for registration in query)
+        return registrations
+
     @classmethod
     def is_registration_valid(cls, registration_number) -> bool:
         """Returns whether a registration number is valid."""
@@ -666,46 +691,22 @@ class RegistrationService:
 
     @classmethod
     def generate_registration_certificate(cls, registration: Registration):
-        """Generate registration PDF certificate."""
+        """Generate registration PDF certificate for the current registration version."""
         user = UserService.get_or_create_user_in_context()
-        issued_date = datetime.now(timezone.utc)
-        primary_property_contact = list(filter(lambda x: x.is_primary is True, registration.rental_property.contacts))[
-            0
-        ]
-        data = {
-            "registration_number": f"{registration.registration_number}",
-            "creation_date": f'{registration.start_date.strftime("%B %d, %Y")}',
-            "expiry_date": f'{registration.expiry_date.strftime("%B %d, %Y")}',
-            "issued_date": f'{issued_date.strftime("%B %d, %Y")}',
-            "rental_address": registration.rental_property.address.to_oneline_address(),
-            "rental_type": registration.rental_property.property_type.value,
-            "registrant": primary_property_contact.contact.full_name(),
-            "host": primary_property_contact.contact.full_name(),
-        }
-        rendered_template = render_template("certificate.html", **data)
-        pdf_binary = HTML(string=rendered_template).render().write_pdf()
+        return CertificateService.generate_certificate(registration, issuer_id=user.id if user else None)
 
-        certificate = Certificate(
-            registration_id=registration.id,
-            issued_date=issued_date,
-            issuer_id=user.id if user else None,
-            certificate=pdf_binary,
-        )
-
-        certificate.save()
-
-        EventsService.save_event(
-            event_type=Events.EventType.REGISTRATION,
-            event_name=Events.EventName.CERTIFICATE_ISSUED,
-            registration_id=registration.id,
-            visible_to_applicant=True,
-        )
-        return certificate
+    @classmethod
+    def request_registration_certificate(cls, registration: Registration):
+        """Queue the PDF certificate of the current registration version for the renderer."""
+        user = UserService.get_or_create_user_in_context()
+        return CertificateService.request_certificate(registration, issuer_id=user.id if user else None)
 
     @classmethod
     def get_latest_certificate(cls, registration: Registration):
         """Get latest PDF certificate for a given registration."""
-        query = Certificate.query.filter(Certificate.registration_id == registration.id)
+        query = Certificate.query.filter(
+            Certificate.registration_id == registration.id, Certificate.status == Certificate.Status.COMPLETED
+        )
         return query.order_by(Certificate.issued_date.desc()).limit(1).one_or_none()
 
     @classmethod
@@ -714,6 +715,12 @@ class RegistrationService:
         return RegistrationSerializer.serialize(registration=registration)
 
     @classmethod
+    def serialize_all(cls, registrations: list[Registration]) -> list[dict]:
+        """Returns the JSON for a page of registrations."""
+        return RegistrationSerializer.serialize_all(registrations)
+
+    @classmethod
+    @unit_of_work()
     def update_registration_status(
         cls, registration: Registration, json_input: dict, reviewer: User = None
     ) -> Registration:
@@ -743,6 +750,7 @@ class RegistrationService:
             registration.cancelled_date = datetime.now(timezone.utc)
         registration.decider_id = reviewer.id
         registration.save()
+        PermitSnapshotService.refresh(registration)
 
         reviewer_id = reviewer.id if reviewer else None
         if status == RegistrationStatus.ACTIVE.value:
@@ -820,6 +828,24 @@ class RegistrationService:
             return query.count()
         return query.all()
 
+    @staticmethod
+    def count_by_host_sins(sins) -> dict[str, int]:
+        """Return the find_all_by_host_sin counts for several host SINs in one grouped query."""
+        rows = (
+            db.session.query(Contact.social_insurance_number, func.count(Registration.id))
+            .select_from(Registration)
+            .join(RentalProperty)
+            .join(PropertyContact)
+            .join(Contact)
+            .filter(Registration.status.in_([RegistrationStatus.ACTIVE, RegistrationStatus.SUSPENDED]))
+            .filter(PropertyContact.is_primary)
+            .filter(PropertyContact.contact_type == PropertyContact.ContactType.INDIVIDUAL)
+            .filter(Contact.social_insurance_number.in_(list(sins)))
+            .group_by(Contact.social_insurance_number)
+            .all()
+        )
+        return dict(rows)
+
     @staticmethod
     def update_host_unit_address(registration: Registration, unit_address: dict, user: User) -> Registration:
         """Updates the rental unit address for a registration."""
@@ -868,6 +894,7 @@ class RegistrationService:
             if not jurisdiction_provided:
                 RegistrationService._update_jurisdiction_for_address(registration)
             registration.save()
+            PermitSnapshotService.refresh(registration)
             EventsService.save_event(
                 event_type=Events.EventType.REGISTRATION,
                 event_name=Events.EventName.HOST_REGISTRATION_UNIT_ADDRESS_UPDATED,
@@ -882,16 +909,20 @@ class RegistrationService:
     def _update_jurisdiction_for_address(registration: Registration):
         """Update the jurisdiction for a registration based on its current address."""
         try:
-            from strr_api.services.approval_service import ApprovalService  # pylint: disable=import-outside-toplevel
+            from strr_api.services.str_requirements_service import (  # pylint: disable=import-outside-toplevel
+                StrRequirementsService,
+            )
 
             address_obj = registration.rental_property.address
-            address_line_1 = ""
-            if address_obj.unit_number:
-                address_line_1 = f"{address_obj.unit_number}-"
-            address_line_1 = f"{address_line_1}{address_obj.street_number} {address_obj.street_address}"
-            address = f"{address_line_1}, {address_obj.city}, {address_obj.province}"
+            address = StrRequirementsService.format_address(
+                address_obj.street_number,
+                address_obj.street_address,
+                address_obj.city,
+                address_obj.province,
+                unit_number=address_obj.unit_number,
+            )
 
-            organization = ApprovalService.getSTRDataForAddress(address)
+            organization = StrRequirementsService.get_requirements(address)
             if (
                 organization
                 and organization.get("organizationNm") is not None
@@ -958,6 +989,7 @@ class RegistrationService:
         else:
             registration.status = RegistrationStatus.ACTIVE
         registration.save()
+        PermitSnapshotService.refresh(registration)
         return registration
 
     @staticmethod
@@ -965,6 +997,7 @@ class RegistrationService:
         """Sets aside the decision for a registration."""
         registration.is_set_aside = True
         registration.save()
+        PermitSnapshotService.refresh(registration)
 
         EventsService.save_event(
             event_type=Events.EventType.REGISTRATION,
@@ -1064,9 +1097,7 @@ class RegistrationService:
     def search_registrations(filter_criteria: RegistrationSearch) -> dict:
         """List all registrations matching the search criteria."""
         paginated_result = Registration.search_registrations(filter_criteria)
-        search_results = []
-        for item in paginated_result.items:
-            search_results.append(RegistrationService.serialize(item))
+        search_results = RegistrationService.serialize_all(paginated_result.items)
 
         return {
             "page": filter_criteria.page,
@@ -17,24 +17,19 @@ import json
 from collections.abc import Iterable
 from typing import Dict
 
-import requests
 from flask import current_app, request
-from requests.adapters import HTTPAdapter  # pylint:disable=ungrouped-imports
 
 # pylint:disable=ungrouped-imports
 from requests.exceptions import ConnectionError as ReqConnectionError
 from requests.exceptions import ConnectTimeout, HTTPError
-from urllib3.util.retry import Retry
 
 from strr_api.exceptions import ExternalServiceException
+from strr_api.services.http_client import http_client
 
 BEARER = "Bearer"
 CONTENT_TYPE_JSON = "application/json"
 
 
-RETRY_ADAPTER = HTTPAdapter(max_retries=Retry(total=5, backoff_factor=1, status_forcelist=[404]))
-
-
 class RestService:
     """Service to invoke Rest services which uses OAuth 2.0 implementation."""
 
@@ -65,8 +60,8 @@ class RestService:
         current_app.logger.debug(f"headers : {headers}")
         response = None
         try:
-            invoke_rest_method = getattr(requests, rest_method)
-            response = invoke_rest_method(
+            response = http_client.request(
+                rest_method,
                 endpoint,
                 data=data,
                 headers=headers,
@@ -206,23 +201,28 @@ class RestService:
         retry_on_failure: bool = False,
         additional_headers: Dict = None,
         skip_404_logging: bool = False,
+        service: str = None,
     ):  # pylint: disable=too-many-arguments
-        """GET service."""
+        """GET service.
+
+        Requests go through the pooled http client; service selects its retry policy, and retry_on_failure
+        retries connection errors, 429 and 5xx responses when no service is given.
+        """
         current_app.logger.debug("<GET")
 
         headers = RestService._generate_headers(content_type, additional_headers, token, auth_header_type)
 
         current_app.logger.debug(f"Endpoint : {endpoint}")
         current_app.logger.debug(f"headers : {headers}")
-        session = requests.Session()
-        if retry_on_failure:
-            session.mount(endpoint, RETRY_ADAPTER)
+        if not service:
+            service = "rest_retry" if retry_on_failure else "default"
         response = None
         try:
-            response = session.get(
+            response = http_client.get(
                 endpoint,
+                service=service,
                 headers=headers,
-                timeout=current_app.config.get("CONNECT_TIMEOUT", 60),
+                timeout=current_app.config.get("CONNECT_TIMEOUT", http_client.policy(service).timeout),
             )
             response.raise_for_status()
         except (ReqConnectionError, ConnectTimeout) as exc:
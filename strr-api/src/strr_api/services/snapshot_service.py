@@ -33,11 +33,36 @@
 # POSSIBILITY OF SUCH DAMAGE.
 # pylint: disable=C0415
 
-"""Snapshot service that helps take registration snapshots when required."""
+"""Snapshot service that helps take registration snapshots when required.
+
+A snapshot is written as a keyframe, the full serialized registration, every SNAPSHOT_KEYFRAME_INTERVAL versions and
+as a JSON patch from the previous version otherwise, so a renewal only stores what changed. Large keyframes are
+compressed by Postgres (TOAST) on disk.
+"""
 from datetime import datetime
 from typing import Optional
 
+from flask import current_app
+from sqlalchemy.orm import undefer
+
 from strr_api.models import Registration, RegistrationSnapshot
+from strr_api.utils.json_patch import apply_patch, make_patch
+
+KEYFRAME_INTERVAL = 10
+
+
+def _keyframe_interval() -> int:
+    return current_app.config.get("SNAPSHOT_KEYFRAME_INTERVAL") or KEYFRAME_INTERVAL
+
+
+def _rebuild(chain: list[RegistrationSnapshot]) -> Optional[dict]:
+    """Returns the document of the last snapshot of a chain that starts at a keyframe."""
+    if not chain:
+        return None
+    document = chain[0].snapshot_data
+    for snapshot in chain[1:]:
+        document = apply_patch(document, snapshot.snapshot_patch)
+    return document
 
 
 class SnapshotService:
@@ -48,19 +73,74 @@ class SnapshotService:
         """Creates registration snapshots."""
         from strr_api.services.registration_service import RegistrationService
 
+        document = RegistrationService.serialize(registration=registration)
+        chain = RegistrationSnapshot.find_chain(registration.id)
+
         registration_snapshot = RegistrationSnapshot()
         registration_snapshot.registration_id = registration.id
         registration_snapshot.snapshot_datetime = datetime.utcnow()
-        registration_snapshot.snapshot_data = RegistrationService.serialize(registration=registration)
-        latest_snapshot = RegistrationSnapshot.find_latest_snapshot(registration.id)
-        registration_snapshot.version = (latest_snapshot.version + 1) if latest_snapshot else 1
+        registration_snapshot.version = (chain[-1].version + 1) if chain else 1
+        if not chain or registration_snapshot.version - chain[0].version >= _keyframe_interval():
+            registration_snapshot.is_keyframe = True
+            registration_snapshot.snapshot_data = document
+        else:
+            registration_snapshot.is_keyframe = False
+            registration_snapshot.snapshot_patch = make_patch(_rebuild(chain), document)
         registration_snapshot.save()
         return registration_snapshot
 
     @staticmethod
     def get_snapshot(registration_id: int, snapshot_id: int) -> Optional[RegistrationSnapshot]:
-        """Fetch a snapshot belonging to a registration."""
-        return RegistrationSnapshot.query.filter_by(registration_id=registration_id, id=snapshot_id).one_or_none()
+        """Fetch a snapshot belonging to a registration, with its payload."""
+        return (
+            RegistrationSnapshot.query.options(
+                undefer(RegistrationSnapshot.snapshot_data), undefer(RegistrationSnapshot.snapshot_patch)
+            )
+            .filter_by(registration_id=registration_id, id=snapshot_id)
+            .one_or_none()
+        )
+
+    @staticmethod
+    def get_snapshot_data(snapshot: RegistrationSnapshot) -> dict:
+        """Returns the serialized registration of the snapshot, rebuilt from its keyframe when it is a delta."""
+        if snapshot.is_keyframe:
+            return snapshot.snapshot_data
+        return _rebuild(RegistrationSnapshot.find_chain(snapshot.registration_id, snapshot.version))
+
+    @staticmethod
+    def compact_snapshots(registration_id: int) -> int:
+        """Rewrite full snapshots of a registration as deltas where a keyframe is not due and return how many.
+
+        Snapshots written before deltas existed are all keyframes; this keeps one every SNAPSHOT_KEYFRAME_INTERVAL
+        versions. Snapshots that are already deltas are left as they are, so running it again changes nothing.
+        """
+        snapshots = (
+            RegistrationSnapshot.query.options(
+                undefer(RegistrationSnapshot.snapshot_data), undefer(RegistrationSnapshot.snapshot_patch)
+            )
+            .filter_by(registration_id=registration_id)
+            .order_by(RegistrationSnapshot.version)
+            .all()
+        )
+        interval = _keyframe_interval()
+        compacted = 0
+        keyframe_version = None
+        previous = None
+        for snapshot in snapshots:
+            if snapshot.is_keyframe:
+                document = snapshot.snapshot_data
+                if keyframe_version is not None and snapshot.version - keyframe_version < interval:
+                    snapshot.is_keyframe = False
+                    snapshot.snapshot_patch = make_patch(previous, document)
+                    snapshot.snapshot_data = None
+                    compacted += 1
+                else:
+                    keyframe_version = snapshot.version
+            else:
+                document = apply_patch(previous, snapshot.snapshot_patch)
+            previous = document
+        RegistrationSnapshot.commit()
+        return compacted
 
     @staticmethod
     def serialize(snapshot: RegistrationSnapshot) -> dict:
@@ -70,5 +150,5 @@ class SnapshotService:
             "registrationId": snapshot.registration_id,
             "version": snapshot.version,
             "snapshotDateTime": snapshot.snapshot_datetime.isoformat() if snapshot.snapshot_datetime else None,
-            "snapshotData": snapshot.snapshot_data,
+            "snapshotData": SnapshotService.get_snapshot_data(snapshot),
         }
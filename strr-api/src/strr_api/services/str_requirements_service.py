@@ -0,0 +1,103 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Resolves the STR requirements (jurisdiction, principal residence, business licence, exemption) for an address.
+
+This is the one path from an address to its requirements. Results are memoized per request (flask.g), per process
+(bounded LRU) and across processes (Redis), all keyed on the normalized address.
+"""
+from typing import Optional
+
+from flask import g, has_request_context
+
+from strr_api.services.geocode_cache import normalize_address
+from strr_api.services.tiered_cache import TieredCache
+
+REDIS_KEY_PREFIX = "str-requirements:v1:"
+
+str_requirements_cache = TieredCache(REDIS_KEY_PREFIX, "STR_REQUIREMENTS_CACHE", ttl=60 * 60)
+
+
+class StrRequirementsService:
+    """Address to STR requirements resolution."""
+
+    @staticmethod
+    def format_address(
+        street_number, street_name, city, province, unit_number=None, address_line_2: Optional[str] = None
+    ) -> str:
+        """Return the single line address sent to the geocoder."""
+        address_line_1 = f"{unit_number}-" if unit_number else ""
+        address_line_1 = f"{address_line_1}{street_number} {street_name}"
+        if address_line_2:
+            address_line_1 = f"{address_line_1} {address_line_2}"
+        return f"{address_line_1}, {city}, {province}"
+
+    @classmethod
+    def format_unit_address(cls, unit_address: dict) -> str:
+        """Return the single line address for a rental_unit_address style dict."""
+        return cls.format_address(
+            unit_address.get("streetNumber"),
+            unit_address.get("streetName"),
+            unit_address.get("city"),
+            unit_address.get("province"),
+            unit_number=unit_address.get("unitNumber"),
+            address_line_2=unit_address.get("addressLineTwo"),
+        )
+
+    @classmethod
+    def get_requirements(cls, address: str) -> Optional[dict]:
+        """Return the STR requirements for the address, or None when the address could not be resolved."""
+        key = normalize_address(address)
+        request_cache = cls._request_cache()
+        if request_cache is not None and key in request_cache:
+            return request_cache[key]
+
+        from strr_api.services.approval_service import ApprovalService  # pylint: disable=import-outside-toplevel
+
+        str_data = str_requirements_cache.get_or_fetch(key, lambda: ApprovalService.getSTRDataForAddress(address))
+        if request_cache is not None:
+            request_cache[key] = str_data
+        return str_data
+
+    @classmethod
+    def get_requirements_for_unit_address(cls, unit_address: dict) -> Optional[dict]:
+        """Return the STR requirements for a rental_unit_address style dict."""
+        return cls.get_requirements(cls.format_unit_address(unit_address))
+
+    @staticmethod
+    def _request_cache() -> Optional[dict]:
+        if not has_request_context():
+            return None
+        if "str_requirements" not in g:
+            g.str_requirements = {}
+        return g.str_requirements
@@ -0,0 +1,288 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Bounded in-process LRU in front of an optional shared Redis tier.
+
+Used for lookups that are expensive (outbound calls) and safe to share between the API pods and the jobs, such as
+geocoder responses and STR requirements. Values must be JSON serializable; a value the is_positive check rejects is
+cached for the shorter negative TTL.
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+
+from flask import Flask, current_app, has_app_context
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis is a dependency; init_app reports an install without it
+    redis = None
+
+logger = logging.getLogger("api")
+
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_TTL_SECONDS = 60 * 60
+DEFAULT_NEGATIVE_TTL_SECONDS = 60 * 60
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a tiered cache."""
+
+    memory_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    negative_hits: int = 0
+    redis_errors: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def incr(self, name: str):
+        """Increment a counter."""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def to_dict(self) -> dict:
+        """Return the counters in the shape logged by the jobs."""
+        hits = self.memory_hits + self.redis_hits
+        total = hits + self.misses
+        return {
+            "memoryHits": self.memory_hits,
+            "redisHits": self.redis_hits,
+            "misses": self.misses,
+            "negativeHits": self.negative_hits,
+            "redisErrors": self.redis_errors,
+            "hitRatio": round(hits / total, 3) if total else 0.0,
+        }
+
+
+class TieredCache:
+    """Bounded in-memory LRU in front of an optional shared Redis tier."""
+
+    def __init__(
+        self,
+        key_prefix: str,
+        config_prefix: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: int = DEFAULT_TTL_SECONDS,
+        negative_ttl: int = DEFAULT_NEGATIVE_TTL_SECONDS,
+        memory_ttl: Optional[int] = None,
+        is_positive: Callable[[object], bool] = bool,
+        redis_client=None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Create an empty cache.
+
+        key_prefix namespaces the Redis keys; config_prefix names the app config keys read by init_app, e.g.
+        GEOCODE_CACHE gives GEOCODE_CACHE_MAX_ENTRIES, GEOCODE_CACHE_TTL_SECONDS, GEOCODE_CACHE_NEGATIVE_TTL_SECONDS
+        and GEOCODE_CACHE_REDIS_ENABLED. memory_ttl caps how long the in-process tier keeps an entry, for values
+        that are invalidated through Redis and must not stay stale in the other processes for the full TTL.
+        """
+        self.key_prefix = key_prefix
+        self.config_prefix = config_prefix
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.memory_ttl = memory_ttl
+        self.is_positive = is_positive
+        self.redis = redis_client
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._configured = redis_client is not None
+
+    def init_app(self, app: Flask):
+        """Apply sizes and TTLs from the app config and connect the Redis tier when one is configured."""
+        prefix = self.config_prefix
+        self.max_entries = int(app.config.get(f"{prefix}_MAX_ENTRIES", self.max_entries))
+        self.ttl = int(app.config.get(f"{prefix}_TTL_SECONDS", self.ttl))
+        self.negative_ttl = int(app.config.get(f"{prefix}_NEGATIVE_TTL_SECONDS", self.negative_ttl))
+        if (memory_ttl := app.config.get(f"{prefix}_MEMORY_TTL_SECONDS", self.memory_ttl)) is not None:
+            self.memory_ttl = int(memory_ttl)
+        host = app.config.get("REDIS_HOST")
+        if host and app.config.get(f"{prefix}_REDIS_ENABLED", True):
+            if redis is None:
+                logger.error(
+                    f"{prefix}: REDIS_HOST is set but the redis client is not installed, caching in memory only"
+                )
+                self._configured = True
+                return
+            self.redis = redis.StrictRedis(
+                host=host,
+                port=int(app.config.get("REDIS_PORT") or 6379),
+                db=int(app.config.get("REDIS_DB") or 0),
+                socket_timeout=1,
+                socket_connect_timeout=1,
+            )
+        self._configured = True
+
+    def _ensure_configured(self):
+        if not self._configured and has_app_context():
+            self.init_app(current_app)
+
+    def get(self, key: str) -> Optional[object]:
+        """Return the cached value for the key, or None on a miss."""
+        self._ensure_configured()
+
+        cached = self._get_memory(key)
+        if cached is not None:
+            self.stats.incr("memory_hits")
+            return self._hit(cached)
+
+        cached = self._get_redis(key)
+        if cached is not None:
+            self.stats.incr("redis_hits")
+            self._set_memory(key, cached, self._ttl_for(cached))
+            return self._hit(cached)
+
+        self.stats.incr("misses")
+        return None
+
+    def get_many(self, keys: Iterable[str]) -> dict:
+        """Return the cached values for the keys that are cached, reading the Redis tier in one round trip."""
+        self._ensure_configured()
+
+        found = {}
+        remote = []
+        for key in keys:
+            cached = self._get_memory(key)
+            if cached is not None:
+                self.stats.incr("memory_hits")
+                found[key] = self._hit(cached)
+            else:
+                remote.append(key)
+
+        for key, cached in zip(remote, self._get_redis_many(remote)):
+            if cached is not None:
+                self.stats.incr("redis_hits")
+                self._set_memory(key, cached, self._ttl_for(cached))
+                found[key] = self._hit(cached)
+            else:
+                self.stats.incr("misses")
+        return found
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Optional[object]]) -> Optional[object]:
+        """Return the cached value for the key, calling fetch() on a miss; None results are not cached."""
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        value = fetch()
+        if value is not None:
+            self.set(key, value)
+        return value
+
+    def set(self, key: str, value):
+        """Store a value in both tiers."""
+        self._ensure_configured()
+        ttl = self._ttl_for(value)
+        self._set_memory(key, value, ttl)
+        if self.redis is not None:
+            try:
+                self.redis.setex(self.key_prefix + key, ttl, json.dumps(value))
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                self.stats.incr("redis_errors")
+                logger.warning(f"{self.config_prefix} write failed: {err}")
+
+    def delete(self, key: str):
+        """Remove a key from both tiers."""
+        self._ensure_configured()
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.redis is not None:
+            try:
+                self.redis.delete(self.key_prefix + key)
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                self.stats.incr("redis_errors")
+                logger.warning(f"{self.config_prefix} delete failed: {err}")
+
+    def clear(self):
+        """Drop the in-memory entries and reset the counters; the Redis tier is left as is."""
+        with self._lock:
+            self._entries.clear()
+        self.stats = CacheStats()
+
+    def _hit(self, value):
+        if not self.is_positive(value):
+            self.stats.incr("negative_hits")
+        return value
+
+    def _ttl_for(self, value) -> int:
+        return self.ttl if self.is_positive(value) else self.negative_ttl
+
+    def _get_memory(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set_memory(self, key: str, value, ttl: int):
+        if self.memory_ttl is not None:
+            ttl = min(ttl, self.memory_ttl)
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _get_redis(self, key: str):
+        if self.redis is None:
+            return None
+        try:
+            cached = self.redis.get(self.key_prefix + key)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            self.stats.incr("redis_errors")
+            logger.warning(f"{self.config_prefix} read failed: {err}")
+            return None
+        return json.loads(cached) if cached else None
+
+    def _get_redis_many(self, keys: list) -> list:
+        if self.redis is None or not keys:
+            return [None] * len(keys)
+        try:
+            values = self.redis.mget([self.key_prefix + key for key in keys])
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            self.stats.incr("redis_errors")
+            logger.warning(f"{self.config_prefix} read failed: {err}")
+            return [None] * len(keys)
+        return [json.loads(value) if value else None for value in values]
@@ -0,0 +1,159 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Caches OAuth client-credentials tokens for outbound service calls.
+
+Tokens are keyed by (token_url, client_id) and reused until shortly before they expire. Once a token is past its
+refresh point, a single caller refreshes it while every other caller keeps using the still-valid token, so a thread
+pool does not stampede the token endpoint.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+
+from strr_api.services.http_client import http_client
+
+logger = logging.getLogger("api")
+
+# Seconds before expires_in at which a token is no longer handed out.
+EXPIRY_MARGIN_SECONDS = 30
+# Fraction of the usable lifetime after which a background caller refreshes the token early.
+EARLY_REFRESH_RATIO = 0.8
+# Lifetime assumed when the token endpoint does not return expires_in.
+DEFAULT_EXPIRES_IN_SECONDS = 60
+
+
+@dataclass
+class CachedToken:
+    """An access token and the monotonic times at which it should be refreshed and dropped."""
+
+    access_token: str
+    refresh_at: float
+    expires_at: float
+
+
+class TokenManager:
+    """Process-wide cache of client-credentials tokens."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """Create an empty token cache."""
+        self._clock = clock
+        self._tokens: Dict[Tuple[str, str], CachedToken] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, key: Tuple[str, str]) -> threading.Lock:
+        with self._locks_guard:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+    def get_token(self, token_url: str, client_id: str, client_secret: str, timeout: int = 20) -> Optional[str]:
+        """Return a valid access token, requesting a new one only when needed."""
+        key = (token_url, client_id)
+        now = self._clock()
+        cached = self._tokens.get(key)
+
+        if cached and now < cached.refresh_at:
+            return cached.access_token
+
+        lock = self._lock_for(key)
+        if cached and now < cached.expires_at:
+            # Early refresh: one caller renews the token, the rest keep using the current one.
+            if not lock.acquire(blocking=False):
+                return cached.access_token
+            try:
+                return self._refresh(key, client_secret, timeout, fallback=cached)
+            finally:
+                lock.release()
+
+        with lock:
+            cached = self._tokens.get(key)
+            if cached and self._clock() < cached.expires_at:
+                return cached.access_token
+            return self._refresh(key, client_secret, timeout)
+
+    def invalidate(self, token_url: str, client_id: str):
+        """Drop the cached token, e.g. after the downstream service rejected it."""
+        self._tokens.pop((token_url, client_id), None)
+
+    def clear(self):
+        """Drop every cached token."""
+        self._tokens.clear()
+
+    def _refresh(
+        self, key: Tuple[str, str], client_secret: str, timeout: int, fallback: Optional[CachedToken] = None
+    ) -> Optional[str]:
+        token_url, client_id = key
+        try:
+            res = http_client.post(
+                token_url,
+                service="token",
+                data="grant_type=client_credentials",
+                headers={"content-type": "application/x-www-form-urlencoded"},
+                auth=(client_id, client_secret),
+                timeout=timeout,
+            )
+        except requests.exceptions.RequestException:
+            if fallback:
+                logger.warning(f"Token refresh failed for {token_url}, using the current token")
+                return fallback.access_token
+            raise
+
+        try:
+            token_json = res.json()
+            access_token = token_json.get("access_token")
+        except Exception:
+            access_token = None
+        if not access_token:
+            return fallback.access_token if fallback else None
+
+        try:
+            expires_in = float(token_json.get("expires_in") or DEFAULT_EXPIRES_IN_SECONDS)
+        except (TypeError, ValueError):
+            expires_in = DEFAULT_EXPIRES_IN_SECONDS
+        usable_for = expires_in - min(EXPIRY_MARGIN_SECONDS, expires_in / 2)
+        issued_at = self._clock()
+        self._tokens[key] = CachedToken(
+            access_token=access_token,
+            refresh_at=issued_at + usable_for * EARLY_REFRESH_RATIO,
+            expires_at=issued_at + usable_for,
+        )
+        return access_token
+
+
+token_manager = TokenManager()
@@ -35,19 +35,96 @@
 # pylint: disable=E1102
 """Manages user model interactions."""
 
+from flask import g, has_app_context
+from sqlalchemy.orm import make_transient_to_detached
+
+from strr_api.models import db
+from strr_api.models.unit_of_work import after_commit
 from strr_api.models.user import User
+from strr_api.services.tiered_cache import TieredCache
 from strr_api.utils.user_context import UserContext, user_context
 
+# Columns kept in the cross-request cache, enough to rebuild the User without a query.
+CACHED_USER_FIELDS = (
+    "id",
+    "username",
+    "firstname",
+    "lastname",
+    "middlename",
+    "email",
+    "sub",
+    "iss",
+    "idp_userid",
+    "login_source",
+)
+
+# Request scoped memo on flask.g: the JWT sub and the User resolved for it.
+REQUEST_USER_KEY = "strr_user"
+
+user_cache = TieredCache("user:v1:", "USER_CACHE", max_entries=1000, ttl=60)
+
 
 class UserService:
     """Service to save and load user details."""
 
     @classmethod
     def get_or_create_user_by_jwt(cls, token) -> User:
-        """Get or create user matching the token"""
+        """Get or create user matching the token.
+
+        The user is memoized on flask.g for the rest of the request and cached by JWT sub for a short TTL, so the
+        repeated resolutions within and across requests do not query the users table.
+        """
+        if user := cls._get_cached_user(token):
+            return user
         user = User.get_or_create_user_by_jwt(token)
+        cls._cache_user(token, user)
         return user
 
+    @classmethod
+    def find_user_id_in_context(cls) -> int | None:
+        """Find the id of the JWT user in context, without creating it.
+
+        Used for the created_by / modified_by column defaults. These run during flush, where the session must not
+        merge, so a cached user only gives its id. Jobs run without a JWT and get None without a lookup.
+        """
+        if not has_app_context() or not (token := g.get("jwt_oidc_token_info")):
+            return None
+        sub = token.get("sub") if isinstance(token, dict) else None
+        if sub and (memo := g.get(REQUEST_USER_KEY)) and memo[0] == sub:
+            return memo[1].id
+        if sub and (values := user_cache.get(sub)):
+            return values["id"]
+        user = User.find_by_jwt_token(token)
+        cls._cache_user(token, user)
+        return user.id if user else None
+
+    @staticmethod
+    def _get_cached_user(token) -> User | None:
+        """Return the user for the token from the request memo or the cross-request cache."""
+        sub = token.get("sub") if isinstance(token, dict) else None
+        if not sub or not has_app_context():
+            return None
+        if (memo := g.get(REQUEST_USER_KEY)) and memo[0] == sub:
+            return memo[1]
+        if not (values := user_cache.get(sub)):
+            return None
+        user = User(**values)
+        make_transient_to_detached(user)
+        user = db.session.merge(user, load=False)
+        setattr(g, REQUEST_USER_KEY, (sub, user))
+        return user
+
+    @staticmethod
+    def _cache_user(token, user: User | None):
+        """Remember a resolved user for the request and, once it has been stored, across requests."""
+        sub = token.get("sub") if isinstance(token, dict) else None
+        if not sub or not user or not has_app_context():
+            return
+        setattr(g, REQUEST_USER_KEY, (sub, user))
+        if user.id is not None:
+            fields = {field: getattr(user, field) for field in CACHED_USER_FIELDS}
+            after_commit(lambda: user_cache.set(sub, fields))
+
     @classmethod
     @user_context
     def is_strr_staff_or_system(cls, **kwargs) -> bool:
@@ -35,7 +35,6 @@
 """Permit Validation Service."""
 import copy
 import json
-import re
 from datetime import datetime
 from http import HTTPStatus
 
@@ -45,8 +44,13 @@ from strr_api.enums.enum import ErrorMessage, RegistrationStatus, RegistrationTy
 from strr_api.models import BulkValidation, RealTimeValidation, Registration
 from strr_api.schemas.utils import validate
 from strr_api.services.gcp_storage_service import GCPStorageService
-from strr_api.services.registration_service import RegistrationService
-from strr_api.utils.date_util import DateUtil
+from strr_api.services.permit_snapshot_service import PermitSnapshotService, build_permit_snapshot
+from strr_api.utils.address_match import (
+    POSTAL_PREFIX_LENGTH,
+    normalize_postal_code,
+    normalize_street_number,
+    normalize_unit_number,
+)
 
 
 class ValidationService:
@@ -67,9 +71,9 @@ class ValidationService:
             status_code = HTTPStatus.BAD_REQUEST
 
         else:
-            registration = RegistrationService.find_by_registration_number(request_json.get("identifier"))
-            if registration:
-                response, status_code = ValidationService.check_permit_details(request_json, registration)
+            snapshot = PermitSnapshotService.get_snapshot(request_json.get("identifier"))
+            if snapshot:
+                response, status_code = ValidationService.check_permit_snapshot(request_json, snapshot)
             else:
                 response["errors"] = [
                     {"code": ErrorMessage.PERMIT_NOT_FOUND.name, "message": ErrorMessage.PERMIT_NOT_FOUND.value}
@@ -81,23 +85,28 @@ class ValidationService:
         return response, status_code
 
     @classmethod
-    def check_permit_details(cls, request_json: dict, registration: Registration):  # pylint: disable=R0912
+    def check_permit_details(cls, request_json: dict, registration: Registration):
         """Checks the data in the request against the permit details."""
+        return cls.check_permit_snapshot(request_json, build_permit_snapshot(registration))
+
+    @classmethod
+    def check_permit_snapshot(cls, request_json: dict, snapshot: dict):  # pylint: disable=R0912
+        """Checks the data in the request against a permit snapshot."""
         status_code = HTTPStatus.OK
         response = copy.deepcopy(request_json)
-        if registration.status != RegistrationStatus.ACTIVE:
-            response["status"] = registration.status.name
+        if snapshot["status"] != RegistrationStatus.ACTIVE.name:
+            response["status"] = snapshot["status"]
             return response, status_code
         errors = []
         address_json = request_json.get("address")
 
-        if registration.registration_type == RegistrationType.HOST.value:
+        if snapshot["registrationType"] == RegistrationType.HOST.value:
             # Street Number validation
-            request_street_number = str(address_json.get("streetNumber")).lower().strip()
+            request_street_number = normalize_street_number(address_json.get("streetNumber"))
             request_street_number_sub = request_street_number.split(" ")[0]
-            permit_street_number = registration.rental_property.address.street_number
+            permit_street_number = snapshot["streetNumber"]
 
-            if permit_street_number and permit_street_number.lower().strip() not in (
+            if permit_street_number is not None and permit_street_number not in (
                 request_street_number,
                 request_street_number_sub,
             ):
@@ -109,30 +118,27 @@ class ValidationService:
                 )
 
             # Postal code validation
-            request_postal_code = address_json.get("postalCode", "").replace(" ", "").lower()
-            permit_postal_code = registration.rental_property.address.postal_code.replace(" ", "").lower()
+            request_postal_code = normalize_postal_code(address_json.get("postalCode", ""))
+            permit_postal_code = snapshot["postalCode"]
             if not (
                 request_postal_code == permit_postal_code
-                or (len(request_postal_code) >= 4 and (request_postal_code[:4] == permit_postal_code[:4]))
+                or (
+                    len(request_postal_code) >= POSTAL_PREFIX_LENGTH
+                    and request_postal_code[:POSTAL_PREFIX_LENGTH] == permit_postal_code[:POSTAL_PREFIX_LENGTH]
+                )
             ):
                 errors.append(
                     {"code": ErrorMessage.POSTAL_CODE_MISMATCH.name, "message": ErrorMessage.POSTAL_CODE_MISMATCH.value}
                 )
 
             # Unit number validation.
-            has_unit_number_validation_error = False
+            permit_unit_number = snapshot["unitNumber"]
             if input_unit_number := address_json.get("unitNumber", None):
-                if permit_unit_number := registration.rental_property.address.unit_number:
-                    filtered_input_unit_number = ValidationService._get_filtered_unit_number(input_unit_number)
-                    filtered_permit_unit_number = ValidationService._get_filtered_unit_number(permit_unit_number)
-                    if filtered_input_unit_number != filtered_permit_unit_number:
-                        has_unit_number_validation_error = True
-                else:
-                    has_unit_number_validation_error = True
-
+                has_unit_number_validation_error = (
+                    permit_unit_number is None or normalize_unit_number(input_unit_number) != permit_unit_number
+                )
             else:
-                if registration.rental_property.address.unit_number:
-                    has_unit_number_validation_error = True
+                has_unit_number_validation_error = permit_unit_number is not None
 
             if has_unit_number_validation_error:
                 errors.append(
@@ -142,32 +148,16 @@ class ValidationService:
                     }
                 )
 
-        elif registration.registration_type == RegistrationType.STRATA_HOTEL.value:
-            match_found = False
-            strata_hotel = registration.strata_hotel_registration.strata_hotel
-            location = strata_hotel.location
+        elif snapshot["registrationType"] == RegistrationType.STRATA_HOTEL.value:
+            request_street_number = normalize_street_number(address_json.get("streetNumber"))
+            request_street_numbers = (request_street_number, request_street_number.split(" ")[0])
+            request_postal_prefix = normalize_postal_code(address_json.get("postalCode", ""))[:POSTAL_PREFIX_LENGTH]
 
-            request_street_number = str(address_json.get("streetNumber")).strip()
-            request_street_number_sub = request_street_number.split(" ")[0]
-            permit_street_number = str(cls._extract_street_number(cls._get_text_after_hyphen(location.street_address)))
-
-            if (permit_street_number in (request_street_number, request_street_number_sub)) and (
-                address_json.get("postalCode", "").replace(" ", "").lower()[:4]
-                == location.postal_code.replace(" ", "").lower()[:4]
-            ):
-                match_found = True
-
-            if not match_found:
-                for building in strata_hotel.buildings:
-                    building_street_number = str(
-                        cls._extract_street_number(cls._get_text_after_hyphen(building.address.street_address))
-                    )
-                    if (building_street_number in (request_street_number, request_street_number_sub)) and (
-                        address_json.get("postalCode", "").replace(" ", "").lower()[:4]
-                        == building.address.postal_code.replace(" ", "").lower()[:4]
-                    ):
-                        match_found = True
-                        break
+            # The hotel location comes first, then each building.
+            match_found = any(
+                address["streetNumber"] in request_street_numbers and address["postalPrefix"] == request_postal_prefix
+                for address in snapshot["addresses"]
+            )
 
             if not match_found:
                 errors.append(
@@ -181,42 +171,10 @@ class ValidationService:
             response["errors"] = errors
             status_code = HTTPStatus.BAD_REQUEST
         else:
-            response["status"] = registration.status.name
-            response["validUntil"] = DateUtil.as_legislation_timezone(registration.expiry_date).strftime("%Y-%m-%d")
+            response["status"] = snapshot["status"]
+            response["validUntil"] = snapshot["validUntil"]
         return response, status_code
 
-    @classmethod
-    def _get_filtered_unit_number(cls, unit_number):
-        # Remove leading # or -
-        unit_number = re.sub(r"^[#-]+\s*", "", unit_number, flags=re.IGNORECASE)
-
-        # Remove keywords (case-insensitive): Suite, Unit, SL, Strata Lot, Room, Cabin, No.
-        unit_number = re.sub(
-            r"\b(Suite|Unit|SL|Strata Lot|Room|Lot|RM|Cabin|Bldg|ste|Nbr|Unt|Apartment|Apt|Number|Num|Floor|Flr|Fl|BUILDING|No\.?)",  # noqa: E501
-            "",
-            unit_number,
-            flags=re.IGNORECASE,
-        )
-
-        # Remove all hyphens and spaces (including in-between)
-        unit_number = re.sub(r"[-.\s]+", "", unit_number, flags=re.IGNORECASE)
-
-        # Remove standalone leading zeros
-        unit_number = re.sub(r"\b0+(\w+)", r"\1", unit_number, flags=re.IGNORECASE)
-
-        # Convert to uppercase
-        return unit_number.upper()
-
-    @classmethod
-    def _get_text_after_hyphen(cls, address_line):
-        if "-" in address_line:
-            return address_line.split("-", 1)[1].strip()
-        return address_line
-
-    @classmethod
-    def _extract_street_number(cls, address):
-        return address.strip().split(" ")[0]
-
     @classmethod
     def save_bulk_validation_request(cls, request_json):
         """Uploads the request to cloud storage and creates an entry in the db."""
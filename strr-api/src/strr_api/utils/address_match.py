@@ -0,0 +1,110 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Normalized address match keys.
+
+The permit checks and duplicate address detection compare addresses on these keys rather than the raw columns; they
+are computed once when an address is written (see Address) and only the request side is normalized per comparison.
+"""
+import re
+from typing import Optional
+
+POSTAL_PREFIX_LENGTH = 4
+
+
+def normalize_unit_number(unit_number: str) -> str:
+    """Return the unit number with prefixes, keywords, separators and leading zeros removed, in upper case."""
+    # Remove leading # or -
+    unit_number = re.sub(r"^[#-]+\s*", "", unit_number, flags=re.IGNORECASE)
+
+    # Remove keywords (case-insensitive): Suite, Unit, SL, Strata Lot, Room, Cabin, No.
+    unit_number = re.sub(
+        r"\b(Suite|Unit|SL|Strata Lot|Room|Lot|RM|Cabin|Bldg|ste|Nbr|Unt|Apartment|Apt|Number|Num|Floor|Flr|Fl|BUILDING|No\.?)",  # noqa: E501
+        "",
+        unit_number,
+        flags=re.IGNORECASE,
+    )
+
+    # Remove all hyphens and spaces (including in-between)
+    unit_number = re.sub(r"[-.\s]+", "", unit_number, flags=re.IGNORECASE)
+
+    # Remove standalone leading zeros
+    unit_number = re.sub(r"\b0+(\w+)", r"\1", unit_number, flags=re.IGNORECASE)
+
+    # Convert to uppercase
+    return unit_number.upper()
+
+
+def get_text_after_hyphen(address_line: str) -> str:
+    """Return the part of the address line after the first hyphen (the unit prefix), if any."""
+    if "-" in address_line:
+        return address_line.split("-", 1)[1].strip()
+    return address_line
+
+
+def extract_street_number(address: str) -> str:
+    """Return the first word of the street address."""
+    return address.strip().split(" ")[0]
+
+
+def normalize_street_number(street_number) -> str:
+    """Return the street number in lower case without surrounding spaces."""
+    return str(street_number).lower().strip()
+
+
+def normalize_postal_code(postal_code: Optional[str]) -> str:
+    """Return the postal code without spaces, in lower case."""
+    return (postal_code or "").replace(" ", "").lower()
+
+
+def address_match_keys(
+    street_number: Optional[str], street_address: Optional[str], postal_code: Optional[str], unit_number: Optional[str]
+) -> dict:
+    """Return the match keys for an address, keyed by Address column name.
+
+    The street number comes from the street_number column when it is set, otherwise from the start of the street
+    address after any unit prefix (strata hotel addresses only have the street address line).
+    """
+    if street_number:
+        match_street_number = normalize_street_number(street_number)
+    elif street_address:
+        match_street_number = normalize_street_number(extract_street_number(get_text_after_hyphen(street_address)))
+    else:
+        match_street_number = None
+    match_postal_code = normalize_postal_code(postal_code)
+    return {
+        "match_street_number": match_street_number,
+        "match_postal_code": match_postal_code,
+        "match_postal_prefix": match_postal_code[:POSTAL_PREFIX_LENGTH],
+        "match_unit_number": normalize_unit_number(unit_number) if unit_number else None,
+    }
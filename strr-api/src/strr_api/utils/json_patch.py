@@ -0,0 +1,101 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""JSON patches (RFC 6902) between two JSON documents.
+
+Only the add, remove and replace operations are produced and applied. Objects are compared key by key and lists of
+the same length item by item; any other change replaces the value at its path.
+"""
+import copy
+from typing import Any
+
+
+def _escape(key: str) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _same(source: Any, target: Any) -> bool:
+    """Return True when both values are equal as JSON; unlike ==, true differs from 1 and 1 from 1.0."""
+    if type(source) is not type(target):
+        return False
+    if isinstance(source, dict):
+        return source.keys() == target.keys() and all(_same(value, target[key]) for key, value in source.items())
+    if isinstance(source, list):
+        return len(source) == len(target) and all(_same(old, new) for old, new in zip(source, target))
+    return source == target
+
+
+def make_patch(source: Any, target: Any, path: str = "") -> list[dict]:
+    """Return the operations that turn source into target."""
+    if _same(source, target):
+        return []
+    if isinstance(source, dict) and isinstance(target, dict):
+        operations = []
+        for key, value in source.items():
+            if key not in target:
+                operations.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+            else:
+                operations.extend(make_patch(value, target[key], f"{path}/{_escape(key)}"))
+        for key, value in target.items():
+            if key not in source:
+                operations.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": value})
+        return operations
+    if isinstance(source, list) and isinstance(target, list) and len(source) == len(target):
+        operations = []
+        for index, (old, new) in enumerate(zip(source, target)):
+            operations.extend(make_patch(old, new, f"{path}/{index}"))
+        return operations
+    return [{"op": "replace", "path": path, "value": target}]
+
+
+def apply_patch(document: Any, patch: list[dict]) -> Any:
+    """Return a copy of the document with the patch applied; the document itself is left unchanged."""
+    document = copy.deepcopy(document)
+    for operation in patch:
+        if not operation["path"]:
+            document = copy.deepcopy(operation["value"])
+            continue
+        *parents, last = [_unescape(token) for token in operation["path"].split("/")[1:]]
+        container = document
+        for token in parents:
+            container = container[int(token)] if isinstance(container, list) else container[token]
+        key = int(last) if isinstance(container, list) else last
+        if operation["op"] == "remove":
+            del container[key]
+        else:
+            container[key] = copy.deepcopy(operation["value"])
+    return document
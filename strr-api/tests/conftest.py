@@ -52,10 +52,24 @@ from testcontainers.postgres import PostgresContainer
 from strr_api import db as _db
 from strr_api import jwt as _jwt
 from strr_api.config import Testing
+from strr_api.services.geocode_cache import geocode_cache
+from strr_api.services.permit_snapshot_service import permit_cache
+from strr_api.services.str_requirements_service import str_requirements_cache
+from strr_api.services.user_service import user_cache
 
 postgres_image = "postgres:16-alpine"
 
 
+@pytest.fixture(autouse=True)
+def clear_lookup_caches():
+    """Keep cached geocodes, STR requirements, permits and users from leaking between tests that mock the lookups."""
+    geocode_cache.clear()
+    str_requirements_cache.clear()
+    permit_cache.clear()
+    user_cache.clear()
+    yield
+
+
 @pytest.fixture(scope="function")
 def random_string():
     """Returns a random string, defult length is 10."""
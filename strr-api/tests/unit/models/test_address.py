@@ -0,0 +1,51 @@
+from strr_api.models import Address
+
+
+def _address(**kwargs):
+    values = {
+        "country": "CA",
+        "street_address": "Main St",
+        "city": "Victoria",
+        "province": "BC",
+        "postal_code": "V8V 1A1",
+    }
+    values.update(kwargs)
+    return Address(**values)
+
+
+def test_match_keys_are_set_on_create():
+    address = _address(street_number=" 12A ", unit_number="Unit 004")
+
+    assert address.match_street_number == "12a"
+    assert address.match_postal_code == "v8v1a1"
+    assert address.match_postal_prefix == "v8v1"
+    assert address.match_unit_number == "4"
+
+
+def test_match_street_number_falls_back_to_street_address():
+    address = _address(street_address="5-200 Annex Rd", postal_code="V9B 2C3")
+
+    assert address.match_street_number == "200"
+    assert address.match_unit_number is None
+
+
+def test_match_keys_follow_updates():
+    address = _address(street_number="12", unit_number="4")
+
+    address.postal_code = "v9a 1b2"
+    address.unit_number = None
+
+    assert address.match_postal_prefix == "v9a1"
+    assert address.match_unit_number is None
+    assert address.match_street_number == "12"
+
+
+def test_match_keys_are_persisted(session):
+    address = _address(street_number="4321", postal_code="V0N 9Z9")
+    session.add(address)
+    session.commit()
+
+    found = Address.query.filter_by(match_postal_prefix="v0n9", match_street_number="4321").all()
+
+    assert address in found
+    assert found[0].match_keys()["match_postal_code"] == "v0n9z9"
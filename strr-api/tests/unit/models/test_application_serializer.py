@@ -0,0 +1,165 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Tests for the copy-on-write ApplicationSerializer.to_dict.
+
+The benchmark compares it with deep copying application_json first, which is what to_dict used to do. Run with
+`pytest -m slow -s` to see the numbers.
+"""
+import copy
+import json
+import os
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from strr_api.enums.enum import PropertyType, RegistrationStatus
+from strr_api.models import Address, Application, Certificate, Document, Registration, RentalProperty, User
+from strr_api.models.application import ApplicationSerializer
+
+ITERATIONS = 2000
+
+MOCKS_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "../../mocks/json")
+
+
+def _load_json(name):
+    with open(os.path.join(MOCKS_DIR, f"{name}.json")) as f:
+        return json.load(f)
+
+
+def _application(application_json, with_registration=True):
+    user = User(id=1, username="examiner", firstname="Exam", lastname="Iner")
+    registration = None
+    if with_registration:
+        registration = Registration(
+            id=10,
+            registration_type=Registration.RegistrationType.HOST,
+            registration_number="H123456789",
+            status=RegistrationStatus.ACTIVE,
+            start_date=datetime(2025, 1, 1),
+            expiry_date=datetime(2026, 1, 1),
+            rental_property=RentalProperty(
+                property_type=PropertyType.SINGLE_FAMILY_HOME,
+                address=Address(
+                    street_number="12",
+                    street_address="12 Fake St",
+                    city="Victoria",
+                    province="BC",
+                    country="CA",
+                    postal_code="V8V 8V8",
+                ),
+            ),
+            certificates=[Certificate(certificate=b"%PDF")],
+            has_certificate=True,
+            documents=[Document(path="a1234", file_name="doc.pdf", added_on=date(2025, 1, 2))],
+        )
+    return Application(
+        application_json=application_json,
+        application_number="12345678901234",
+        type="registration",
+        registration_type=Registration.RegistrationType.HOST,
+        status=Application.Status.FULL_REVIEW_APPROVED if registration else Application.Status.FULL_REVIEW,
+        payment_account="1234",
+        application_date=datetime.now(timezone.utc),
+        decision_date=datetime.now(timezone.utc) - timedelta(days=1),
+        submitter_id=user.id,
+        submitter=user,
+        reviewer_id=user.id,
+        reviewer=user,
+        registration_id=registration.id if registration else None,
+        registration=registration,
+    )
+
+
+def _deepcopy_to_dict(application):
+    """The previous behaviour: serialize a private deep copy of application_json."""
+    stored_json = application.application_json
+    application.application_json = copy.deepcopy(stored_json)
+    try:
+        return ApplicationSerializer.to_dict(application)
+    finally:
+        application.application_json = stored_json
+
+
+@pytest.mark.parametrize(
+    "name, with_registration",
+    [
+        ("host_registration", True),
+        ("host_registration", False),
+        ("platform_registration", False),
+        ("strata_hotel_registration", False),
+    ],
+)
+def test_to_dict_is_byte_identical(name, with_registration):
+    application = _application(_load_json(name), with_registration)
+
+    assert json.dumps(ApplicationSerializer.to_dict(application)) == json.dumps(_deepcopy_to_dict(application))
+
+
+def test_to_dict_does_not_touch_application_json():
+    application_json = _load_json("host_registration")
+    application_json["header"] = {"applicationType": "registration"}
+    application_json["registration"]["documents"][0]["uploadDate"] = "2025-01-01"
+    stored = copy.deepcopy(application_json)
+    application = _application(application_json)
+
+    application_dict = ApplicationSerializer.to_dict(application)
+    application_dict["header"]["existingHostRegistrations"] = 2
+    application_dict["registration"]["documents"][0]["addedOn"] = "2025-02-02"
+
+    assert application_dict["header"]["applicationType"] == "registration"
+    assert application_dict["header"]["registrationNumber"] == "H123456789"
+    assert application.application_json == stored
+
+
+def _serializations_per_second(func, application) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        func(application)
+    return ITERATIONS / (time.perf_counter() - start)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("name", ["host_registration", "platform_registration", "strata_hotel_registration"])
+def test_benchmark_to_dict(name):
+    application = _application(_load_json(name))
+
+    before = _serializations_per_second(_deepcopy_to_dict, application)
+    after = _serializations_per_second(ApplicationSerializer.to_dict, application)
+
+    print(f"\n{name}: deepcopy {before:,.0f}/s, copy-on-write {after:,.0f}/s")
+    # copy-on-write: everything but the header and the documents is shared with the stored application_json
+    registration = application.application_json["registration"]
+    serialized = ApplicationSerializer.to_dict(application)["registration"]
+    assert all(serialized[key] is value for key, value in registration.items() if key != "documents")
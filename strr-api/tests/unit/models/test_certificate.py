@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from strr_api.enums.enum import RegistrationStatus
+from strr_api.models import Certificate, Registration, User
+
+
+@pytest.fixture
+def registrations(session, random_string):
+    user = User(username=random_string(8))
+    session.add(user)
+    session.flush()
+    issued, pending = [
+        Registration(
+            registration_type=Registration.RegistrationType.HOST,
+            registration_number=f"H{random_string(8)}",
+            sbc_account_id=1,
+            status=RegistrationStatus.ACTIVE,
+            user_id=user.id,
+            start_date=datetime.now(timezone.utc),
+            expiry_date=(datetime.now(timezone.utc) + timedelta(days=365)).date(),
+        )
+        for _ in range(2)
+    ]
+    issued.certificates = [Certificate(certificate=bytes(range(256)) * 40, issuer_id=user.id)]
+    session.add_all([issued, pending])
+    session.commit()
+    session.expunge_all()
+    return issued.id, pending.id
+
+
+def test_has_certificate(session, registrations):
+    issued_id, pending_id = registrations
+
+    assert Registration.query.get(issued_id).has_certificate is True
+    assert Registration.query.get(pending_id).has_certificate is False
+
+
+def test_certificate_blob_is_deferred_and_streamed(session, registrations):
+    issued_id, _ = registrations
+    certificate = Certificate.query.filter_by(registration_id=issued_id).one()
+
+    assert "certificate" not in certificate.__dict__
+    chunks = list(certificate.stream(chunk_size=4096))
+    assert [len(chunk) for chunk in chunks] == [4096, 4096, 2048]
+    assert b"".join(chunks) == bytes(range(256)) * 40
+    assert "certificate" not in certificate.__dict__
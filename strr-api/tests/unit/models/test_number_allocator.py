@@ -0,0 +1,90 @@
+import re
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from flask import Flask
+
+from strr_api.enums.enum import RegistrationStatus
+from strr_api.models import Application, Registration, User
+from strr_api.models.number_allocator import (
+    REGISTRATION_NUMBER_SEQUENCE,
+    FeistelPermutation,
+    NumberAllocator,
+    check_number_allocator_key,
+)
+from strr_api.models.rental import REGISTRATION_NUMBER_PREFIXES
+from tests.unit.utils.queries import count_queries
+
+
+def test_permutation_is_a_bijection():
+    permutation = FeistelPermutation(b"key", 3)
+    numbers = [permutation.permute(value) for value in range(1000)]
+
+    assert sorted(numbers) == list(range(1000))
+    assert numbers[:10] != list(range(10))
+    assert numbers != [FeistelPermutation(b"other", 3).permute(value) for value in range(1000)]
+
+
+def test_startup_requires_the_key():
+    app = Flask(__name__)
+    app.config.update(NUMBER_ALLOCATOR_KEY="", TESTING=False)
+    with pytest.raises(ValueError):
+        check_number_allocator_key(app)
+
+    app.config["TESTING"] = True
+    check_number_allocator_key(app)
+    app.config.update(NUMBER_ALLOCATOR_KEY="secret", TESTING=False)
+    check_number_allocator_key(app)
+
+
+def test_allocated_numbers_keep_their_format(session):
+    registration_numbers = {Registration.allocate_registration_number(code) for code in ("H", "PM", "PL", "ST")}
+    application_numbers = {Application.generate_unique_application_number() for _ in range(120)}
+
+    assert all(re.fullmatch(r"(H|PM|PL|ST)\d{9}", number) for number in registration_numbers)
+    assert all(re.fullmatch(r"\d{14}", number) for number in application_numbers)
+    assert len(application_numbers) == 120
+
+
+def test_allocation_from_a_reserved_block_needs_no_queries(app, session):
+    allocator = NumberAllocator(
+        REGISTRATION_NUMBER_SEQUENCE, digits=9, number_column=lambda: Registration.registration_number
+    )
+    allocator.allocate()
+
+    with count_queries(session) as statements:
+        numbers = {allocator.allocate() for _ in range(app.config["NUMBER_ALLOCATOR_BLOCK_SIZE"] - 1)}
+
+    assert statements == []
+    assert len(numbers) == app.config["NUMBER_ALLOCATOR_BLOCK_SIZE"] - 1
+
+
+def test_block_skips_issued_numbers(session, random_string):
+    user = User(username=random_string(8))
+    session.add(user)
+    session.flush()
+    session.add(
+        Registration(
+            registration_type=Registration.RegistrationType.HOST,
+            registration_number="PM000000001",
+            sbc_account_id=1,
+            status=RegistrationStatus.ACTIVE,
+            user_id=user.id,
+            start_date=datetime.now(timezone.utc),
+            expiry_date=(datetime.now(timezone.utc) + timedelta(days=365)).date(),
+        )
+    )
+    session.flush()
+    allocator = NumberAllocator(
+        REGISTRATION_NUMBER_SEQUENCE,
+        digits=9,
+        number_column=lambda: Registration.registration_number,
+        prefixes=REGISTRATION_NUMBER_PREFIXES,
+    )
+
+    # Map the sequence onto two numbers, one of them issued before the allocator existed
+    with patch.object(FeistelPermutation, "permute", lambda self, value: value % 2):
+        numbers = {allocator.allocate() for _ in range(10)}
+
+    assert numbers == {"000000000"}
@@ -0,0 +1,116 @@
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from strr_api.models import Events, User
+from strr_api.models.db import db
+from strr_api.models.unit_of_work import after_commit, in_unit_of_work, unit_of_work
+from strr_api.services.email_service import EmailService
+
+
+def _event(details):
+    return Events(
+        event_type=Events.EventType.APPLICATION,
+        event_name=Events.EventName.APPLICATION_SUBMITTED,
+        details=details,
+    )
+
+
+def test_saves_commit_once(session):
+    """save() only flushes inside a unit of work; the block commits once on exit."""
+    with patch.object(db.session, "commit", wraps=db.session.commit) as commit:
+        with unit_of_work():
+            assert in_unit_of_work()
+            first = _event("uow-first").save()
+            second = _event("uow-second").save()
+            assert first.id and second.id
+            assert commit.call_count == 0
+        assert commit.call_count == 1
+    assert not in_unit_of_work()
+
+
+def test_save_outside_commits(session):
+    """Without a unit of work save() keeps committing straight away."""
+    with patch.object(db.session, "commit", wraps=db.session.commit) as commit:
+        _event("no-uow").save()
+        assert commit.call_count == 1
+
+
+def test_user_save_joins_unit_of_work(session):
+    """User.save() and User.update() only flush inside a unit of work and are rolled back with it."""
+    username = f"uow-user-{uuid4().hex[:8]}"
+    with patch.object(db.session, "commit", wraps=db.session.commit) as commit:
+        with pytest.raises(ValueError):
+            with unit_of_work():
+                user = User(username=username, firstname="Unit")
+                user.save()
+                user.firstname = "Work"
+                user.update()
+                assert user.id
+                assert commit.call_count == 0
+                raise ValueError("boom")
+        assert commit.call_count == 0
+    assert User.find_by_username(username) is None
+
+
+def test_after_commit_runs_after_commit(session):
+    """Deferred callbacks run once the transaction committed, in registration order."""
+    calls = []
+    with unit_of_work():
+        after_commit(lambda: calls.append("first"))
+        after_commit(lambda: calls.append("second"))
+        assert calls == []
+    assert calls == ["first", "second"]
+
+    after_commit(lambda: calls.append("immediate"))
+    assert calls[-1] == "immediate"
+
+
+def test_rollback_drops_changes_and_callbacks(session):
+    """An exception rolls the work back and the deferred callbacks never run."""
+    callback = MagicMock()
+    with pytest.raises(ValueError):
+        with unit_of_work():
+            _event("uow-rolled-back").save()
+            after_commit(callback)
+            raise ValueError("boom")
+
+    callback.assert_not_called()
+    assert Events.query.filter_by(details="uow-rolled-back").count() == 0
+
+
+def test_nested_failure_keeps_outer_work(session):
+    """A failing nested block only rolls back its own savepoint and callbacks."""
+    outer_callback = MagicMock()
+    inner_callback = MagicMock()
+    with unit_of_work():
+        _event("uow-outer").save()
+        after_commit(outer_callback)
+        with pytest.raises(ValueError):
+            with unit_of_work():
+                _event("uow-inner").save()
+                after_commit(inner_callback)
+                raise ValueError("boom")
+
+    outer_callback.assert_called_once()
+    inner_callback.assert_not_called()
+    assert Events.query.filter_by(details="uow-outer").count() == 1
+    assert Events.query.filter_by(details="uow-inner").count() == 0
+
+
+def test_email_publish_deferred(session):
+    """Email notifications are only published once the unit of work committed."""
+    message = MagicMock()
+    with patch("strr_api.services.gcp_queue_publisher.publish_to_queue") as publish:
+        with unit_of_work():
+            EmailService._publish(message)
+            publish.assert_not_called()
+        publish.assert_called_once_with(message)
+
+        publish.reset_mock()
+        with pytest.raises(ValueError):
+            with unit_of_work():
+                EmailService._publish(message)
+                raise ValueError("boom")
+        publish.assert_not_called()
@@ -1,5 +1,8 @@
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
 
 from strr_api.schemas import utils
 
@@ -86,3 +89,36 @@ def test_validate_platform_registration_schema_error_no_platform_details():
         valid, error = utils.validate_schema(data, f"{REGISTRATION_SCHEMA}")
         assert not valid
         assert error
+
+
+def test_schema_registry_reuses_compiled_validator():
+    first = utils.schema_registry.get_validator(REGISTRATION_SCHEMA)
+    second = utils.schema_registry.get_validator(REGISTRATION_SCHEMA)
+    assert first is second
+
+
+def test_schema_registry_unknown_schema():
+    with pytest.raises(ValueError):
+        utils.schema_registry.get_validator("unknown_schema")
+    valid, errors = utils.validate({}, "unknown_schema")
+    assert not valid
+    assert errors
+
+
+def test_is_valid_fast_path():
+    with open(HOST_REGISTRATION_REQUEST) as f:
+        data = json.load(f)
+    assert utils.is_valid(data, REGISTRATION_SCHEMA)
+    del data["registration"]["unitAddress"]
+    assert not utils.is_valid(data, REGISTRATION_SCHEMA)
+
+
+def test_schema_registry_shared_across_threads():
+    with open(HOST_REGISTRATION_REQUEST) as f:
+        data = json.load(f)
+    registry = utils.SchemaRegistry()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        validators = list(executor.map(lambda _: registry.get_validator(REGISTRATION_SCHEMA), range(32)))
+        results = list(executor.map(lambda _: registry.is_valid(data, REGISTRATION_SCHEMA), range(32)))
+    assert len({id(validator) for validator in validators}) == 1
+    assert all(results)
@@ -0,0 +1,76 @@
+"""Micro-benchmark for schema validation throughput.
+
+Compares the compiled, process-wide validators with the previous behaviour of reading and compiling the
+schema directory on every call. Run with `pytest -m slow -s` to see the numbers.
+"""
+import json
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+from jsonschema import Draft7Validator
+from referencing import Registry, Resource
+from referencing.jsonschema import DRAFT7
+
+from strr_api.schemas import utils
+
+ITERATIONS = 200
+
+HOST_REGISTRATION_REQUEST = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "../../mocks/json/host_registration.json"
+)
+REAL_TIME_VALIDATION_REQUEST = {
+    "identifier": "H123456789",
+    "address": {"streetNumber": "12", "postalCode": "V1V1V1", "unitNumber": "1"},
+}
+
+
+def _uncached_is_valid(json_data: dict, schema_id: str) -> bool:
+    """Validate the way every call used to: load, check and compile the whole schema directory."""
+    schema_store = utils.get_schema_store(utils.SCHEMA_SEARCH_PATH)
+    schema_uri = f"{utils.BASE_URI}/{schema_id}"
+    schema = schema_store.get(schema_uri)
+    registry = Registry(retrieve=lambda uri: Resource.from_contents(schema_store.get(uri))).with_resource(
+        schema_uri, DRAFT7.create_resource(schema)
+    )
+    validator = Draft7Validator(schema, format_checker=Draft7Validator.FORMAT_CHECKER, registry=registry)
+    return validator.is_valid(json_data)
+
+
+def _validations_per_second(func, json_data: dict, schema_id: str) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        assert func(json_data, schema_id)
+    return ITERATIONS / (time.perf_counter() - start)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize(
+    "schema_id, payload",
+    [
+        ("registration", "host_registration"),
+        ("real_time_validation", "real_time_validation"),
+    ],
+)
+def test_benchmark_schema_validation(schema_id, payload):
+    if payload == "host_registration":
+        with open(HOST_REGISTRATION_REQUEST) as f:
+            json_data = json.load(f)
+    else:
+        json_data = REAL_TIME_VALIDATION_REQUEST
+
+    # warm the registry so the one-off load is not part of the measurement
+    utils.schema_registry.get_validator(schema_id)
+
+    before = _validations_per_second(_uncached_is_valid, json_data, schema_id)
+    with patch.object(utils, "get_schema_store", wraps=utils.get_schema_store) as get_schema_store:
+        after_full = _validations_per_second(lambda data, name: utils.validate(data, name)[0], json_data, schema_id)
+        after_fast = _validations_per_second(utils.is_valid, json_data, schema_id)
+
+    print(
+        f"\n{schema_id}: uncached {before:,.0f}/s, "
+        f"compiled validate {after_full:,.0f}/s, compiled is_valid {after_fast:,.0f}/s"
+    )
+    # the compiled validators never read the schema directory again
+    assert get_schema_store.call_count == 0
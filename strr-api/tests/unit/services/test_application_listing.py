@@ -0,0 +1,190 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Tests to assure the application page queries stay flat.
+
+The certificate memory benchmark is marked slow, run it with `pytest -m slow -s`.
+"""
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from strr_api.enums.enum import PropertyType, RegistrationStatus
+from strr_api.models import (
+    Address,
+    Application,
+    Certificate,
+    Contact,
+    Document,
+    PropertyContact,
+    Registration,
+    RentalProperty,
+    User,
+)
+from strr_api.models.dataclass import ApplicationSearch
+from strr_api.services import ApplicationService
+from tests.unit.utils.queries import count_queries
+
+PAGE_QUERIES = 4  # count, page, documents, host registration counts
+
+
+def _host_application(user, account_id, sin, random_string, index, pdf=b"%PDF"):
+    registration = Registration(
+        registration_type=Registration.RegistrationType.HOST,
+        registration_number=f"H{random_string(8)}",
+        sbc_account_id=account_id,
+        status=RegistrationStatus.ACTIVE,
+        user_id=user.id,
+        start_date=datetime.now(timezone.utc),
+        expiry_date=(datetime.now(timezone.utc) + timedelta(days=365)).date(),
+        rental_property=RentalProperty(
+            property_type=PropertyType.SINGLE_FAMILY_HOME,
+            ownership_type=RentalProperty.OwnershipType.OWN,
+            is_principal_residence=True,
+            rental_act_accepted=True,
+            address=Address(
+                street_number=str(100 + index),
+                street_address=f"{100 + index} Fake St",
+                country="CA",
+                city="Victoria",
+                province="BC",
+                postal_code="V8V 8V8",
+            ),
+            contacts=[
+                PropertyContact(
+                    is_primary=True,
+                    contact_type=PropertyContact.ContactType.INDIVIDUAL,
+                    contact=Contact(lastname="Host", social_insurance_number=sin),
+                )
+            ],
+        ),
+        certificates=[Certificate(certificate=pdf, issuer_id=user.id)],
+        documents=[Document(file_name="doc.pdf", file_type="application/pdf", path=random_string(12))],
+    )
+    return Application(
+        application_json={
+            "registration": {"primaryContact": {"contactType": "INDIVIDUAL", "socialInsuranceNumber": sin}}
+        },
+        application_number=random_string(14),
+        type="registration",
+        registration_type=Registration.RegistrationType.HOST,
+        status=Application.Status.FULL_REVIEW_APPROVED,
+        payment_account=str(account_id),
+        submitter_id=user.id,
+        reviewer_id=user.id,
+        decider_id=user.id,
+        registration=registration,
+    )
+
+
+@pytest.fixture
+def application_page(session, random_string, random_integer):
+    user = User(username=random_string(8), firstname="Exam", lastname="Iner")
+    session.add(user)
+    session.flush()
+    account_id = random_integer()
+    sins = [random_string(9), random_string(9)]
+    session.add_all([_host_application(user, account_id, sins[index % 2], random_string, index) for index in range(12)])
+    session.commit()
+    session.expunge_all()
+    return account_id
+
+
+def test_search_applications_query_count_is_flat(session, application_page):
+    query_counts = []
+    for limit in (3, 12):
+        with count_queries(session) as statements:
+            result = ApplicationService.search_applications(
+                ApplicationSearch(page=1, limit=limit, account_id=application_page)
+            )
+        query_counts.append(len(statements))
+        session.expunge_all()
+
+        assert len(result["applications"]) == limit
+        assert result["total"] == 12
+        for app_dict in result["applications"]:
+            header = app_dict["header"]
+            assert header["existingHostRegistrations"] == 6
+            assert header["isCertificateIssued"] is True
+            assert header["submitter"]["displayName"] == "Exam Iner"
+            assert header["registrationAddress"]["city"] == "Victoria"
+
+    assert query_counts[0] == query_counts[1]
+    assert query_counts[1] <= PAGE_QUERIES
+
+
+def test_serialize_all_matches_serialize(session, application_page):
+    applications = Application.query.filter_by(payment_account=str(application_page)).all()
+
+    assert ApplicationService.serialize_all(applications) == [
+        ApplicationService.serialize(application) for application in applications
+    ]
+
+
+def test_search_applications_does_not_read_certificates(session, application_page):
+    with count_queries(session) as statements:
+        ApplicationService.search_applications(ApplicationSearch(page=1, limit=12, account_id=application_page))
+
+    assert not any("certificates.certificate" in statement for statement in statements)
+
+
+@pytest.mark.slow
+def test_benchmark_page_memory_with_large_certificates(session, random_string, random_integer):
+    """Serialize a page where every registration has a 500 KB certificate and report the peak memory."""
+    pdf_size = 500 * 1024
+    user = User(username=random_string(8), firstname="Exam", lastname="Iner")
+    session.add(user)
+    session.flush()
+    account_id = random_integer()
+    session.add_all(
+        [
+            _host_application(user, account_id, random_string(9), random_string, index, pdf=b"%" * pdf_size)
+            for index in range(50)
+        ]
+    )
+    session.commit()
+    session.expunge_all()
+
+    tracemalloc.start()
+    try:
+        with count_queries(session) as statements:
+            result = ApplicationService.search_applications(ApplicationSearch(page=1, limit=50, account_id=account_id))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    print(f"\nserialized {len(result['applications'])} applications, peak {peak / 1024 / 1024:.1f} MB")
+    assert all(app_dict["header"]["isCertificateIssued"] for app_dict in result["applications"])
+    assert not any("certificates.certificate" in statement for statement in statements)
+    assert peak < pdf_size * 10
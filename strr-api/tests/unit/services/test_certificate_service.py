@@ -0,0 +1,239 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Tests to assure the asynchronous certificate rendering.
+
+The throughput benchmark is marked slow, run it with `pytest -m slow -s`.
+"""
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import render_template
+from weasyprint import HTML
+
+from strr_api.enums.enum import PropertyType, RegistrationStatus
+from strr_api.models import Address, Certificate, Contact, Events, PropertyContact, Registration, RentalProperty, User
+from strr_api.services import CertificateService
+from strr_api.services.certificate_renderer import CertificateRenderer, RenderResult
+
+
+def _address(index):
+    return Address(
+        street_number=str(100 + index),
+        street_address=f"{100 + index} Fake St",
+        country="CA",
+        city="Victoria",
+        province="BC",
+        postal_code="V8V 8V8",
+    )
+
+
+@pytest.fixture
+def registrations(session, random_string):
+    user = User(username=random_string(8))
+    session.add(user)
+    session.flush()
+    registrations = [
+        Registration(
+            registration_type=Registration.RegistrationType.HOST,
+            registration_number=f"H{random_string(8)}",
+            sbc_account_id=1,
+            status=RegistrationStatus.ACTIVE,
+            user_id=user.id,
+            start_date=datetime.now(timezone.utc),
+            expiry_date=(datetime.now(timezone.utc) + timedelta(days=365)).date(),
+            rental_property=RentalProperty(
+                property_type=PropertyType.SINGLE_FAMILY_HOME,
+                ownership_type=RentalProperty.OwnershipType.OWN,
+                is_principal_residence=True,
+                rental_act_accepted=True,
+                address=_address(index),
+                contacts=[
+                    PropertyContact(
+                        is_primary=True,
+                        contact_type=PropertyContact.ContactType.INDIVIDUAL,
+                        contact=Contact(firstname="Host", lastname=f"Number {index}", address=_address(index)),
+                    )
+                ],
+            ),
+        )
+        for index in range(3)
+    ]
+    session.add_all(registrations)
+    session.commit()
+    return registrations
+
+
+def _renderer(fail_numbers=()):
+    """A renderer that returns a fake PDF, or fails for the given registration numbers."""
+
+    def render(data):
+        if data["registration_number"] in fail_numbers:
+            return RenderResult(data, error=ValueError("bad layout"))
+        return RenderResult(data, pdf=f"%PDF {data['registration_number']}".encode())
+
+    renderer = MagicMock(spec=CertificateRenderer)
+    renderer.render_many.side_effect = lambda documents: [render(data) for data in documents]
+    return renderer
+
+
+def test_request_is_idempotent_per_version(session, registrations):
+    registration = registrations[0]
+
+    first = CertificateService.request_certificate(registration)
+    second = CertificateService.request_certificate(registration)
+
+    assert first.id == second.id
+    assert first.status == Certificate.Status.PENDING
+    assert first.registration_version == registration.version
+    assert Certificate.query.filter_by(registration_id=registration.id).count() == 1
+    assert CertificateService.get_status(registration)["status"] == Certificate.Status.PENDING
+    session.expire_all()
+    assert Registration.query.get(registration.id).has_certificate is False
+
+
+def test_render_pending_stores_each_outcome(session, registrations):
+    for registration in registrations:
+        CertificateService.request_certificate(registration)
+    failing = registrations[1]
+    renderer = _renderer(fail_numbers={failing.registration_number})
+
+    summary = CertificateService.render_pending(batch_size=2, renderer=renderer)
+
+    assert (summary.claimed, summary.completed, summary.failed) == (3, 2, 1)
+    assert renderer.render_many.call_count == 2
+    session.expire_all()
+    completed = CertificateService.get_status(registrations[0])
+    assert completed["status"] == Certificate.Status.COMPLETED
+    assert completed["issuedDate"] is not None
+    failed = CertificateService.get_status(failing)
+    assert failed["status"] == Certificate.Status.FAILED
+    assert failed["error"] == "bad layout"
+    certificate = CertificateService.get_certificate(registrations[0].id, registrations[0].version)
+    assert b"".join(certificate.stream()) == f"%PDF {registrations[0].registration_number}".encode()
+    assert Registration.query.get(failing.id).has_certificate is False
+    assert (
+        Events.query.filter(
+            Events.event_name == Events.EventName.CERTIFICATE_ISSUED,
+            Events.registration_id.in_([registration.id for registration in registrations]),
+        ).count()
+        == 2
+    )
+
+    # nothing is pending any more, a rerun renders nothing
+    assert CertificateService.render_pending(renderer=renderer).claimed == 0
+
+
+def test_stale_rendering_is_claimed_again(app, session, registrations):
+    registration = registrations[0]
+    certificate = CertificateService.request_certificate(registration)
+    certificate.status = Certificate.Status.RENDERING
+    certificate.updated_date = datetime.now(timezone.utc)
+    certificate.save()
+
+    assert CertificateService.render_pending(renderer=_renderer()).claimed == 0
+
+    certificate.updated_date = datetime.now(timezone.utc) - timedelta(
+        seconds=app.config["CERTIFICATE_RENDER_STALE_SECONDS"] + 60
+    )
+    certificate.save()
+    assert CertificateService.render_pending(renderer=_renderer()).completed == 1
+
+
+def test_generate_skips_a_certificate_being_rendered(session, registrations):
+    registration = registrations[0]
+    certificate = CertificateService.request_certificate(registration)
+    certificate.status = Certificate.Status.RENDERING
+    certificate.save()
+    renderer = _renderer()
+
+    with patch("strr_api.services.certificate_service.get_renderer", return_value=renderer):
+        assert CertificateService.generate_certificate(registration).status == Certificate.Status.RENDERING
+        renderer.render_many.assert_not_called()
+
+        certificate.status = Certificate.Status.FAILED
+        certificate.save()
+        assert CertificateService.generate_certificate(registration).status == Certificate.Status.COMPLETED
+        renderer.render_many.assert_called_once()
+
+
+def test_stale_batch_keeps_the_stored_outcome(session, registrations):
+    registration = registrations[0]
+    certificate = CertificateService.request_certificate(registration)
+    now = datetime.now(timezone.utc)
+    job = CertificateService._job(certificate, now)
+    assert CertificateService.render_pending(renderer=_renderer()).completed == 1
+
+    # the first claim of the certificate finishes after it was rendered again
+    stale = _renderer(fail_numbers={registration.registration_number})
+    assert CertificateService._render_and_store([job], stale, now) == (0, 0)
+    session.expire_all()
+    assert CertificateService.get_status(registration)["status"] == Certificate.Status.COMPLETED
+
+
+@pytest.mark.slow
+def test_benchmark_certificates_per_minute(app, registrations):
+    """Render certificates cold, warm in process and in a pool of one worker per core and report the throughput."""
+    count = 40
+    workers = os.cpu_count() or 1
+    data = CertificateService.certificate_data(registrations[0], datetime.now(timezone.utc))
+
+    started = time.perf_counter()
+    for _ in range(count // 4):
+        HTML(string=render_template("certificate.html", **data)).render().write_pdf()
+    cold = (count // 4) / (time.perf_counter() - started) * 60
+
+    local = CertificateRenderer()
+    local.warm_up()
+    started = time.perf_counter()
+    assert all(result.ok for result in local.render_many([data] * count))
+    warm = count / (time.perf_counter() - started) * 60
+
+    pool = CertificateRenderer(max_workers=workers)
+    try:
+        pool.warm_up()
+        started = time.perf_counter()
+        results = pool.render_many([data] * count * workers)
+        pooled = count * workers / (time.perf_counter() - started) * 60
+    finally:
+        pool.shutdown()
+
+    print(
+        f"\ncertificates per minute: cold {cold:.0f}, warm {warm:.0f}, "
+        f"pool of {workers} {pooled:.0f} ({pooled / workers:.0f} per core)"
+    )
+    assert len(results) == count * workers
+    assert all(result.ok and result.pdf.startswith(b"%PDF") for result in results)
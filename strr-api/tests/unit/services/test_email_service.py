@@ -38,6 +38,7 @@ Test-Suite to ensure that the Email Service is working as expected.
 import json
 import os
 import random
+from datetime import datetime, timedelta
 from unittest.mock import ANY, MagicMock, patch
 
 import pytest
@@ -45,7 +46,8 @@ from dotenv import load_dotenv
 from gcp_queue.gcp_queue import GcpQueue
 
 from strr_api import create_app
-from strr_api.models import Application, Registration, User
+from strr_api.enums.enum import InteractionStatus
+from strr_api.models import Application, CustomerInteraction, Registration, User
 from strr_api.services import ApplicationService
 from strr_api.services.email_service import EmailService
 
@@ -150,3 +152,39 @@ def test_email_queue_publish(app, mock_publisher_client, mock_credentials, regis
 
     # set back to original topic
     app.config["GCP_EMAIL_TOPIC"] = orig_topic
+
+
+def test_send_renewal_reminders(session):
+    """Renewal reminders queue one tagged interaction and publish one email per registration."""
+    user = User(firstname="Renewal", lastname="Reminder")
+    session.add(user)
+    session.flush()
+    registrations = [
+        Registration(
+            registration_type=registration_type,
+            registration_number=f"RR{random.randint(0, 9999999)}",
+            sbc_account_id=1,
+            status="ACTIVE",
+            user_id=user.id,
+            start_date=datetime.now(),
+            expiry_date=datetime.now() + timedelta(days=14),
+        )
+        for registration_type in (
+            Registration.RegistrationType.HOST.value,
+            Registration.RegistrationType.PLATFORM.value,
+        )
+    ]
+    session.add_all(registrations)
+    session.flush()
+
+    with patch("strr_api.services.gcp_queue_publisher.publish_many") as publish:
+        uuids = EmailService.send_renewal_reminders(registrations, interaction="2026:RENEWAL_REMINDER:14")
+
+    interactions = CustomerInteraction.query.filter(CustomerInteraction.interaction_uuid.in_(uuids)).all()
+    assert {interaction.registration_id for interaction in interactions} == {reg.id for reg in registrations}
+    assert all(interaction.idempotency_key == "2026:RENEWAL_REMINDER:14" for interaction in interactions)
+    assert all(interaction.status == InteractionStatus.QUEUED for interaction in interactions)
+    publish.assert_called_once()
+    payloads = [message.payload for message in publish.call_args.args[0]]
+    assert [payload["emailType"] for payload in payloads] == ["HOST_RENEWAL_REMINDER", "PLATFORM_RENEWAL_REMINDER"]
+    assert [payload["interaction_uuid"] for payload in payloads] == uuids
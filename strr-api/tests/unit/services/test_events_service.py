@@ -33,8 +33,14 @@
 # POSSIBILITY OF SUCH DAMAGE.
 """Tests to ensure the events service works as expected."""
 
+from unittest.mock import patch
+
+import pytest
+
 from strr_api.models import Events, User
+from strr_api.models.unit_of_work import unit_of_work
 from strr_api.services import EventsService
+from tests.unit.utils.queries import count_queries
 
 
 def test_event_record(app, session):
@@ -51,3 +57,82 @@ def test_event_record(app, session):
     )
 
     assert event.id
+
+
+def test_save_events_single_insert(app, session):
+    """Ensure save_events writes every event with one INSERT statement."""
+    events = [
+        {
+            "event_type": Events.EventType.APPLICATION,
+            "event_name": Events.EventName.PAYMENT_COMPLETE,
+            "details": f"bulk-{index}",
+        }
+        for index in range(25)
+    ]
+
+    with count_queries(session) as statements:
+        assert EventsService.save_events(events) == 25
+
+    assert len([statement for statement in statements if statement.startswith("INSERT INTO events")]) == 1
+    saved = Events.query.filter(Events.details.like("bulk-%")).order_by(Events.created_date, Events.id).all()
+    assert [event.details for event in saved] == [f"bulk-{index}" for index in range(25)]
+    assert EventsService.save_events([]) == 0
+
+
+def test_collect_buffers_events(app, session):
+    """Ensure save_event calls inside collect() are buffered and flushed in bulk, keeping their order."""
+    with count_queries(session) as statements:
+        with EventsService.collect(flush_size=10) as collector:
+            for index in range(25):
+                event = EventsService.save_event(
+                    event_type=Events.EventType.APPLICATION,
+                    event_name=Events.EventName.PAYMENT_COMPLETE,
+                    details=f"collected-{index}",
+                )
+                assert event.id is None
+            assert collector.saved == 20
+
+    assert collector.saved == 25
+    assert len([statement for statement in statements if statement.startswith("INSERT INTO events")]) == 3
+    saved = Events.query.filter(Events.details.like("collected-%")).order_by(Events.created_date, Events.id).all()
+    assert [event.details for event in saved] == [f"collected-{index}" for index in range(25)]
+
+
+def test_collect_drops_rolled_back_events(app, session):
+    """Ensure events of a rolled back unit of work are never written by the collector."""
+    with EventsService.collect() as collector:
+        with pytest.raises(ValueError):
+            with unit_of_work():
+                EventsService.save_event(
+                    event_type=Events.EventType.APPLICATION,
+                    event_name=Events.EventName.PAYMENT_COMPLETE,
+                    details="collected-rolled-back",
+                )
+                raise ValueError("boom")
+        with unit_of_work():
+            EventsService.save_event(
+                event_type=Events.EventType.APPLICATION,
+                event_name=Events.EventName.PAYMENT_COMPLETE,
+                details="collected-committed",
+            )
+
+    assert collector.saved == 1
+    assert Events.query.filter_by(details="collected-rolled-back").count() == 0
+    assert Events.query.filter_by(details="collected-committed").count() == 1
+
+
+def test_collect_logs_events_it_could_not_save(app, session):
+    """Ensure the buffered events are logged when the block fails and they cannot be saved."""
+    with patch.object(EventsService, "save_events", side_effect=RuntimeError("db down")):
+        with patch.object(app.logger, "error") as log_error, pytest.raises(ValueError):
+            with EventsService.collect():
+                EventsService.save_event(
+                    event_type=Events.EventType.APPLICATION,
+                    event_name=Events.EventName.PAYMENT_COMPLETE,
+                    details="collected-lost",
+                )
+                raise ValueError("boom")
+
+    message = log_error.call_args.args[0]
+    assert message.startswith("Failed to save 1 buffered events: db down")
+    assert "collected-lost" in message
@@ -47,7 +47,14 @@ from gcp_queue.gcp_queue import GcpQueue
 from strr_api import create_app
 from strr_api.models import Application, Registration, User
 from strr_api.services import ApplicationService
-from strr_api.services.gcp_queue_publisher import QueueMessage, publish_to_queue
+from strr_api.services.gcp_queue_publisher import (
+    InMemoryPublisher,
+    QueueMessage,
+    get_publisher_client,
+    publish_many,
+    publish_to_queue,
+)
+from strr_api.services.gcp_queue_publisher import publisher as publisher_context
 
 HOST_REGISTRATION_JSON = os.path.join(
     os.path.dirname(os.path.realpath(__file__)), "../../mocks/json/host_registration.json"
@@ -96,3 +103,79 @@ def test_publish_to_queue_no_topic(app, mock_credentials, mock_publisher_client)
             )
             publish_to_queue(queue_message)
             mock_publisher.publish.assert_not_called()
+
+
+def _message(topic="projects/project-id/topics/topic", ordering_key=None, number=0):
+    return QueueMessage(
+        source="test-source",
+        message_type="test-message-type",
+        payload={"number": number},
+        topic=topic,
+        ordering_key=ordering_key,
+    )
+
+
+def _published_numbers(publisher, topic="projects/project-id/topics/topic"):
+    return [json.loads(message["data"])["data"]["number"] for message in publisher.messages[topic]]
+
+
+def test_publish_many_keeps_order(app):
+    """publish_many returns one result per message and publishes them in order."""
+    publisher = InMemoryPublisher()
+    with app.app_context():
+        results = publish_many([_message(number=number) for number in range(5)], client=publisher)
+
+    assert all(result.ok for result in results)
+    assert [result.message.payload["number"] for result in results] == list(range(5))
+    assert _published_numbers(publisher) == list(range(5))
+
+
+def test_publish_many_reports_failures(app):
+    """A failed message is reported in its result and does not stop the rest of the batch."""
+    publisher = InMemoryPublisher()
+    publisher.fail_when(
+        lambda topic, data, key: ValueError("boom") if json.loads(data)["data"]["number"] == 1 else None
+    )
+    with app.app_context():
+        results = publish_many([_message(number=number) for number in range(3)] + [_message(topic=None)], publisher)
+
+    assert [result.ok for result in results] == [True, False, True, False]
+    assert isinstance(results[1].error, ValueError)
+    assert results[3].skipped and results[3].error is None
+    assert _published_numbers(publisher) == [0, 2]
+
+
+def test_ordering_key_paused_after_failure(app):
+    """Messages with the ordering key of a failed message fail until the batch resumes the key."""
+    publisher = InMemoryPublisher()
+    publisher.fail_when(
+        lambda topic, data, key: ValueError("boom") if json.loads(data)["data"]["number"] == 0 else None
+    )
+    messages = [_message(ordering_key="a", number=0), _message(ordering_key="a", number=1), _message(number=2)]
+    with app.app_context():
+        results = publish_many(messages, client=publisher)
+        assert [result.ok for result in results] == [False, False, True]
+
+        publisher.fail_when(None)
+        with publisher_context(client=publisher) as batch:
+            batch.publish(_message(ordering_key="a", number=3))
+            batch.publish(_message(ordering_key="a", number=4))
+            assert [result.ok for result in batch.results()] == [True, True]
+
+    assert _published_numbers(publisher) == [2, 3, 4]
+    assert [message["ordering_key"] for message in publisher.messages["projects/project-id/topics/topic"]] == [
+        "",
+        "a",
+        "a",
+    ]
+
+
+def test_publish_many_uses_app_client(app):
+    """Without a client the batch API uses the in memory publisher configured for the tests."""
+    with app.app_context():
+        results = publish_many([_message()])
+        client = get_publisher_client()
+
+    assert results[0].ok
+    assert isinstance(client, InMemoryPublisher)
+    assert _published_numbers(client) == [0]
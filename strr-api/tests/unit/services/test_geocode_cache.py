@@ -0,0 +1,182 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Tests to assure the two-tier geocode cache."""
+from unittest.mock import patch
+
+import pytest
+from flask import Flask
+
+from strr_api.services.geocode_cache import REDIS_KEY_PREFIX, GeocodeCache, normalize_address
+
+MATCH = {"features": [{"geometry": {"coordinates": [-123.36, 48.42]}, "properties": {"score": 100}}]}
+NO_MATCH = {"features": []}
+LOW_SCORE = {"features": [{"geometry": {"coordinates": [-123.36, 48.42]}, "properties": {"score": 70}}]}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value.encode()
+        self.ttls[key] = ttl
+
+
+class Fetcher:
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    def __call__(self, address):
+        self.calls.append(address)
+        return self.response
+
+
+@pytest.mark.parametrize(
+    "address",
+    [
+        "#101-123 Main St., Victoria, British Columbia",
+        "Unit 101 - 123 MAIN ST, VICTORIA, BC",
+        "  101-123   main st ,victoria,  B.C. ",
+        "Suite #101-123 Main St, , Victoria, BC",
+    ],
+)
+def test_normalize_address(address):
+    assert normalize_address(address) == "101-123 MAIN ST, VICTORIA, BC"
+
+
+def test_memory_hit_on_equivalent_address():
+    cache = GeocodeCache(clock=FakeClock())
+    fetch = Fetcher(MATCH)
+
+    assert cache.get_or_fetch("#5-10 Oak Ave, Nelson, BC", fetch) == MATCH
+    assert cache.get_or_fetch("Unit 5 - 10 oak ave, Nelson, British Columbia", fetch) == MATCH
+
+    assert len(fetch.calls) == 1
+    assert cache.stats.to_dict()["memoryHits"] == 1
+    assert cache.stats.to_dict()["misses"] == 1
+
+
+def test_redis_tier_shared_between_processes():
+    redis_client = FakeRedis()
+    first = GeocodeCache(redis_client=redis_client)
+    second = GeocodeCache(redis_client=redis_client)
+    fetch = Fetcher(MATCH)
+
+    first.get_or_fetch("10 Oak Ave, Nelson, BC", fetch)
+    assert second.get_or_fetch("10 OAK AVE, NELSON, BC", fetch) == MATCH
+
+    assert len(fetch.calls) == 1
+    assert second.stats.redis_hits == 1
+    assert redis_client.ttls[REDIS_KEY_PREFIX + "10 OAK AVE, NELSON, BC"] == first.ttl
+
+
+@pytest.mark.parametrize("response", [NO_MATCH, LOW_SCORE])
+def test_negative_caching_uses_short_ttl(response):
+    clock = FakeClock()
+    redis_client = FakeRedis()
+    cache = GeocodeCache(ttl=1000, negative_ttl=10, redis_client=redis_client, clock=clock)
+    fetch = Fetcher(response)
+
+    cache.get_or_fetch("1 Nowhere Rd, Nowhere, BC", fetch)
+    cache.get_or_fetch("1 Nowhere Rd, Nowhere, BC", fetch)
+    assert len(fetch.calls) == 1
+    assert cache.stats.negative_hits == 1
+    assert redis_client.ttls[REDIS_KEY_PREFIX + "1 NOWHERE RD, NOWHERE, BC"] == 10
+
+    clock.now = 11
+    redis_client.values.clear()
+    cache.get_or_fetch("1 Nowhere Rd, Nowhere, BC", fetch)
+    assert len(fetch.calls) == 2
+
+
+def test_failed_fetch_is_not_cached():
+    cache = GeocodeCache()
+    fetch = Fetcher(None)
+
+    assert cache.get_or_fetch("10 Oak Ave, Nelson, BC", fetch) is None
+    assert cache.get_or_fetch("10 Oak Ave, Nelson, BC", fetch) is None
+    assert len(fetch.calls) == 2
+
+
+def test_lru_is_bounded():
+    cache = GeocodeCache(max_entries=2)
+    fetch = Fetcher(MATCH)
+
+    for address in ["1 A St, X, BC", "2 B St, X, BC", "1 A St, X, BC", "3 C St, X, BC", "1 A St, X, BC"]:
+        cache.get_or_fetch(address, fetch)
+
+    assert fetch.calls == ["1 A St, X, BC", "2 B St, X, BC", "3 C St, X, BC"]
+
+
+def test_redis_errors_fall_back_to_geocoder():
+    class BrokenRedis:
+        def get(self, key):
+            raise ConnectionError("down")
+
+        def setex(self, key, ttl, value):
+            raise ConnectionError("down")
+
+    cache = GeocodeCache(redis_client=BrokenRedis())
+    fetch = Fetcher(MATCH)
+
+    assert cache.get_or_fetch("10 Oak Ave, Nelson, BC", fetch) == MATCH
+    assert cache.stats.redis_errors == 2
+
+
+def test_init_app_reports_missing_redis_client():
+    app = Flask(__name__)
+    app.config["REDIS_HOST"] = "redis.local"
+    cache = GeocodeCache()
+
+    with patch("strr_api.services.tiered_cache.redis", None), patch("strr_api.services.tiered_cache.logger") as logger:
+        cache.init_app(app)
+
+    assert cache.redis is None
+    logger.error.assert_called_once()
+
+    cache.init_app(app)
+    assert cache.redis is not None
@@ -0,0 +1,124 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Tests to assure the pooled outbound http client."""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from strr_api.services.http_client import HttpClient, ServicePolicy
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Keep-alive handler that fails /flaky twice before succeeding."""
+
+    protocol_version = "HTTP/1.1"
+    hits = {}
+
+    def _respond(self):
+        _Handler.hits[self.path] = _Handler.hits.get(self.path, 0) + 1
+        if self.path == "/flaky" and _Handler.hits[self.path] < 3:
+            status = 503
+        elif self.path == "/missing":
+            status = 404
+        else:
+            status = 200
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # noqa: N802
+        self._respond()
+
+    def do_POST(self):  # noqa: N802
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._respond()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    _Handler.hits = {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client():
+    http_client = HttpClient(pool_connections=2, pool_maxsize=4)
+    http_client.configure(test=ServicePolicy(timeout=5, retries=3, backoff_factor=0))
+    return http_client
+
+
+def test_connections_are_reused(client, server_url):
+    for _ in range(10):
+        assert client.get(f"{server_url}/ok", service="test").status_code == 200
+
+    host_metrics = client.metrics()[server_url.removeprefix("http://")]
+    assert host_metrics["requests"] == 10
+    assert host_metrics["connectionsOpened"] == 1
+    assert host_metrics["reuseRatio"] == 0.9
+    assert host_metrics["failures"] == 0
+
+
+def test_get_retries_server_errors(client, server_url):
+    response = client.get(f"{server_url}/flaky", service="test")
+    assert response.status_code == 200
+    assert _Handler.hits["/flaky"] == 3
+
+
+def test_not_found_is_not_retried(client, server_url):
+    response = client.get(f"{server_url}/missing", service="test")
+    assert response.status_code == 404
+    assert _Handler.hits["/missing"] == 1
+
+
+def test_post_is_not_retried_on_status(client, server_url):
+    response = client.post(f"{server_url}/flaky", service="test", json={"a": 1})
+    assert response.status_code == 503
+    assert _Handler.hits["/flaky"] == 1
+    assert client.metrics()[server_url.removeprefix("http://")]["failures"] == 1
+
+
+def test_unknown_service_uses_default_policy(client):
+    assert client.policy("unknown") == client.policy("default")
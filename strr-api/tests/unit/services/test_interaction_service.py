@@ -131,7 +131,7 @@ def test_dispatch_not_email_info():
 
 @pytest.mark.conf(NOTIFY_SVC_URL="dummy", NOTIFY_API_TIMEOUT=30)
 @patch("strr_api.services.auth_service.AuthService.get_service_client_token", return_value="dummy_token")
-@patch("strr_api.services.interaction.requests.post")
+@patch("strr_api.services.interaction.http_client.post")
 def test_dispatch_email_interaction_success(mock_requests_post, mock_get_token, session, setup_parents, inject_config):
     """Assert that an email interaction can be dispatched successfully."""
     mock_requests_post.return_value.status_code = HTTPStatus.OK
@@ -172,7 +172,7 @@ def test_dispatch_email_interaction_success(mock_requests_post, mock_get_token,
 
 @pytest.mark.conf(NOTIFY_SVC_URL="dummy", NOTIFY_API_TIMEOUT=30)
 @patch("strr_api.services.auth_service.AuthService.get_service_client_token", return_value="dummy_token")
-@patch("strr_api.services.interaction.requests.post")
+@patch("strr_api.services.interaction.http_client.post")
 def test_dispatch_email_interaction_failure_zero_id(
     mock_requests_post, mock_get_token, app, session, setup_parents, inject_config
 ):
@@ -197,7 +197,7 @@ def test_dispatch_email_interaction_failure_zero_id(
 
 @pytest.mark.conf(NOTIFY_SVC_URL="dummy", NOTIFY_API_TIMEOUT=30)
 @patch("strr_api.services.auth_service.AuthService.get_service_client_token", return_value="dummy_token")
-@patch("strr_api.services.interaction.requests.post")
+@patch("strr_api.services.interaction.http_client.post")
 def test_dispatch_email_interaction_failure_none_id(
     mock_requests_post, mock_get_token, session, setup_parents, inject_config, authed_g
 ):
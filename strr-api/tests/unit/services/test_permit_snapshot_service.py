@@ -0,0 +1,213 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Tests to assure the permit snapshot cache."""
+from datetime import datetime
+from http import HTTPStatus
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from strr_api.enums.enum import RegistrationStatus, RegistrationType
+from strr_api.models import Address
+from strr_api.services.permit_snapshot_service import (
+    REDIS_KEY_PREFIX,
+    PermitSnapshotService,
+    build_permit_snapshot,
+    permit_cache,
+)
+from strr_api.services.validation_service import ValidationService
+
+SERVICE_PATH = "strr_api.services.registration_service.RegistrationService"
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def setex(self, key, ttl, value):  # pylint: disable=unused-argument
+        self.values[key] = value.encode()
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+
+def _address(street_address, postal_code, street_number=None, unit_number=None):
+    return Address(
+        street_number=street_number, street_address=street_address, postal_code=postal_code, unit_number=unit_number
+    )
+
+
+def _host(number="H1234567", status=RegistrationStatus.ACTIVE, unit_number=None):
+    return SimpleNamespace(
+        registration_number=number,
+        registration_type=RegistrationType.HOST.value,
+        status=status,
+        expiry_date=datetime(2030, 1, 1, 23, 59, 59),
+        rental_property=SimpleNamespace(address=_address("Main St", "V8V 1A1", "12", unit_number)),
+    )
+
+
+def _strata_hotel(number="ST1234567"):
+    return SimpleNamespace(
+        registration_number=number,
+        registration_type=RegistrationType.STRATA_HOTEL.value,
+        status=RegistrationStatus.ACTIVE,
+        expiry_date=datetime(2030, 1, 1, 23, 59, 59),
+        strata_hotel_registration=SimpleNamespace(
+            strata_hotel=SimpleNamespace(
+                location=_address("100 Hotel Rd", "V9A 1B2"),
+                buildings=[SimpleNamespace(address=_address("5-200 Annex Rd", "V9B 2C3"))],
+            )
+        ),
+    )
+
+
+@pytest.fixture
+def shared_redis():
+    """Give the permit cache a shared tier for the test."""
+    fake = FakeRedis()
+    permit_cache.redis = fake
+    yield fake
+    permit_cache.redis = None
+
+
+@pytest.mark.parametrize(
+    "registration, address, status_code, errors",
+    [
+        (_host(), {"streetNumber": "12", "postalCode": "V8V 1A1"}, HTTPStatus.OK, []),
+        (_host(), {"streetNumber": "12 Main St", "postalCode": "v8v1z9"}, HTTPStatus.OK, []),
+        (
+            _host(),
+            {"streetNumber": "13", "postalCode": "V8W 1A1"},
+            HTTPStatus.BAD_REQUEST,
+            ["STREET_NUMBER_MISMATCH", "POSTAL_CODE_MISMATCH"],
+        ),
+        (_host(unit_number="Unit 004"), {"streetNumber": "12", "postalCode": "V8V1A1", "unitNumber": "#4"}, 200, []),
+        (_host(unit_number="4"), {"streetNumber": "12", "postalCode": "V8V1A1"}, 400, ["UNIT_NUMBER_MISMATCH"]),
+        (_host(), {"streetNumber": "12", "postalCode": "V8V1A1", "unitNumber": "4"}, 400, ["UNIT_NUMBER_MISMATCH"]),
+        (_strata_hotel(), {"streetNumber": "100", "postalCode": "V9A 1Z9"}, HTTPStatus.OK, []),
+        (_strata_hotel(), {"streetNumber": "200", "postalCode": "V9B 2C3"}, HTTPStatus.OK, []),
+        (_strata_hotel(), {"streetNumber": "200", "postalCode": "V9A 1B2"}, 400, ["ADDRESS_MISMATCH"]),
+    ],
+)
+def test_check_permit_details(registration, address, status_code, errors):
+    request_json = {"identifier": registration.registration_number, "address": address}
+
+    response, code = ValidationService.check_permit_details(request_json, registration)
+
+    assert code == status_code
+    assert [error["code"] for error in response.get("errors", [])] == errors
+    if not errors:
+        assert response["status"] == "ACTIVE"
+        assert response["validUntil"] == "2030-01-01"
+
+
+def test_inactive_permit_reports_status():
+    snapshot = build_permit_snapshot(_host(status=RegistrationStatus.SUSPENDED.value))
+
+    response, code = ValidationService.check_permit_snapshot(
+        {"identifier": "H1234567", "address": {"streetNumber": "99", "postalCode": "A1A1A1"}}, snapshot
+    )
+
+    assert code == HTTPStatus.OK
+    assert response["status"] == "SUSPENDED"
+    assert "errors" not in response
+
+
+def test_validate_permit_answers_from_cache(app):
+    request_json = {"identifier": "H1234567", "address": {"streetNumber": "12", "postalCode": "V8V 1A1"}}
+    with (
+        app.app_context(),
+        patch(f"{SERVICE_PATH}.find_by_registration_number", return_value=_host()) as lookup,
+        patch.object(ValidationService, "create_real_time_validation_audit_record"),
+    ):
+        first = ValidationService.validate_permit(request_json)
+        second = ValidationService.validate_permit(request_json)
+
+        # a status change refreshes the snapshot in place
+        PermitSnapshotService.refresh(_host(status=RegistrationStatus.CANCELLED))
+        third, _ = ValidationService.validate_permit(request_json)
+
+    assert first == second
+    assert first[1] == HTTPStatus.OK
+    assert third["status"] == "CANCELLED"
+    assert lookup.call_count == 1
+
+
+def test_unknown_permit_is_cached_negatively(app):
+    request_json = {"identifier": "H0000000", "address": {"streetNumber": "12", "postalCode": "V8V 1A1"}}
+    with (
+        app.app_context(),
+        patch(f"{SERVICE_PATH}.find_by_registration_number", return_value=None) as lookup,
+        patch.object(ValidationService, "create_real_time_validation_audit_record"),
+    ):
+        for _ in range(2):
+            response, status_code = ValidationService.validate_permit(request_json)
+            assert status_code == HTTPStatus.NOT_FOUND
+            assert response["errors"][0]["code"] == "PERMIT_NOT_FOUND"
+
+    assert lookup.call_count == 1
+    assert permit_cache.stats.negative_hits == 1
+
+
+def test_get_snapshots_loads_only_missing(app, shared_redis):
+    cached, missing = _host("H1111111"), _host("H2222222")
+    with app.app_context():
+        PermitSnapshotService.refresh(cached)
+        permit_cache.clear()  # only the shared tier holds it now
+
+        with patch(f"{SERVICE_PATH}.find_by_registration_numbers", return_value={"H2222222": missing}) as lookup:
+            snapshots = PermitSnapshotService.get_snapshots(["H1111111", "H2222222", "H3333333", None, "H1111111"])
+
+    lookup.assert_called_once_with(["H2222222", "H3333333"])
+    assert set(snapshots) == {"H1111111", "H2222222"}
+    assert snapshots["H1111111"] == build_permit_snapshot(cached)
+    assert permit_cache.stats.redis_hits == 1
+    assert f"{REDIS_KEY_PREFIX}H3333333" in shared_redis.values
+
+
+def test_invalidate_drops_both_tiers(app, shared_redis):
+    with app.app_context():
+        PermitSnapshotService.refresh(_host())
+        PermitSnapshotService.invalidate("H1234567")
+
+        assert shared_redis.values == {}
+        assert permit_cache.get("H1234567") is None
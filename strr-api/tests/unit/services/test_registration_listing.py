@@ -0,0 +1,268 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Tests to assure the registration page queries stay flat.
+
+The benchmark builds 1k registrations and compares serializing a 50 item page one registration at a time with
+the bulk serializer. Run with `pytest -m slow -s` to see the numbers.
+"""
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from strr_api.enums.enum import PropertyType, RegistrationStatus
+from strr_api.models import (
+    Address,
+    Application,
+    Contact,
+    Document,
+    Platform,
+    PlatformBrand,
+    PlatformRegistration,
+    PlatformRepresentative,
+    PropertyContact,
+    PropertyListing,
+    Registration,
+    RentalProperty,
+    StrataHotel,
+    StrataHotelBuilding,
+    StrataHotelRegistration,
+    StrataHotelRepresentative,
+    User,
+)
+from strr_api.models.dataclass import RegistrationSearch
+from strr_api.services import RegistrationService
+from tests.unit.utils.queries import count_queries
+
+# count and page, then per registration type the registrations plus five collections, then the applications
+PAGE_QUERIES = 2 + 3 * 6 + 1
+BENCHMARK_REGISTRATIONS = 1000
+BENCHMARK_PAGE_SIZE = 50
+BENCHMARK_ROUNDS = 20
+
+
+def _address(index):
+    return Address(
+        street_number=str(100 + index),
+        street_address=f"{100 + index} Fake St",
+        country="CA",
+        city="Victoria",
+        province="BC",
+        postal_code="V8V 8V8",
+    )
+
+
+def _registration(user, account_id, registration_type, random_string, **kwargs):
+    return Registration(
+        registration_type=registration_type,
+        registration_number=f"{registration_type[0]}{random_string(8)}",
+        sbc_account_id=account_id,
+        status=RegistrationStatus.ACTIVE,
+        user_id=user.id,
+        reviewer_id=user.id,
+        start_date=datetime.now(timezone.utc),
+        expiry_date=(datetime.now(timezone.utc) + timedelta(days=365)).date(),
+        documents=[Document(file_name="doc.pdf", file_type="application/pdf", path=random_string(12))],
+        **kwargs,
+    )
+
+
+def _host_registration(user, account_id, random_string, index):
+    return _registration(
+        user,
+        account_id,
+        Registration.RegistrationType.HOST,
+        random_string,
+        rental_property=RentalProperty(
+            property_type=PropertyType.SINGLE_FAMILY_HOME,
+            ownership_type=RentalProperty.OwnershipType.OWN,
+            is_principal_residence=True,
+            rental_act_accepted=True,
+            address=_address(index),
+            contacts=[
+                PropertyContact(
+                    is_primary=True,
+                    contact_type=PropertyContact.ContactType.INDIVIDUAL,
+                    contact=Contact(lastname="Host", address=_address(index)),
+                )
+            ],
+            property_listings=[PropertyListing(url=f"https://example.com/{index}")],
+        ),
+    )
+
+
+def _platform_registration(user, account_id, random_string, index):
+    platform = Platform(
+        legal_name=f"Platform {index}",
+        home_jurisdiction="BC",
+        primary_non_compliance_notice_email="ncn@example.com",
+        primary_take_down_request_email="tdr@example.com",
+        mailingAddress=_address(index),
+        representatives=[PlatformRepresentative(contact=Contact(lastname="Rep"))],
+        brands=[PlatformBrand(name=f"Brand {index}", website="https://example.com")],
+    )
+    return _registration(
+        user,
+        account_id,
+        Registration.RegistrationType.PLATFORM,
+        random_string,
+        platform_registration=PlatformRegistration(platform=platform),
+    )
+
+
+def _strata_hotel_registration(user, account_id, random_string, index):
+    strata_hotel = StrataHotel(
+        legal_name=f"Strata Hotel {index}",
+        home_jurisdiction="BC",
+        brand_name="Brand",
+        website="https://example.com",
+        number_of_units=10,
+        mailingAddress=_address(index),
+        location=_address(index),
+        representatives=[StrataHotelRepresentative(contact=Contact(lastname="Rep"))],
+        buildings=[StrataHotelBuilding(address=_address(index))],
+    )
+    return _registration(
+        user,
+        account_id,
+        Registration.RegistrationType.STRATA_HOTEL,
+        random_string,
+        strata_hotel_registration=StrataHotelRegistration(strata_hotel=strata_hotel),
+    )
+
+
+REGISTRATION_BUILDERS = (_host_registration, _platform_registration, _strata_hotel_registration)
+
+
+def _application(user, registration, random_string):
+    return Application(
+        application_json={"registration": {"strRequirements": {"organizationNm": "City of Victoria"}}},
+        application_number=random_string(14),
+        type="registration",
+        registration_type=registration.registration_type,
+        status=Application.Status.FULL_REVIEW_APPROVED,
+        payment_account=str(registration.sbc_account_id),
+        submitter_id=user.id,
+        reviewer_id=user.id,
+        decider_id=user.id,
+        registration=registration,
+    )
+
+
+def _create_registrations(session, random_string, account_id, count, builders):
+    user = User(username=random_string(8), firstname="Exam", lastname="Iner")
+    session.add(user)
+    session.flush()
+    for index in range(count):
+        registration = builders[index % len(builders)](user, account_id, random_string, index)
+        session.add(_application(user, registration, random_string))
+    session.commit()
+    session.expunge_all()
+
+
+@pytest.fixture
+def registration_page(session, random_string, random_integer):
+    account_id = random_integer()
+    _create_registrations(session, random_string, account_id, 12, REGISTRATION_BUILDERS)
+    return account_id
+
+
+def test_search_registrations_query_count_is_flat(session, registration_page):
+    query_counts = []
+    for limit in (3, 12):
+        with count_queries(session) as statements:
+            result = RegistrationService.search_registrations(
+                RegistrationSearch(page=1, limit=limit, account_id=registration_page)
+            )
+        query_counts.append(len(statements))
+        session.expunge_all()
+
+        assert len(result["registrations"]) == limit
+        assert result["total"] == 12
+        for registration in result["registrations"]:
+            assert registration["header"]["assignee"]["displayName"] == "Exam Iner"
+            assert len(registration["header"]["applications"]) == 1
+            assert len(registration["documents"]) == 1
+
+    assert query_counts[0] == query_counts[1]
+    assert query_counts[1] <= PAGE_QUERIES
+
+
+def test_serialize_all_matches_serialize(session, registration_page):
+    registrations = Registration.query.filter_by(sbc_account_id=registration_page).all()
+    expected = [RegistrationService.serialize(registration) for registration in registrations]
+    session.expunge_all()
+    registrations = Registration.query.filter_by(sbc_account_id=registration_page).all()
+
+    assert RegistrationService.serialize_all(registrations) == expected
+
+
+def _page_timings(session, account_id, serialize_page):
+    durations, query_counts = [], []
+    for _ in range(BENCHMARK_ROUNDS):
+        session.expunge_all()
+        start = time.perf_counter()
+        with count_queries(session) as statements:
+            registrations = (
+                Registration.query.filter_by(sbc_account_id=account_id)
+                .order_by(Registration.id)
+                .limit(BENCHMARK_PAGE_SIZE)
+                .all()
+            )
+            serialize_page(registrations)
+        durations.append(time.perf_counter() - start)
+        query_counts.append(len(statements))
+    return statistics.quantiles(durations, n=20)[-1], max(query_counts)
+
+
+@pytest.mark.slow
+def test_benchmark_registration_page(session, random_string, random_integer):
+    account_id = random_integer()
+    _create_registrations(session, random_string, account_id, BENCHMARK_REGISTRATIONS, (_host_registration,))
+
+    before_p95, before_queries = _page_timings(
+        session,
+        account_id,
+        lambda registrations: [RegistrationService.serialize(registration) for registration in registrations],
+    )
+    after_p95, after_queries = _page_timings(session, account_id, RegistrationService.serialize_all)
+
+    print(
+        f"\n{BENCHMARK_PAGE_SIZE} of {BENCHMARK_REGISTRATIONS} registrations: "
+        f"per registration {before_queries} queries, p95 {before_p95 * 1000:.1f}ms; "
+        f"bulk {after_queries} queries, p95 {after_p95 * 1000:.1f}ms"
+    )
+    assert after_queries < before_queries
+    assert after_queries <= PAGE_QUERIES
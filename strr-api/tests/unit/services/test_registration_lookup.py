@@ -0,0 +1,85 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Tests to assure the batched registration lookup."""
+from datetime import datetime, timedelta, timezone
+
+from strr_api.enums.enum import PropertyType, RegistrationStatus
+from strr_api.models import Address, Registration, RentalProperty, User
+from strr_api.services import RegistrationService
+from tests.unit.utils.queries import count_queries
+
+
+def _host_registration(user, registration_number, index):
+    return Registration(
+        registration_type=Registration.RegistrationType.HOST,
+        registration_number=registration_number,
+        sbc_account_id=1000,
+        status=RegistrationStatus.ACTIVE,
+        user_id=user.id,
+        start_date=datetime.now(timezone.utc),
+        expiry_date=(datetime.now(timezone.utc) + timedelta(days=365)).date(),
+        rental_property=RentalProperty(
+            property_type=PropertyType.SINGLE_FAMILY_HOME,
+            ownership_type=RentalProperty.OwnershipType.OWN,
+            is_principal_residence=True,
+            rental_act_accepted=True,
+            address=Address(
+                street_number=str(100 + index),
+                street_address=f"{100 + index} Fake St",
+                country="CA",
+                city="Victoria",
+                province="BC",
+                postal_code="V8V 8V8",
+            ),
+        ),
+    )
+
+
+def test_find_by_registration_numbers_prefetches_addresses(session, random_string):
+    user = User()
+    session.add(user)
+    session.flush()
+    numbers = [f"H{random_string(8)}" for _ in range(25)]
+    session.add_all([_host_registration(user, number, index) for index, number in enumerate(numbers)])
+    session.commit()
+    session.expunge_all()
+
+    with count_queries(session) as statements:
+        registrations = RegistrationService.find_by_registration_numbers([*numbers, "MISSING", None, 12345], 10)
+        street_numbers = {number: reg.rental_property.address.street_number for number, reg in registrations.items()}
+
+    assert set(registrations) == set(numbers)
+    assert street_numbers[numbers[3]] == "103"
+    # registrations, rental properties, addresses and the strata hotel chain per batch of 10; none per record
+    assert len(statements) <= 3 * 4
@@ -33,17 +33,22 @@
 # POSSIBILITY OF SUCH DAMAGE.
 """Tests to ensure that the snapshot service works as expected."""
 
+import copy
 import json
 import os
+import time
+from datetime import datetime, timedelta, timezone
 from http import HTTPStatus
 from unittest.mock import patch
 
 import jwt as jot
 import pytest
+from sqlalchemy import text
 
 from strr_api.enums.enum import PaymentStatus, RegistrationStatus
-from strr_api.models import Application, Events, User
+from strr_api.models import Application, Events, Registration, RegistrationSnapshot, User
 from strr_api.services import RegistrationService, SnapshotService
+from strr_api.utils.json_patch import apply_patch, make_patch
 from tests.unit.utils.auth_helpers import PUBLIC_USER, STRR_EXAMINER, create_header
 
 MOCK_INVOICE_RESPONSE = {"id": 123, "statusCode": "CREATED", "paymentAccount": {"accountId": 1234}}
@@ -59,6 +64,171 @@ CREATE_REGISTRATION_INDIVIDUAL_AS_COHOST = os.path.join(
 ACCOUNT_ID = 1234
 
 
+def _load_registration_json() -> dict:
+    with open(CREATE_HOST_REGISTRATION_REQUEST) as f:
+        return json.load(f)["registration"]
+
+
+@pytest.fixture
+def registration(session, random_string):
+    user = User(username=random_string(8))
+    session.add(user)
+    session.flush()
+    registration = Registration(
+        registration_type=Registration.RegistrationType.HOST,
+        registration_number=f"H{random_string(8)}",
+        sbc_account_id=ACCOUNT_ID,
+        status=RegistrationStatus.ACTIVE,
+        user_id=user.id,
+        start_date=datetime.now(timezone.utc),
+        expiry_date=(datetime.now(timezone.utc) + timedelta(days=365)).date(),
+    )
+    session.add(registration)
+    session.commit()
+    return registration
+
+
+def _version_document(base: dict, version: int) -> dict:
+    """The base registration as it looks at a version: a few fields change on every renewal."""
+    document = copy.deepcopy(base)
+    document["expiryDate"] = f"{2025 + version}-01-01"
+    document["status"] = "ACTIVE" if version % 3 else "EXPIRED"
+    document.setdefault("documents", []).append({"fileName": f"renewal-{version}.pdf"})
+    if version % 4 == 0:
+        document.pop("listingDetails", None)
+    return document
+
+
+def _take_snapshots(registration, documents):
+    snapshots = []
+    for document in documents:
+        with patch.object(RegistrationService, "serialize", return_value=document):
+            snapshots.append(SnapshotService.snapshot_registration(registration))
+    return snapshots
+
+
+def test_json_patch_round_trip():
+    source = {"a": 1, "b/c": {"d": [1, 2, {"e": "~"}]}, "gone": True, "list": [1]}
+    target = {"a": 2, "b/c": {"d": [1, 3, {"e": "~x"}]}, "new": {"f": None}, "list": [1, 2]}
+
+    patch_ops = make_patch(source, target)
+
+    assert apply_patch(source, patch_ops) == target
+    assert source["b/c"]["d"][2] == {"e": "~"}
+    assert make_patch(target, target) == []
+
+
+@pytest.mark.parametrize(
+    "source, target",
+    [
+        ({"flag": 1}, {"flag": True}),
+        ({"flag": False}, {"flag": 0}),
+        ({"amount": 100}, {"amount": 100.0}),
+        ({"items": [1, 0]}, {"items": [True, False]}),
+    ],
+)
+def test_json_patch_keeps_type_changes(source, target):
+    patch_ops = make_patch(source, target)
+
+    assert patch_ops
+    patched = apply_patch(source, patch_ops)
+    assert json.dumps(patched) == json.dumps(target)
+
+
+def test_snapshot_listing_defers_snapshot_data(session, registration):
+    registration.snapshots = [
+        RegistrationSnapshot(
+            version=version, snapshot_datetime=datetime.now(timezone.utc), snapshot_data={"v": version}
+        )
+        for version in (1, 3, 2)
+    ]
+    session.commit()
+    session.expunge_all()
+
+    snapshots = Registration.query.get(registration.id).snapshots
+    assert [snapshot.version for snapshot in snapshots] == [3, 2, 1]
+    assert all("snapshot_data" not in snapshot.__dict__ for snapshot in snapshots)
+
+    session.expunge_all()
+    snapshot = SnapshotService.get_snapshot(registration.id, snapshots[0].id)
+    assert "snapshot_data" in snapshot.__dict__
+    assert SnapshotService.serialize(snapshot)["snapshotData"] == {"v": 3}
+
+
+def test_snapshots_are_keyframes_and_deltas(app, session, registration):
+    base = _load_registration_json()
+    documents = [_version_document(base, version) for version in range(1, 8)]
+    app.config["SNAPSHOT_KEYFRAME_INTERVAL"] = 3
+    try:
+        snapshots = _take_snapshots(registration, documents)
+    finally:
+        app.config["SNAPSHOT_KEYFRAME_INTERVAL"] = 10
+
+    assert [snapshot.version for snapshot in snapshots] == list(range(1, 8))
+    assert [snapshot.is_keyframe for snapshot in snapshots] == [True, False, False, True, False, False, True]
+    assert all(snapshot.snapshot_data is None for snapshot in snapshots if not snapshot.is_keyframe)
+    session.expunge_all()
+    for snapshot, document in zip(snapshots, documents):
+        stored = SnapshotService.get_snapshot(registration.id, snapshot.id)
+        assert SnapshotService.serialize(stored)["snapshotData"] == document
+
+
+def test_compact_snapshots(app, session, registration):
+    base = _load_registration_json()
+    documents = [_version_document(base, version) for version in range(1, 6)]
+    registration.snapshots = [
+        RegistrationSnapshot(version=version, snapshot_datetime=datetime.now(timezone.utc), snapshot_data=document)
+        for version, document in enumerate(documents, start=1)
+    ]
+    session.commit()
+
+    app.config["SNAPSHOT_KEYFRAME_INTERVAL"] = 3
+    try:
+        assert SnapshotService.compact_snapshots(registration.id) == 3
+        assert SnapshotService.compact_snapshots(registration.id) == 0
+    finally:
+        app.config["SNAPSHOT_KEYFRAME_INTERVAL"] = 10
+
+    session.expunge_all()
+    snapshots = RegistrationSnapshot.query.filter_by(registration_id=registration.id).order_by("version").all()
+    assert [snapshot.is_keyframe for snapshot in snapshots] == [True, False, False, True, False]
+    for snapshot, document in zip(snapshots, documents):
+        assert SnapshotService.get_snapshot_data(snapshot) == document
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("versions", [10, 50])
+def test_benchmark_snapshot_storage(session, registration, versions):
+    """Report the stored bytes per snapshot and the reconstruction latency. Run with `pytest -m slow -s`."""
+    base = _load_registration_json()
+    documents = [_version_document(base, version) for version in range(1, versions + 1)]
+    snapshots = _take_snapshots(registration, documents)
+
+    stored_bytes = session.execute(
+        text(
+            "SELECT SUM(COALESCE(pg_column_size(snapshot_data), 0) + COALESCE(pg_column_size(snapshot_patch), 0)) "
+            "FROM registration_snapshot WHERE registration_id = :registration_id"
+        ),
+        {"registration_id": registration.id},
+    ).scalar_one()
+    full_bytes = sum(len(json.dumps(document)) for document in documents)
+
+    session.expunge_all()
+    started = time.perf_counter()
+    reconstructed = [
+        SnapshotService.serialize(SnapshotService.get_snapshot(registration.id, snapshot.id))["snapshotData"]
+        for snapshot in snapshots
+    ]
+    latency = (time.perf_counter() - started) / versions
+
+    print(
+        f"\n{versions} versions: {stored_bytes / versions:,.0f} bytes per snapshot stored, "
+        f"{full_bytes / versions:,.0f} bytes per full document, {latency * 1000:.2f} ms per reconstruction"
+    )
+    assert stored_bytes < full_bytes
+    assert reconstructed == documents
+
+
 # @patch("strr_api.services.strr_pay.create_invoice", return_value=MOCK_INVOICE_RESPONSE)
 @pytest.mark.skip
 @patch("strr_api.resources.application.strr_pay.create_invoice", return_value=MOCK_INVOICE_RESPONSE)
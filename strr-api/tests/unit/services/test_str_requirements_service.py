@@ -0,0 +1,83 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Tests to assure the memoized STR requirements service."""
+from unittest.mock import patch
+
+from flask import Flask
+
+from strr_api.services.str_requirements_service import StrRequirementsService, str_requirements_cache
+
+GET_STR_DATA = "strr_api.services.approval_service.ApprovalService.getSTRDataForAddress"
+STR_DATA = {"organizationNm": "City of Victoria", "isPrincipalResidenceRequired": True}
+
+
+def test_format_address():
+    unit_address = {
+        "unitNumber": "101",
+        "streetNumber": "525",
+        "streetName": "Superior St",
+        "addressLineTwo": "Rear",
+        "city": "Victoria",
+        "province": "BC",
+    }
+    assert StrRequirementsService.format_unit_address(unit_address) == "101-525 Superior St Rear, Victoria, BC"
+    address = StrRequirementsService.format_address("525", "Superior St", "Victoria", "BC")
+    assert address == "525 Superior St, Victoria, BC"
+
+
+def test_process_cache_shared_by_equivalent_addresses():
+    with patch(GET_STR_DATA, return_value=STR_DATA) as mock_get:
+        assert StrRequirementsService.get_requirements("#101-525 Superior St, Victoria, BC") == STR_DATA
+        assert StrRequirementsService.get_requirements("Unit 101 - 525 SUPERIOR ST, Victoria, B.C.") == STR_DATA
+
+    mock_get.assert_called_once_with("#101-525 Superior St, Victoria, BC")
+    assert str_requirements_cache.stats.memory_hits == 1
+
+
+def test_request_cache():
+    app = Flask(__name__)
+    with patch(GET_STR_DATA, return_value=STR_DATA) as mock_get, app.test_request_context():
+        StrRequirementsService.get_requirements("525 Superior St, Victoria, BC")
+        str_requirements_cache.clear()
+        assert StrRequirementsService.get_requirements("525 Superior St, Victoria, BC") == STR_DATA
+
+    mock_get.assert_called_once()
+
+
+def test_unresolved_address_is_not_cached():
+    with patch(GET_STR_DATA, return_value=None) as mock_get:
+        assert StrRequirementsService.get_requirements("0 Void, N/A, BC") is None
+        assert StrRequirementsService.get_requirements("0 Void, N/A, BC") is None
+
+    assert mock_get.call_count == 2
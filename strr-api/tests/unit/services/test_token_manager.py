@@ -0,0 +1,161 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Tests to assure the OAuth client-credentials token cache."""
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from strr_api.services.token_manager import TokenManager
+
+TOKEN_URL = "https://test-token-url"
+CLIENT_ID = "client"
+CLIENT_SECRET = "secret"
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _token_response(access_token, expires_in=300):
+    response = MagicMock()
+    response.json.return_value = {"access_token": access_token, "expires_in": expires_in}
+    return response
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@patch("strr_api.services.token_manager.http_client.post")
+def test_token_is_cached_until_refresh_point(mock_post, clock):
+    mock_post.side_effect = [_token_response("first"), _token_response("second")]
+    manager = TokenManager(clock=clock)
+
+    assert manager.get_token(TOKEN_URL, CLIENT_ID, CLIENT_SECRET) == "first"
+    clock.now += 100
+    assert manager.get_token(TOKEN_URL, CLIENT_ID, CLIENT_SECRET) == "first"
+    assert mock_post.call_count == 1
+
+    # past 80% of the usable lifetime (300 - 30 seconds) the token is refreshed early
+    clock.now += 120
+    assert manager.get_token(TOKEN_URL, CLIENT_ID, CLIENT_SECRET) == "second"
+    assert mock_post.call_count == 2
+
+
+@patch("strr_api.services.token_manager.http_client.post")
+def test_tokens_are_keyed_by_url_and_client(mock_post, clock):
+    mock_post.side_effect = [_token_response("a"), _token_response("b"), _token_response("c")]
+    manager = TokenManager(clock=clock)
+
+    assert manager.get_token(TOKEN_URL, CLIENT_ID, CLIENT_SECRET) == "a"
+    assert manager.get_token(TOKEN_URL, "other-client", CLIENT_SECRET) == "b"
+    assert manager.get_token("https://other-token-url", CLIENT_ID, CLIENT_SECRET) == "c"
+    assert manager.get_token(TOKEN_URL, CLIENT_ID, CLIENT_SECRET) == "a"
+    assert mock_post.call_count == 3
+
+
+@patch("strr_api.services.token_manager.http_client.post")
+def test_expired_token_is_not_returned(mock_post, clock):
+    mock_post.side_effect = [_token_response("first", expires_in=60), _token_response("second", expires_in=60)]
+    manager = TokenManager(clock=clock)
+
+    assert manager.get_token(TOKEN_URL, CLIENT_ID, CLIENT_SECRET) == "first"
+    clock.now += 31
+    assert manager.get_token(TOKEN_URL, CLIENT_ID, CLIENT_SECRET) == "second"
+
+
+@patch("strr_api.services.token_manager.http_client.post")
+def test_invalidate_forces_new_token(mock_post, clock):
+    mock_post.side_effect = [_token_response("first"), _token_response("second")]
+    manager = TokenManager(clock=clock)
+
+    assert manager.get_token(TOKEN_URL, CLIENT_ID, CLIENT_SECRET) == "first"
+    manager.invalidate(TOKEN_URL, CLIENT_ID)
+    assert manager.get_token(TOKEN_URL, CLIENT_ID, CLIENT_SECRET) == "second"
+
+
+@patch("strr_api.services.token_manager.http_client.post")
+def test_failed_early_refresh_keeps_current_token(mock_post, clock):
+    mock_post.side_effect = [_token_response("first"), requests.exceptions.ConnectionError()]
+    manager = TokenManager(clock=clock)
+
+    assert manager.get_token(TOKEN_URL, CLIENT_ID, CLIENT_SECRET) == "first"
+    clock.now += 250
+    assert manager.get_token(TOKEN_URL, CLIENT_ID, CLIENT_SECRET) == "first"
+
+
+@patch("strr_api.services.token_manager.http_client.post")
+def test_missing_access_token_is_not_cached(mock_post, clock):
+    error_response = MagicMock()
+    error_response.json.return_value = {"error": "invalid_client"}
+    mock_post.side_effect = [error_response, _token_response("first")]
+    manager = TokenManager(clock=clock)
+
+    assert manager.get_token(TOKEN_URL, CLIENT_ID, CLIENT_SECRET) is None
+    assert manager.get_token(TOKEN_URL, CLIENT_ID, CLIENT_SECRET) == "first"
+
+
+@patch("strr_api.services.token_manager.http_client.post")
+def test_concurrent_callers_share_one_request(mock_post):
+    def slow_token(*args, **kwargs):
+        time.sleep(0.05)
+        return _token_response("shared")
+
+    mock_post.side_effect = slow_token
+    manager = TokenManager()
+    barrier = threading.Barrier(10)
+    tokens = []
+
+    def worker():
+        barrier.wait()
+        tokens.append(manager.get_token(TOKEN_URL, CLIENT_ID, CLIENT_SECRET))
+
+    threads = [threading.Thread(target=worker) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tokens == ["shared"] * 10
+    assert mock_post.call_count == 1
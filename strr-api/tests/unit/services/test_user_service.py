@@ -0,0 +1,130 @@
+# Copyright © 2025 Province of British Columbia
+#
+# Licensed under the BSD 3 Clause License, (the "License");
+# you may not use this file except in compliance with the License.
+# The template for the license can be found here
+#    https://opensource.org/license/bsd-3-clause/
+#
+# Redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the
+# following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+#    may be used to endorse or promote products derived from this software
+#    without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS “AS IS”
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+"""Tests to assure the current user is resolved once per request."""
+import warnings
+
+from flask import g
+
+from strr_api.models import Address
+from strr_api.services import UserService
+from strr_api.services.user_service import user_cache
+from tests.unit.utils.queries import count_queries
+
+
+def _token(random_string):
+    return {
+        "iss": "test",
+        "sub": random_string(20),
+        "idp_userid": random_string(20),
+        "loginSource": "BCSC",
+        "username": "bcsc/tester",
+    }
+
+
+def test_user_is_memoized_for_the_request(app, session, random_string):
+    token = _token(random_string)
+    user = UserService.get_or_create_user_by_jwt(token)
+
+    with count_queries(session) as statements:
+        assert UserService.get_or_create_user_by_jwt(token) is user
+        assert UserService.get_or_create_user_by_jwt(token) is user
+
+    assert statements == []
+
+
+def test_user_is_cached_across_requests(app, session, random_string):
+    token = _token(random_string)
+    with app.app_context():
+        user_id = UserService.get_or_create_user_by_jwt(token).id
+
+    with app.app_context(), count_queries(session) as statements:
+        user = UserService.get_or_create_user_by_jwt(token)
+
+    assert user.id == user_id
+    assert user.sub == token["sub"]
+    assert statements == []
+
+
+def test_user_cache_is_keyed_by_sub(app, session, random_string):
+    first_token, second_token = _token(random_string), _token(random_string)
+
+    first = UserService.get_or_create_user_by_jwt(first_token)
+    second = UserService.get_or_create_user_by_jwt(second_token)
+
+    assert first.id != second.id
+    assert user_cache.get(first_token["sub"])["id"] == first.id
+    assert user_cache.get(second_token["sub"])["id"] == second.id
+
+
+def test_audit_columns_use_the_request_user(app, session, random_string):
+    token = _token(random_string)
+    with app.test_request_context():
+        g.jwt_oidc_token_info = token
+        user = UserService.get_or_create_user_by_jwt(token)
+
+        with count_queries(session) as statements:
+            address = Address(
+                street_address="12 Fake St", city="Victoria", province="BC", country="CA", postal_code="V8V 8V8"
+            )
+            session.add(address)
+            session.flush()
+
+        assert address.created_by_id == user.id
+        assert not [statement for statement in statements if "FROM users" in statement]
+
+
+def test_audit_columns_use_the_cached_user_id(app, session, random_string):
+    token = _token(random_string)
+    with app.app_context():
+        user_id = UserService.get_or_create_user_by_jwt(token).id
+
+    with app.test_request_context(), warnings.catch_warnings():
+        warnings.simplefilter("error")
+        g.jwt_oidc_token_info = token
+        with count_queries(session) as statements:
+            address = Address(
+                street_address="12 Fake St", city="Victoria", province="BC", country="CA", postal_code="V8V 8V8"
+            )
+            session.add(address)
+            session.flush()
+
+        assert address.created_by_id == user_id
+        assert not [statement for statement in statements if "FROM users" in statement]
+
+
+def test_no_user_lookup_without_jwt(app, session):
+    with app.app_context(), count_queries(session) as statements:
+        assert UserService.find_user_id_in_context() is None
+
+    assert statements == []